@@ -1,13 +1,13 @@
 from contextlib import asynccontextmanager
 from datetime import timedelta
 from pathlib import Path
+import hmac
 import shutil
 import sys
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from uuid import uuid4
+from fastapi.responses import JSONResponse, PlainTextResponse
 import time
 
 from config.config import settings
@@ -20,11 +20,24 @@ from core.resources.posts.admin_controller import router as admin_router
 from core.resources.posts.access_control import get_access_control_service
 from core.services.cqrs.event_bus import get_event_bus
 from core.resources.posts.handlers import register_posts_handlers
+from core.resources.posts.constants import FEED_CHANGED_EVENT
+from core.resources.posts.counter_buffer import CounterAggregator
+from core.resources.posts.hot_ranking import HotScoreRefresher
 from core.resources.posts.service import PostsService
-from core.resources.posts.repositories import CommentsRepository, LikesRepository, PostsRepository, SavedPostsRepository
+from core.resources.posts.repositories import (
+    CommentsRepository,
+    LikesRepository,
+    PostsRepository,
+    SavedPostsRepository,
+    UserStatsRepository,
+)
 from core.resources.posts.upload_errors_repository import UploadErrorsRepository
-from core.resources.uploaders.service import UploaderService
 from core.resources.uploaders.handlers import register_uploaders_handlers
+from core.plugins.auth.clerk_jwt import get_jwks_store
+from core.services.streamlander.client import get_shared_streamlander_client
+from core.plugins.metrics import get_metrics_exporter, metrics
+from core.plugins.rate_limit import setup_rate_limiters
+from core.plugins.request_log import RequestLogMiddleware
 from core.plugins.security import SecurityHeadersMiddleware, RateLimitMiddleware, RequestTimeoutMiddleware
 from database.mongo_factory import check_health as db_check_health
 
@@ -32,6 +45,8 @@ from database.mongo_factory import check_health as db_check_health
 logger = get_logger(__name__)
 
 _is_production = settings.environment == "production"
+# never expose /metrics unauthenticated in production
+_serve_metrics = settings.metrics_enabled and (bool(settings.metrics_token) or not _is_production)
 
 
 def _print_startup_banner() -> None:
@@ -43,11 +58,13 @@ def _print_startup_banner() -> None:
     logger.info("  mongo_db          : %s", settings.mongo_db)
     logger.info("  mongo_pool        : min=%d max=%d", settings.mongo_min_pool_size, settings.mongo_max_pool_size)
     logger.info("  cors_origins      : %s", settings.cors_allow_origins)
-    logger.info("  rate_limit_rpm    : %d", settings.rate_limit_rpm)
+    logger.info("  rate_limit_rpm    : %d (%s)", settings.rate_limit_rpm, settings.rate_limit_backend)
     logger.info("  request_timeout   : %ds", settings.request_timeout_seconds)
     logger.info("  pipeline_workers  : %d", settings.pipeline_workers)
     logger.info("  upload_max_files  : %d", settings.upload_max_files)
     logger.info("  upload_max_size   : %dMB", settings.upload_max_file_size_mb)
+    logger.info("  feed_cache        : pages=%d ttl=%ss", settings.feed_cache_max_pages, settings.feed_cache_ttl_seconds)
+    logger.info("  counter_flush     : %dms max=%d", settings.counter_flush_interval_ms, settings.counter_flush_max_deltas)
     logger.info("  auth_disabled     : %s", settings.auth_disabled)
     logger.info("  log_format        : %s", settings.log_format)
     logger.info("=" * 60)
@@ -89,6 +106,9 @@ async def lifespan(app: FastAPI):
     _print_startup_banner()
     _validate_secrets()
 
+    streamlander = get_shared_streamlander_client()
+    streamlander.start()
+
     jobs_service = get_shared_jobs_service()
     jobs_service.start_worker()
     logger.info("background queue worker started")
@@ -100,6 +120,11 @@ async def lifespan(app: FastAPI):
     pipeline.start_workers(num_workers=settings.pipeline_workers)
     logger.info("upload pipeline workers started count=%s", settings.pipeline_workers)
     
+    jwks_store = get_jwks_store() if not settings.auth_disabled and settings.clerk_jwks_url else None
+    if jwks_store is not None:
+        jwks_store.start()
+        logger.info("jwks key refresher started")
+
     access_service = get_access_control_service()
     await access_service.setup()
     logger.info("access control indexes ensured")
@@ -109,36 +134,77 @@ async def lifespan(app: FastAPI):
     likes_repo = LikesRepository()
     comments_repo = CommentsRepository()
     saved_posts_repo = SavedPostsRepository()
+    user_stats_repo = UserStatsRepository()
     await posts_repo.ensure_indexes()
     await likes_repo.ensure_indexes()
     await saved_posts_repo.ensure_indexes()
+    await user_stats_repo.ensure_indexes()
+    await setup_rate_limiters()
     logger.info("all repository indexes ensured")
 
     event_bus = get_event_bus()
     event_bus.start()
     logger.info("event bus started")
     
+    counters: CounterAggregator | None = None
+    if settings.counter_flush_interval_ms > 0:
+        counters = CounterAggregator(
+            sink=posts_repo,
+            flush_interval_ms=settings.counter_flush_interval_ms,
+            max_pending_deltas=settings.counter_flush_max_deltas,
+        )
+        counters.start()
+        logger.info("counter aggregator started")
+
     posts_service = PostsService(
         posts_repo=posts_repo,
         likes_repo=likes_repo,
         comments_repo=comments_repo,
         saved_posts_repo=saved_posts_repo,
+        user_stats_repo=user_stats_repo,
         jobs_service=jobs_service,
+        counters=counters,
     )
+    event_bus.register(FEED_CHANGED_EVENT, posts_service.invalidate_feed_cache)
     register_posts_handlers(posts_service, UploadErrorsRepository())
     logger.info("posts handlers registered")
 
     # cleanup any dangling posts from previous crashes
     await posts_service.cleanup_dangling_posts(older_than_minutes=60)
 
-    uploader_service = UploaderService()
-    register_uploaders_handlers(uploader_service)
+    hot_refresher = HotScoreRefresher(posts_repo=posts_repo, interval_seconds=settings.hot_score_refresh_seconds)
+    hot_refresher.start()
+    logger.info("hot score refresher started")
+
+    # share the access-control service's instance so uploader mutations invalidate its cache
+    register_uploaders_handlers(access_service.uploader_service)
     logger.info("uploader handlers registered")
 
+    metrics.gauge("upload_pipeline_backlog", "Upload contexts waiting for a pipeline worker.", pipeline.backlog)
+    metrics.gauge("jobs_queue_backlog", "Verify-media jobs waiting in the in-process queue.", jobs_service.backlog)
+    metrics.gauge("event_bus_backlog", "Events waiting for the event bus worker.", event_bus.backlog)
+    metrics_exporter = get_metrics_exporter()
+    if settings.metrics_enabled:
+        metrics_exporter.start()
+        logger.info("metrics exporter started dir=%s", metrics_exporter.directory)
+        if not _serve_metrics:
+            logger.warning("METRICS_TOKEN is not set: /metrics answers 404 in production until it is")
+
     logger.info("startup complete — ready to serve")
     
     yield
     
+    await metrics_exporter.stop()
+
+    await hot_refresher.stop()
+
+    if jwks_store is not None:
+        await jwks_store.stop()
+
+    if counters is not None:
+        # drain buffered like/comment deltas while Mongo is still reachable
+        await counters.stop()
+
     await event_bus.stop()
     logger.info("event bus stopped")
     
@@ -148,6 +214,9 @@ async def lifespan(app: FastAPI):
     await pipeline.stop_workers()
     logger.info("upload pipeline workers stopped")
 
+    # after the jobs worker and pipeline, which still probe/upload while draining
+    await streamlander.aclose()
+
     logger.info("shutdown complete")
 
 
@@ -161,7 +230,9 @@ def create_app() -> FastAPI:
         RateLimitMiddleware,
         max_requests=settings.rate_limit_rpm,
         window_seconds=60,
-        exempt_paths=["/health"],
+        exempt_paths=["/health", "/metrics"],
+        max_tracked_ips=settings.rate_limit_max_tracked_keys,
+        backend=settings.rate_limit_backend,
     )
     app.add_middleware(SecurityHeadersMiddleware)
 
@@ -192,20 +263,7 @@ def create_app() -> FastAPI:
         return JSONResponse(status_code=500, content={"detail": detail})
 
     # --- Request logging middleware ---
-    @app.middleware("http")
-    async def _log_requests(request, call_next):  # type: ignore[no-untyped-def]
-        req_id = uuid4().hex[:12]
-        start = time.perf_counter()
-        logger.info("req start id=%s method=%s path=%s", req_id, request.method, request.url.path)
-        try:
-            response = await call_next(request)
-        except Exception:
-            dur_ms = int((time.perf_counter() - start) * 1000)
-            logger.exception("req error id=%s dur_ms=%s", req_id, dur_ms)
-            raise
-        dur_ms = int((time.perf_counter() - start) * 1000)
-        logger.info("req end id=%s status=%s dur_ms=%s", req_id, response.status_code, dur_ms)
-        return response
+    app.add_middleware(RequestLogMiddleware)
 
     # --- Health check with DB connectivity ---
     @app.get("/health")
@@ -218,6 +276,14 @@ def create_app() -> FastAPI:
             content={"status": status, "db": "connected" if db_ok else "unreachable"},
         )
 
+    if _serve_metrics:
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics_endpoint(request: Request):
+            expected = f"Bearer {settings.metrics_token}"
+            if settings.metrics_token and not hmac.compare_digest(request.headers.get("authorization", ""), expected):
+                return JSONResponse(status_code=401, content={"detail": "unauthorized"})
+            return PlainTextResponse(get_metrics_exporter().render(), media_type="text/plain; version=0.0.4")
+
     logger.info("app created")
     return app
 
@@ -0,0 +1,71 @@
+"""
+Bearer-token verifications per second with and without the verified-token cache.
+
+Signs RS256 tokens with a throwaway key preloaded into the JWKS key store, so only
+verification cost is measured.
+
+    cd backend && python -m benchmarks.bench_auth [requests] [distinct_tokens]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from config.config import settings
+from core.plugins.auth import clerk_jwt
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+TOKENS = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+ISSUER = "https://bench.clerk.test"
+
+
+def _setup() -> list[str]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk["kid"] = "bench"
+    settings.auth_disabled = False
+    settings.clerk_issuer = ISSUER
+    settings.clerk_jwks_url = "https://bench.clerk.test/.well-known/jwks.json"
+    clerk_jwt.get_jwks_store().load({"keys": [jwk]})
+    exp = int(time.time()) + 3600
+    return [
+        jwt.encode(
+            {"sub": f"user_{i}", "iss": ISSUER, "exp": exp, "email": f"u{i}@example.com"},
+            private_key,
+            algorithm="RS256",
+            headers={"kid": "bench"},
+        )
+        for i in range(TOKENS)
+    ]
+
+
+async def _run(tokens: list[str]) -> float:
+    t0 = time.perf_counter()
+    for i in range(REQUESTS):
+        await clerk_jwt.verify_clerk_bearer_token(tokens[i % len(tokens)])
+    return REQUESTS / (time.perf_counter() - t0)
+
+
+async def main() -> None:
+    tokens = _setup()
+    cache = clerk_jwt.get_token_cache()
+    print(f"requests={REQUESTS} distinct_tokens={TOKENS}")
+
+    max_entries = cache.max_entries
+    cache.max_entries = 0
+    uncached = await _run(tokens)
+    print(f"no cache    req/s={uncached:10.0f}")
+
+    cache.max_entries = max_entries
+    cached = await _run(tokens)
+    print(f"with cache  req/s={cached:10.0f}  ({cached / uncached:.0f}x)  {cache.snapshot()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""
+Like/comment throughput on one hot post: write-through inc_counts vs the write-behind
+CounterAggregator, against a simulated document that serializes writes.
+
+    cd backend && python -m benchmarks.bench_counters [write_ms] [clients] [ops_per_client]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from core.resources.posts.counter_buffer import CounterAggregator
+
+WRITE_S = (float(sys.argv[1]) if len(sys.argv) > 1 else 1.0) / 1000
+CLIENTS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+OPS_PER_CLIENT = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+
+class _HotPost:
+    """One document: writes to it queue behind each other, as on a contended Mongo doc."""
+
+    def __init__(self) -> None:
+        self.likes = 0
+        self.writes = 0
+        self._doc_lock = asyncio.Lock()
+
+    async def inc_counts(self, post_id: str, likes_delta: int = 0, comments_delta: int = 0) -> dict:
+        async with self._doc_lock:
+            await asyncio.sleep(WRITE_S)
+            self.likes += likes_delta
+            self.writes += 1
+        return {"id": post_id, "stats": {"likes": self.likes, "comments": 0}}
+
+    async def bulk_inc_counts(self, deltas: Dict[str, Tuple[int, int]]) -> int:
+        for post_id, (likes_delta, comments_delta) in deltas.items():
+            await self.inc_counts(post_id, likes_delta, comments_delta)
+        return len(deltas)
+
+
+async def _run(like: Callable[[], Awaitable[Any]]) -> float:
+    async def client() -> None:
+        for _ in range(OPS_PER_CLIENT):
+            await like()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(CLIENTS)))
+    return time.perf_counter() - t0
+
+
+async def main() -> None:
+    total = CLIENTS * OPS_PER_CLIENT
+    print(f"simulated write={WRITE_S * 1000:.1f}ms clients={CLIENTS} likes={total}")
+
+    direct = _HotPost()
+    elapsed = await _run(lambda: direct.inc_counts("p1", likes_delta=1))
+    print(f"write-through   likes/s={total / elapsed:9.0f}  mongo_writes={direct.writes:6d}  final={direct.likes}")
+
+    buffered = _HotPost()
+    counters = CounterAggregator(sink=buffered, flush_interval_ms=50, max_pending_deltas=500)
+    counters.start()
+
+    async def like() -> None:
+        counters.add("p1", likes_delta=1)
+        await asyncio.sleep(0)  # yield like a request handler would
+
+    elapsed = await _run(like)
+    await counters.stop()
+    print(f"write-behind    likes/s={total / elapsed:9.0f}  mongo_writes={buffered.writes:6d}  final={buffered.likes}")
+    assert buffered.likes == total, "deltas lost"
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    asyncio.run(main())
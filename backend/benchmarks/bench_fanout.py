@@ -0,0 +1,113 @@
+"""
+Per-action latency of sequential vs fanned-out reads, against repos with a simulated
+Mongo round trip.
+
+    cd backend && python -m benchmarks.bench_fanout [rtt_ms]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+
+from core.resources.posts.interaction_cache import UserInteractionCache
+from core.resources.posts.service import PostsService
+from database.fanout import gather_reads
+
+RTT_S = (float(sys.argv[1]) if len(sys.argv) > 1 else 2.0) / 1000
+
+
+async def _rtt() -> None:
+    await asyncio.sleep(RTT_S)
+
+
+_DOC = {
+    "id": "p1",
+    "media": [],
+    "caption": "c",
+    "description": "",
+    "tags": [],
+    "status": "posted",
+    "createdAt": datetime(2026, 1, 1),
+    "author": {"userId": "u1"},
+    "stats": {"likes": 1, "comments": 0},
+}
+
+
+class _Posts:
+    async def find_by_id(self, post_id: str) -> dict:
+        await _rtt()
+        return dict(_DOC)
+
+    async def find_by_user_id(self, user_id: str, take: int, skip: int) -> list[dict]:
+        await _rtt()
+        return [dict(_DOC) for _ in range(take)]
+
+    async def count_posts_by_user(self, user_id: str) -> int:
+        await _rtt()
+        return 100
+
+
+class _Reactions:
+    async def exists(self, post_id: str, user_id: str) -> bool:
+        await _rtt()
+        return True
+
+
+def _service() -> PostsService:
+    reactions = _Reactions()
+    return PostsService(
+        posts_repo=_Posts(),  # type: ignore[arg-type]
+        likes_repo=reactions,  # type: ignore[arg-type]
+        comments_repo=None,  # type: ignore[arg-type]
+        saved_posts_repo=reactions,  # type: ignore[arg-type]
+        user_stats_repo=None,  # type: ignore[arg-type]
+        jobs_service=None,  # type: ignore[arg-type]
+        interactions=UserInteractionCache(max_users=0),  # measure the uncached path
+    )
+
+
+async def _time(fn: Callable[[], Awaitable[Any]], n: int = 200) -> float:
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+async def main() -> None:
+    svc = _service()
+    posts, reactions = svc.posts_repo, svc.likes_repo
+
+    async def get_post_sequential() -> None:
+        await posts.find_by_id("p1")
+        await reactions.exists(post_id="p1", user_id="u1")
+        await reactions.exists(post_id="p1", user_id="u1")
+
+    async def list_user_posts_sequential() -> None:
+        await svc.list_posts_by_user(user_id="u1", take=20, skip=0)
+        await svc.count_posts_by_user(user_id="u1")
+
+    async def list_user_posts_fanout() -> None:
+        await gather_reads(svc.list_posts_by_user(user_id="u1", take=20, skip=0), svc.count_posts_by_user(user_id="u1"))
+
+    rows = [
+        ("get_post", get_post_sequential, lambda: svc.get_post(post_id="p1", user_id="u1")),
+        ("list_user_posts", list_user_posts_sequential, list_user_posts_fanout),
+    ]
+    print(f"simulated rtt={RTT_S * 1000:.1f}ms (median per action)")
+    for name, before, after in rows:
+        b, a = await _time(before), await _time(after)
+        print(f"{name:<16} before={b:6.2f}ms  after={a:6.2f}ms")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Caller-side cost of a log call (the time the event loop is blocked): the previous
+per-logger StreamHandler + json.dumps formatter vs the orjson formatter, written
+synchronously and through the queue handler, with and without 10% sampling.
+
+Lines go to a real file so every write is a syscall, like stdout under a process manager.
+The queued writer is drained after the loop and timed on its own.
+
+    cd backend && python -m benchmarks.bench_logging [lines]
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import tempfile
+import time
+
+from core.logger.logger import _ContextFilter, _JsonFormatter, _QueueHandler, _shared_handler, request_id_var
+
+LINES = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+
+class _LegacyJsonFormatter(logging.Formatter):
+    """The previous formatter, kept here only as the baseline."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record, "%Y-%m-%dT%H:%M:%S%z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and record.exc_info[1]:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _run(label: str, formatter: logging.Formatter, queued: bool, sample: float, path: str) -> None:
+    with open(path, "w", buffering=1) as out:
+        stream = logging.StreamHandler(out)
+        stream.setFormatter(formatter)
+        listener = None
+        handler: logging.Handler = stream
+        if queued:
+            q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(q, stream)
+            handler = _QueueHandler(q)
+
+        logger = logging.getLogger(f"bench.{label}")
+        logger.handlers[:] = [handler]
+        logger.filters[:] = [_ContextFilter([(None, sample)] if sample < 1 else [])]
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+        t0 = time.perf_counter()
+        for i in range(LINES):
+            token = request_id_var.set(f"{i:012x}")
+            logger.info("list_posts ok take=%s skip=%s cursor=%s count=%s", 20, 0, False, 20)
+            request_id_var.reset(token)
+        caller = time.perf_counter() - t0
+        if listener is not None:
+            # drained separately: on a single core the writer thread would share the
+            # GIL with this loop and blur the caller-side number
+            t1 = time.perf_counter()
+            listener.start()
+            listener.stop()
+            writer = time.perf_counter() - t1
+        else:
+            writer = 0.0
+    print(f"{label:<18} caller={caller / LINES * 1e6:5.2f}us/line  writer_thread={writer / LINES * 1e6:5.2f}us/line")
+
+
+def main() -> None:
+    print(f"lines={LINES}")
+    _shared_handler()  # applies the process-wide record settings get_logger uses
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.jsonl")
+        _run("sync json.dumps", _LegacyJsonFormatter(), queued=False, sample=1, path=path)
+        _run("sync orjson", _JsonFormatter(), queued=False, sample=1, path=path)
+        _run("queue orjson", _JsonFormatter(), queued=True, sample=1, path=path)
+        _run("queue orjson 10%", _JsonFormatter(), queued=True, sample=0.1, path=path)
+
+
+if __name__ == "__main__":
+    main()
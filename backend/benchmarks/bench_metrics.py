@@ -0,0 +1,45 @@
+"""
+Recording cost of the metrics registry (what every request pays) and the cost of
+rendering /metrics from four workers' snapshots.
+
+    cd backend && python -m benchmarks.bench_metrics [observations]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from core.plugins.metrics import MetricsRegistry
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+ACTIONS = [f"action_{i}" for i in range(40)]
+
+
+def main() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("responses_total", "bench", ("status",))
+    histogram = registry.histogram("action_seconds", "bench", ("type", "action", "outcome"))
+
+    t0 = time.perf_counter()
+    for i in range(N):
+        counter.inc("200")
+    inc_ns = (time.perf_counter() - t0) / N * 1e9
+
+    t0 = time.perf_counter()
+    for i in range(N):
+        histogram.observe((i % 1000) / 10_000, "query", ACTIONS[i % 40], "ok")
+    observe_ns = (time.perf_counter() - t0) / N * 1e9
+
+    snapshot = registry.snapshot()
+    t0 = time.perf_counter()
+    text = registry.render([snapshot] * 4)
+    render_ms = (time.perf_counter() - t0) * 1e3
+
+    print(f"counter.inc       {inc_ns:6.0f}ns")
+    print(f"histogram.observe {observe_ns:6.0f}ns")
+    print(f"render 4 workers  {render_ms:6.2f}ms  ({len(text.splitlines())} lines)")
+
+
+if __name__ == "__main__":
+    main()
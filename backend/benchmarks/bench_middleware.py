@@ -0,0 +1,183 @@
+"""
+Per-request overhead of the middleware stack: the previous BaseHTTPMiddleware versions
+vs the pure ASGI ones, on /health and a list_posts-sized /api/execute response.
+
+Both apps run in-process over httpx's ASGI transport with the same routes and the same
+middleware order as create_app, so the difference is the middleware plumbing alone.
+
+    cd backend && python -m benchmarks.bench_middleware [requests]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+from core.plugins.request_log import RequestLogMiddleware
+from core.plugins.security import (
+    _SECURITY_HEADERS,
+    RateLimitMiddleware,
+    RequestTimeoutMiddleware,
+    SecurityHeadersMiddleware,
+)
+from core.resources.posts.serializers import project_post_list_item
+from core.services.cqrs.generic_route import encode_result
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+
+# --- previous implementations, kept here only as the baseline ---------------------------
+
+class _LegacySecurityHeaders(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        response = await call_next(request)
+        for header, value in _SECURITY_HEADERS.items():
+            response.headers[header] = value
+        return response
+
+
+class _LegacyRateLimit(BaseHTTPMiddleware):
+    def __init__(self, app, max_requests: int, window_seconds: int, exempt_paths: list[str]):
+        super().__init__(app)
+        self.max_requests, self.window_seconds = max_requests, window_seconds
+        self.exempt_paths = set(exempt_paths)
+        self._buckets: dict[str, list[float]] = defaultdict(list)
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        if request.url.path in self.exempt_paths:
+            return await call_next(request)
+        now = time.monotonic()
+        forwarded = request.headers.get("x-forwarded-for")
+        ip = forwarded.split(",")[0].strip() if forwarded else (request.client.host if request.client else "unknown")
+        bucket = self._buckets[ip]
+        while bucket and bucket[0] < now - self.window_seconds:
+            bucket.pop(0)
+        if len(bucket) >= self.max_requests:
+            return JSONResponse(status_code=429, content={"detail": "Too many requests. Please slow down."})
+        bucket.append(now)
+        return await call_next(request)
+
+
+class _LegacyTimeout(BaseHTTPMiddleware):
+    def __init__(self, app, timeout_seconds: int):
+        super().__init__(app)
+        self.timeout_seconds = timeout_seconds
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        try:
+            return await asyncio.wait_for(call_next(request), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            return JSONResponse(status_code=504, content={"detail": "Request timed out"})
+
+
+# --- apps ---------------------------------------------------------------------------------
+
+_PAGE = encode_result(
+    {
+        "items": [
+            project_post_list_item(
+                {
+                    "id": f"post-{i}",
+                    "media": [{"type": "video", "id": f"m{i}"}],
+                    "caption": "caption " * 5,
+                    "description": "description " * 10,
+                    "tags": ["a", "b", "c"],
+                    "status": "posted",
+                    "createdAt": datetime(2026, 1, 1),
+                    "author": {"userId": "u1", "username": "someone"},
+                    "stats": {"likes": i, "comments": i},
+                }
+            )
+            for i in range(20)
+        ],
+        "take": 20,
+        "skip": 0,
+        "nextCursor": None,
+    }
+)
+
+
+def _routes(app: FastAPI) -> None:
+    @app.get("/health")
+    async def health():
+        return JSONResponse({"status": "ok", "db": "connected"})
+
+    @app.post("/api/execute")
+    async def execute():
+        return Response(content=_PAGE, media_type="application/json")
+
+
+def _legacy_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(_LegacyTimeout, timeout_seconds=120)
+    app.add_middleware(_LegacyRateLimit, max_requests=10**9, window_seconds=60, exempt_paths=["/health"])
+    app.add_middleware(_LegacySecurityHeaders)
+    app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+
+    @app.middleware("http")
+    async def _log_requests(request, call_next):  # type: ignore[no-untyped-def]
+        return await call_next(request)
+
+    _routes(app)
+    return app
+
+
+def _asgi_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestTimeoutMiddleware, timeout_seconds=120)
+    app.add_middleware(RateLimitMiddleware, max_requests=10**9, window_seconds=60, exempt_paths=["/health"])
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+    app.add_middleware(RequestLogMiddleware)
+    _routes(app)
+    return app
+
+
+def _bare_app() -> FastAPI:
+    app = FastAPI()
+    _routes(app)
+    return app
+
+
+async def _median_us(app: FastAPI, method: str, path: str) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.request(method, path)
+        samples = []
+        for _ in range(REQUESTS):
+            t0 = time.perf_counter()
+            resp = await client.request(method, path)
+            samples.append(time.perf_counter() - t0)
+        assert resp.status_code == 200
+    return statistics.median(samples) * 1e6
+
+
+async def main() -> None:
+    print(f"requests={REQUESTS} (median per request, in-process ASGI transport)")
+    for method, path in (("GET", "/health"), ("POST", "/api/execute")):
+        bare = await _median_us(_bare_app(), method, path)
+        legacy = await _median_us(_legacy_app(), method, path)
+        asgi = await _median_us(_asgi_app(), method, path)
+        print(
+            f"{method:<4} {path:<12} no-mw={bare:6.0f}us  basehttp={legacy:6.0f}us (+{legacy - bare:4.0f})"
+            f"  asgi={asgi:6.0f}us (+{asgi - bare:4.0f})"
+        )
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+Rate-limit check cost and memory with 100k distinct client IPs: the previous per-IP
+timestamp lists vs the shared GCRA limiter.
+
+Traffic is replayed against a simulated clock spanning ten windows, with a few hot
+clients sitting at the limit on top of a long tail of distinct IPs.
+
+    cd backend && python -m benchmarks.bench_rate_limit [distinct_ips] [hits]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Callable
+
+from core.plugins.rate_limit import GcraRateLimiter
+
+IPS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+HITS = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+MAX_REQUESTS, WINDOW = 600, 60
+SPAN_SECONDS = 10 * WINDOW
+
+_now = [0.0]
+
+
+def _clock() -> float:
+    return _now[0]
+
+
+class _LegacyLimiter:
+    """The previous RateLimitMiddleware bookkeeping, kept here only as the baseline."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, list[float]] = defaultdict(list)
+
+    def hit(self, key: str) -> bool:
+        now = _clock()
+        bucket = self._buckets[key]
+        cutoff = now - WINDOW
+        while bucket and bucket[0] < cutoff:
+            bucket.pop(0)
+        if len(bucket) >= MAX_REQUESTS:
+            return False
+        bucket.append(now)
+        return True
+
+
+def _run(hit: Callable[[str], object], keys: list[str]) -> float:
+    step = SPAN_SECONDS / len(keys)
+    _now[0] = 0.0
+    t0 = time.perf_counter()
+    for key in keys:
+        _now[0] += step
+        hit(key)
+    return time.perf_counter() - t0
+
+
+def _measure(label: str, make: Callable[[], Callable[[str], object]], keys: list[str]) -> None:
+    elapsed = _run(make(), keys)
+    # memory in a second pass: tracemalloc slows allocation-heavy code too much to time it
+    tracemalloc.start()
+    hit = make()
+    _run(hit, keys)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<20} {elapsed / len(keys) * 1e9:6.0f}ns/check  peak_mem={peak / 2**20:6.1f}MiB")
+
+
+def main() -> None:
+    rng = random.Random(1)
+    ips = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(IPS)]
+    # a few hot clients (scrapers) on top of a long tail of distinct IPs
+    hot = ips[:10]
+    keys = [rng.choice(hot) if rng.random() < 0.3 else rng.choice(ips) for _ in range(HITS)]
+    print(f"distinct_ips={IPS} hits={HITS} limit={MAX_REQUESTS}/{WINDOW}s")
+
+    _measure("timestamp lists", lambda: _LegacyLimiter().hit, keys)
+    _measure("gcra", lambda: GcraRateLimiter(MAX_REQUESTS, WINDOW, max_keys=IPS, clock=_clock).hit, keys)
+    _measure(
+        f"gcra, cap {IPS // 10}",
+        lambda: GcraRateLimiter(MAX_REQUESTS, WINDOW, max_keys=IPS // 10, clock=_clock).hit,
+        keys,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Limit accuracy and check cost with several worker processes hitting the same clients:
+per-worker "memory" limiters vs the host-wide "shm" table.
+
+Every process sends the same number of requests for the same keys, as uvicorn workers
+behind one socket would. With per-worker state each process allows the full limit, so
+the host allows `processes` times it; the shared table should hold the total at the
+limit (plus the small refill earned while the run lasts).
+
+    cd backend && python -m benchmarks.bench_rate_limit_shared [processes] [keys] [hits_per_key]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+
+from core.plugins.rate_limit import GcraRateLimiter, LocalRateLimiter, RateLimiter
+from core.plugins.rate_limit_shm import SharedMemoryRateLimiter
+
+PROCESSES = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+KEYS = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+HITS_PER_KEY = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+MAX_REQUESTS, WINDOW = 100, 60
+
+
+def _make(backend: str, directory: str) -> RateLimiter:
+    local = GcraRateLimiter(MAX_REQUESTS, WINDOW, max_keys=KEYS)
+    if backend == "memory":
+        return LocalRateLimiter(local)
+    return SharedMemoryRateLimiter.open("bench", MAX_REQUESTS, WINDOW, max_keys=KEYS, fallback=local, directory=directory)
+
+
+def _worker(backend: str, directory: str, start: mp.Event, out: mp.Queue) -> None:
+    limiter = _make(backend, directory)
+    keys = [f"10.0.{i >> 8 & 255}.{i & 255}" for i in range(KEYS)]
+
+    async def run() -> tuple[int, float]:
+        allowed = 0
+        t0 = time.perf_counter()
+        for _ in range(HITS_PER_KEY):
+            for key in keys:
+                allowed += (await limiter.hit(key)).allowed
+        return allowed, time.perf_counter() - t0
+
+    start.wait()
+    out.put(asyncio.run(run()))
+
+
+def _measure(backend: str, directory: str) -> None:
+    start, out = mp.Event(), mp.Queue()
+    procs = [mp.Process(target=_worker, args=(backend, directory, start, out)) for _ in range(PROCESSES)]
+    for p in procs:
+        p.start()
+    start.set()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    allowed = sum(a for a, _ in results)
+    checks = KEYS * HITS_PER_KEY
+    per_check_us = sum(t for _, t in results) / (checks * PROCESSES) * 1e6
+    per_key = allowed / KEYS
+    print(
+        f"{backend:<7} allowed/key={per_key:7.1f} (limit {MAX_REQUESTS}, {per_key / MAX_REQUESTS:4.2f}x)"
+        f"  {per_check_us:5.2f}us/check"
+    )
+
+
+def main() -> None:
+    print(f"processes={PROCESSES} keys={KEYS} hits/key/process={HITS_PER_KEY} limit={MAX_REQUESTS}/{WINDOW}s")
+    with tempfile.TemporaryDirectory() as directory:
+        _measure("memory", directory)
+        _measure("shm", directory)
+
+
+if __name__ == "__main__":
+    main()
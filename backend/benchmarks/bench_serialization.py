@@ -0,0 +1,64 @@
+"""
+Compare /api/execute response encoding for one 50-item feed page.
+
+    cd backend && python -m benchmarks.bench_serialization
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from datetime import datetime, timedelta
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from core.resources.posts.dtos import PostListDTO
+from core.resources.posts.serializers import project_post_list_item
+
+
+def _make_docs(n: int = 50) -> list[dict]:
+    base = datetime(2026, 1, 1)
+    return [
+        {
+            "_id": i,
+            "id": f"post-{i:04d}",
+            "media": [{"type": "video", "id": f"media-{i}", "hash": "d41d8cd98f00b204e9800998ecf8427e"}],
+            "caption": f"caption {i} " * 4,
+            "description": "some longer description text " * 6,
+            "tags": ["#meme", "#funny", "#cats"],
+            "status": "posted",
+            "createdAt": base - timedelta(minutes=i),
+            "author": {"userId": f"user_{i % 7}", "username": f"name{i % 7}"},
+            "stats": {"likes": i * 3, "comments": i},
+            "likedByUser": i % 2 == 0,
+            "savedByUser": i % 5 == 0,
+        }
+        for i in range(n)
+    ]
+
+
+def pydantic_path(docs: list[dict]) -> bytes:
+    # DTO validate -> model_dump -> jsonable_encoder -> json.dumps (what JSONResponse does)
+    items = [PostListDTO.model_validate(d).model_dump() for d in docs]
+    body = jsonable_encoder({"items": items, "take": 50, "skip": 0, "total": None})
+    return json.dumps(body, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def orjson_path(docs: list[dict]) -> bytes:
+    items = [project_post_list_item(d) for d in docs]
+    return orjson.dumps({"items": items, "take": 50, "skip": 0, "total": None})
+
+
+def main() -> None:
+    docs = _make_docs()
+    assert json.loads(pydantic_path(docs)) == json.loads(orjson_path(docs)), "paths must produce identical JSON"
+
+    number = 2000
+    for name, fn in (("pydantic+jsonable_encoder", pydantic_path), ("projection+orjson", orjson_path)):
+        total = min(timeit.repeat(lambda: fn(docs), number=number, repeat=5))
+        print(f"{name:<28} {total / number * 1e6:9.1f} us/page")
+
+
+if __name__ == "__main__":
+    main()
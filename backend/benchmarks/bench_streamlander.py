@@ -0,0 +1,92 @@
+"""
+media_exists probe throughput against a local fake Streamlander: a fresh AsyncClient
+per call (the previous client) vs the pooled keep-alive client.
+
+The fake serves /media/{id} (honouring `Range: bytes=0-0`) and /stream/{id} from a
+uvicorn server on 127.0.0.1 in a background thread. It runs over plain HTTP on loopback,
+so the per-call cost here is TCP setup alone; over TLS the gap is wider.
+
+    cd backend && python -m benchmarks.bench_streamlander [probes] [concurrency]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from core.services.streamlander.client import StreamlanderClient
+
+PROBES = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+_MEDIA = b"\0" * 256 * 1024
+
+
+async def _media(request: Request) -> Response:
+    if request.headers.get("range") == "bytes=0-0":
+        return Response(_MEDIA[:1], status_code=206, headers={"Content-Range": f"bytes 0-0/{len(_MEDIA)}"})
+    return Response(_MEDIA)
+
+
+async def _stream(request: Request) -> Response:
+    return Response(status_code=200, headers={"X-Accel-Redirect": "/internal"})
+
+
+def _serve() -> str:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    app = Starlette(routes=[Route("/media/{media_id}", _media), Route("/stream/{media_id}", _stream)])
+    server = uvicorn.Server(uvicorn.Config(app, log_level="error", access_log=False))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+async def _legacy_media_exists(base_url: str, media_id: str) -> bool:
+    """The previous StreamlanderClient.media_exists, kept here only as the baseline."""
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        try:
+            async with client.stream("GET", f"{base_url}/media/{media_id}") as resp:
+                return resp.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+
+async def _run(label: str, probe) -> None:
+    gate = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(i: int) -> bool:
+        async with gate:
+            return await probe(f"m{i}")
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(PROBES)))
+    elapsed = time.perf_counter() - t0
+    assert all(results), f"{label}: {results.count(False)} probes failed"
+    print(f"{label:<22} {PROBES / elapsed:7.0f} probes/s")
+
+
+async def main() -> None:
+    base_url = _serve()
+    print(f"probes={PROBES} concurrency={CONCURRENCY}")
+    await _run("client per call", lambda media_id: _legacy_media_exists(base_url, media_id))
+    pooled = StreamlanderClient(base_url)
+    pooled.start()
+    try:
+        await _run("pooled keep-alive", pooled.media_exists)
+    finally:
+        await pooled.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
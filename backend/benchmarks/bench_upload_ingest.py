@@ -0,0 +1,126 @@
+"""
+Per-file cost of getting an upload to Streamlander:
+
+- three reads: the previous temp-file path (persist to /tmp, re-open for the magic-byte
+  check, re-read for MD5, then read again by the upload)
+- tmp file: the single-pass ingest (check, size and MD5 while persisting; the upload is
+  the only read)
+- direct: stream from the request spool, checking and hashing on the way
+
+A local fake Streamlander accepts the multipart upload and discards it. At the default
+512KB the multipart spool holds each file in memory, as it does for direct mode's range.
+
+    cd backend && python -m benchmarks.bench_upload_ingest [files] [size_kb]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.datastructures import Headers, UploadFile
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+import core.services.streamlander.client as streamlander_client
+from core.resources.posts import controller
+from core.services.streamlander.client import StreamlanderClient
+
+FILES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+SIZE_KB = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+_DATA = b"\x89PNG" + b"\x5a" * (SIZE_KB * 1024 - 4)
+
+
+async def _upload(request: Request) -> JSONResponse:
+    async for _ in request.stream():
+        pass
+    return JSONResponse({"id": "m1"})
+
+
+def _serve() -> str:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    app = Starlette(routes=[Route("/upload", _upload, methods=["POST"])])
+    server = uvicorn.Server(uvicorn.Config(app, log_level="error", access_log=False))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def _upload_file() -> UploadFile:
+    spool = SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(_DATA)
+    spool.seek(0)
+    return UploadFile(spool, size=len(_DATA), filename="bench.png", headers=Headers({"content-type": "image/png"}))
+
+
+async def _three_reads(client: StreamlanderClient, tmp_dir: Path, i: int) -> None:
+    """The previous ingest, kept here only as the baseline."""
+    path = tmp_dir / f"{i}.png"
+    file = _upload_file()
+    with open(path, "wb") as handle:
+        for chunk in iter(lambda: file.file.read(1024 * 1024), b""):
+            handle.write(chunk)
+    with open(path, "rb") as f:
+        assert controller._magic_matches(f.read(12), "image")
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    with open(path, "rb") as f:
+        await client.upload(filename="bench.png", content_type="image/png", data=f)
+    path.unlink()
+
+
+async def _via_tmp_file(client: StreamlanderClient, tmp_dir: Path, i: int) -> None:
+    path = tmp_dir / f"{i}.png"
+    persisted = await controller._persist_upload_file(_upload_file(), path, "image", "bench.png")
+    assert persisted.size == len(_DATA)
+    with open(path, "rb") as f:
+        await client.upload(filename="bench.png", content_type="image/png", data=f)
+    path.unlink()
+
+
+async def _direct(client: StreamlanderClient, tmp_dir: Path, i: int) -> None:
+    media = await controller._upload_direct(_upload_file(), "bench.png", "image/png", "image")
+    assert media is not None
+
+
+async def _run(label: str, client: StreamlanderClient, one) -> None:
+    tmp_dir = Path(tempfile.mkdtemp(prefix="memetok-bench-"))
+    try:
+        t0 = time.perf_counter()
+        for i in range(FILES):
+            await one(client, tmp_dir, i)
+        elapsed = time.perf_counter() - t0
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    print(f"{label:<12} {elapsed / FILES * 1e3:7.2f}ms/file  {FILES * len(_DATA) / elapsed / 1e6:7.1f}MB/s")
+
+
+async def main() -> None:
+    client = StreamlanderClient(_serve())
+    streamlander_client._client = client
+    print(f"files={FILES} size={SIZE_KB}KB tmp={tempfile.gettempdir()}")
+    try:
+        await _run("three reads", client, _three_reads)
+        await _run("tmp file", client, _via_tmp_file)
+        await _run("direct", client, _direct)
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""
+Concurrency stress check for like/save writes against a real Mongo.
+
+Fires interleaved toggle_like / set_like / toggle_save_post / set_save calls for many
+users at one throwaway post, then asserts stats.likes equals the number of like docs.
+Per-user collection counters are reported too; a like and a save of the same post racing
+each other can still skew those by one until the periodic recompute
+(COLLECTION_COUNT_REFRESH_SECONDS) repairs them, so they are informational only.
+
+Point MONGO_URI / MONGO_DB at a scratch database; the post and its reactions are removed
+afterwards.
+
+    cd backend && python -m benchmarks.stress_likes [users] [ops_per_user]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import time
+import uuid
+
+from core.resources.posts.constants import (
+    LIKES_COLLECTION,
+    POSTS_COLLECTION,
+    SAVED_POSTS_COLLECTION,
+    USER_STATS_COLLECTION,
+)
+from core.resources.posts.repositories import (
+    CommentsRepository,
+    LikesRepository,
+    PostsRepository,
+    SavedPostsRepository,
+    UserStatsRepository,
+)
+from core.resources.posts.service import PostsService
+from database.mongo_common import now_utc
+from database.mongo_factory import get_mongo
+
+USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+OPS_PER_USER = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+
+async def _hammer(svc: PostsService, post_id: str, user_id: str, rng: random.Random) -> None:
+    for _ in range(OPS_PER_USER):
+        op = rng.randrange(4)
+        if op == 0:
+            await svc.toggle_like(post_id, user_id)
+        elif op == 1:
+            await svc.set_like(post_id, user_id, liked=rng.random() < 0.5)
+        elif op == 2:
+            await svc.toggle_save_post(post_id, user_id)
+        else:
+            await svc.set_save(post_id, user_id, saved=rng.random() < 0.5)
+
+
+async def main() -> None:
+    posts_repo, likes_repo, saved_repo, stats_repo = (
+        PostsRepository(),
+        LikesRepository(),
+        SavedPostsRepository(),
+        UserStatsRepository(),
+    )
+    for repo in (posts_repo, likes_repo, saved_repo, stats_repo):
+        await repo.ensure_indexes()
+
+    svc = PostsService(
+        posts_repo=posts_repo,
+        likes_repo=likes_repo,
+        comments_repo=CommentsRepository(),
+        saved_posts_repo=saved_repo,
+        user_stats_repo=stats_repo,
+        jobs_service=None,  # type: ignore[arg-type]
+    )
+    post_id = f"stress-{uuid.uuid4().hex}"
+    users = [f"{post_id}-u{i}" for i in range(USERS)]
+    await posts_repo.insert(
+        {
+            "id": post_id,
+            "media": [],
+            "caption": "",
+            "description": "",
+            "tags": [],
+            "status": "posted",
+            "createdAt": now_utc(),
+            "author": {"userId": "stress"},
+            "stats": {"likes": 0, "comments": 0},
+        }
+    )
+    # seed every user's collection counter so the bumps below are exercised
+    for user_id in users:
+        await svc.count_saved_posts(user_id)
+
+    db = get_mongo().db
+    try:
+        # two workers per user so the same (post, user) pair races with itself
+        rng = random.Random(7)
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_hammer(svc, post_id, u, random.Random(rng.random())) for u in users for _ in range(2))
+        )
+        elapsed = time.perf_counter() - started
+
+        post = await posts_repo.find_by_id(post_id)
+        counter = int(post["stats"]["likes"]) if post else -1
+        actual = await db[LIKES_COLLECTION].count_documents({"postId": post_id})
+        drifted = 0
+        for user_id in users:
+            expected = len(
+                set(await likes_repo.list_post_ids_by_user(user_id, 10))
+                | set(await saved_repo.list_post_ids_by_user(user_id, 10))
+            )
+            count, _, _ = await stats_repo.get_collection_count(user_id)
+            if count != expected:
+                drifted += 1
+
+        total_ops = USERS * 2 * OPS_PER_USER
+        print(f"ops={total_ops} elapsed_s={elapsed:.2f} ops_per_s={total_ops / elapsed:.0f}")
+        print(f"stats.likes={counter} like_docs={actual} collection_counters_drifted={drifted}")
+        assert counter == actual, "likes counter drifted from like docs"
+        print("ok")
+    finally:
+        await db[POSTS_COLLECTION].delete_one({"id": post_id})
+        await db[LIKES_COLLECTION].delete_many({"postId": post_id})
+        await db[SAVED_POSTS_COLLECTION].delete_many({"postId": post_id})
+        await db[USER_STATS_COLLECTION].delete_many({"userId": {"$in": users}})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
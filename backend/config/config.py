@@ -1,4 +1,4 @@
-from typing import List, Literal
+from typing import Dict, List, Literal
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -22,27 +22,85 @@ class Settings(BaseSettings):
 
     streamlander_base_url: str = "http://localhost:8080"
     streamlander_api_key: str = "your_default_api_key_here"
+    # One pooled keep-alive client per worker; HTTP/2 needs the optional h2 package (httpx[http2])
+    streamlander_http2: bool = False
+    streamlander_max_connections: int = 100
+    streamlander_max_keepalive_connections: int = 20
+    streamlander_keepalive_expiry_seconds: float = 30.0
+    streamlander_connect_timeout_seconds: float = 5.0
+    streamlander_upload_timeout_seconds: float = 1600.0
+    streamlander_probe_timeout_seconds: float = 10.0
+    # Per-endpoint circuit breaker: opens when failure_rate of the last `window` calls
+    # (at least min_calls) failed; stays open open_seconds, doubling on each failed trial
+    streamlander_breaker_failure_rate: float = 0.5
+    streamlander_breaker_window: int = 20
+    streamlander_breaker_min_calls: int = 5
+    streamlander_breaker_open_seconds: float = 30.0
+    # Extra attempts for idempotent probes (jittered exponential backoff)
+    streamlander_probe_retries: int = 2
+    # How long the upload pipeline parks a file while the upload breaker is open before failing it
+    streamlander_park_max_seconds: float = 900.0
 
     auth_disabled: bool = True
     clerk_issuer: str = ""
     clerk_jwks_url: str = ""
+    # Verified-token LRU (per worker): claims cached until exp; rejections for the negative TTL. 0 disables.
+    auth_token_cache_max_entries: int = 10_000
+    auth_token_cache_negative_ttl_seconds: float = 5.0
 
     internal_jobs_secret: str = "change-me"
 
     super_admin_api_key: str = "change-super-admin-key"
+    # Uploader status / API-key hash cache (per worker); uploader mutations clear it in every
+    # worker on the host via a shared generation counter. 0 disables.
+    access_cache_ttl_seconds: float = 60.0
+    access_cache_max_entries: int = 10_000
     upload_max_files: int = 8
     upload_max_file_size_mb: int = 250
     upload_ingest_concurrency: int = 8
+    # Files up to this size are streamed from the request straight to Streamlander instead of
+    # through a temp file; on failure they fall back to the temp-file pipeline. 0 disables.
+    # Up to 1024 the multipart parser still holds the file in memory, so it never touches disk.
+    upload_direct_max_file_size_kb: int = 0
+    upload_direct_timeout_seconds: float = 60.0
     pipeline_workers: int = 2
+    # Verify-media jobs: jobs per batch (one post lookup + one bulk_write) and probes in flight
+    jobs_verify_batch_size: int = 50
+    jobs_verify_concurrency: int = 8
 
     cors_allow_origins: List[str] = ["*"]
 
     # --- Production / enterprise settings ---
     environment: Literal["development", "production"] = "development"
     log_format: Literal["text", "json"] = "text"
+    # Hand records to a background writer thread instead of writing stdout on the event loop
+    log_async: bool = False
+    # Keep-rates for high-volume INFO/DEBUG lines, keyed "<logger>" or "<logger>:<message prefix>"
+    # e.g. {"core.plugins.request_log": 0.1, "core.resources.posts.service:list_posts ok": 0.05}
+    log_sample_rates: Dict[str, float] = {}
 
     # Rate limiting (requests per minute per IP)
     rate_limit_rpm: int = 600
+    # Max distinct clients tracked per in-process limiter. Beyond it, expired keys are dropped
+    # first, then the earliest-inserted live keys (not least recently used); those clients
+    # simply start a fresh allowance
+    rate_limit_max_tracked_keys: int = 100_000
+    # Where limiter state lives: "memory" (per worker, so N workers allow N x the limit),
+    # "shm" (shared by all workers on this host) or "mongo" (shared by all nodes).
+    # Shared backends fall back to per-worker limits while their store is unavailable.
+    rate_limit_backend: Literal["memory", "shm", "mongo"] = "shm"
+    # Directory for the "shm" tables; empty picks /dev/shm, else the temp dir
+    rate_limit_shm_dir: str = ""
+    # "mongo": a check slower than this falls back to per-worker limits
+    rate_limit_store_timeout_ms: int = 100
+    # GET /metrics (Prometheus text format), summed across this host's workers via
+    # per-worker snapshot files in metrics_dir (empty: /dev/shm/memetok-metrics, else the temp dir)
+    metrics_enabled: bool = True
+    metrics_dir: str = ""
+    metrics_flush_seconds: float = 5.0
+    # If set, /metrics requires "Authorization: Bearer <token>". In production /metrics
+    # answers 404 until one is set (route names, action names and queue depths are not public)
+    metrics_token: str = ""
     # Request timeout in seconds
     request_timeout_seconds: int = 120
     # Max JSON request body (MB) — separate from upload max
@@ -52,6 +110,46 @@ class Settings(BaseSettings):
     mongo_max_pool_size: int = 50
     mongo_min_pool_size: int = 5
     mongo_server_selection_timeout_ms: int = 5000
+    # Log Mongo commands slower than this (filter shape only, no values); 0 disables the log
+    mongo_slow_query_ms: int = 200
+    # Cap on concurrent Mongo reads a single request may fan out to
+    mongo_max_inflight_per_request: int = 4
+
+    # /api/execute response encoding: "orjson" projects post docs and encodes in one pass,
+    # "pydantic" validates through DTOs and lets FastAPI's jsonable_encoder render.
+    execute_serializer: Literal["orjson", "pydantic"] = "orjson"
+    # /api/execute/batch: max operations per call and concurrent queries per batch
+    execute_batch_max_ops: int = 20
+    execute_batch_concurrency: int = 4
+    # GET /api/query/{action}: actions anonymous callers may cache publicly (edge/browser)
+    public_query_actions: List[str] = [
+        "list_posts",
+        "list_hot_posts",
+        "get_post",
+        "get_post_stats",
+        "list_comments",
+        "search_posts",
+    ]
+    query_cache_max_age_seconds: int = 10
+
+    # In-process cache of anonymous feed pages (per worker). 0 disables.
+    feed_cache_max_pages: int = 64
+    feed_cache_ttl_seconds: float = 15.0
+
+    # Full hotScore recompute interval (scores are also updated on every like/comment). 0 disables.
+    hot_score_refresh_seconds: int = 900
+
+    # Per-user liked/saved post-id sets for feed overlays (per worker). 0 users disables.
+    interaction_cache_max_users: int = 5000
+    interaction_cache_max_ids_per_user: int = 1000
+    interaction_cache_max_total_ids: int = 200_000
+    interaction_cache_ttl_seconds: float = 120.0
+    # Per-user collection counters are recomputed exactly on read once older than this
+    collection_count_refresh_seconds: int = 86_400
+
+    # Write-behind like/comment counters (per worker): flush every N ms or after N deltas. 0 ms disables.
+    counter_flush_interval_ms: int = 0
+    counter_flush_max_deltas: int = 500
 
     @field_validator("cors_allow_origins", mode="before")
     @classmethod
@@ -1,30 +1,188 @@
-import json
+"""
+Application logging.
+
+Every logger from `get_logger` shares one handler. With `log_async` that handler only
+enqueues records; a `QueueListener` thread formats and writes them, so a log call never
+blocks the event loop on stdout. Records carry the current request id (`request_id_var`,
+set by the request-log middleware) and CQRS action (`action_var`, set by the dispatcher),
+and `log_sample_rates` can keep only a fraction of high-volume INFO/DEBUG lines.
+"""
+
+import atexit
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+import time
+import zlib
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+action_var: ContextVar[Optional[str]] = ContextVar("action", default=None)
 
 
 class _JsonFormatter(logging.Formatter):
     """Machine-parseable JSON log formatter for production environments."""
 
+    _cached_second = -1
+    _cached_timestamp = ""
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_timestamp = time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(second))
+            self._cached_second = second
+        return self._cached_timestamp
+
     def format(self, record: logging.LogRecord) -> str:
         entry = {
-            "timestamp": self.formatTime(record, "%Y-%m-%dT%H:%M:%S%z"),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["requestId"] = request_id
+        action = getattr(record, "action", None)
+        if action:
+            entry["action"] = action
         if record.exc_info and record.exc_info[1]:
             entry["exception"] = self.formatException(record.exc_info)
-        return json.dumps(entry, default=str)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+class _TextFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__(
+            fmt="%(asctime)s %(levelname)s %(name)s - %(message)s",
+            datefmt="%Y-%m-%dT%H:%M:%S%z",
+        )
 
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        line = super().formatMessage(record)
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            line = f"{line} req={request_id}"
+        action = getattr(record, "action", None)
+        return f"{line} action={action}" if action else line
 
-def _get_log_format() -> str:
-    """Read log format from settings without circular import risk."""
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge args and render the traceback here; the listener does the formatting.
+        # The stock prepare() formats the whole line on the caller's thread.
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class _ContextFilter(logging.Filter):
+    """
+    Stamps the current request id and action on each record and applies sampling rules.
+
+    A rule is `(message prefix or None, keep rate)`; the first rule whose prefix matches
+    the unformatted message wins. WARNING and above are never sampled. Inside a request
+    the keep/drop choice is derived from the request id, so a request's lines are kept
+    or dropped together.
+    """
+
+    def __init__(self, rules: List[Tuple[Optional[str], float]]):
+        super().__init__()
+        self.rules = rules
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = request_id_var.get()
+        record.request_id = request_id
+        record.action = action_var.get()
+        if not self.rules or record.levelno >= logging.WARNING:
+            return True
+        msg = record.msg if isinstance(record.msg, str) else ""
+        for prefix, rate in self.rules:
+            if prefix is None or msg.startswith(prefix):
+                if rate >= 1:
+                    return True
+                if request_id:
+                    return zlib.crc32(request_id.encode()) < rate * 2**32
+                return random.random() < rate
+        return True
+
+
+def _get_settings():
+    """Read settings without circular import risk."""
     try:
         from config.config import settings
-        return settings.log_format
+        return settings
     except Exception:
-        return "text"
+        return None
+
+
+_handler: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _shared_handler() -> logging.Handler:
+    global _handler, _listener
+    if _handler is not None:
+        return _handler
+
+    settings = _get_settings()
+    # none of our formats print thread/process names; skip collecting them for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    stream = logging.StreamHandler(sys.stdout)
+    if settings is not None and settings.log_format == "json":
+        stream.setFormatter(_JsonFormatter())
+    else:
+        stream.setFormatter(_TextFormatter())
+
+    if settings is not None and settings.log_async:
+        q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(q, stream, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_log_listener)
+        _handler = _QueueHandler(q)
+    else:
+        _handler = stream
+    return _handler
+
+
+def stop_log_listener() -> None:
+    """Flush queued records and stop the writer thread (no-op in synchronous mode)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _sampling_rules(name: str) -> List[Tuple[Optional[str], float]]:
+    settings = _get_settings()
+    rates: Dict[str, float] = settings.log_sample_rates if settings is not None else {}
+    prefixed = []
+    whole = []
+    for key, rate in rates.items():
+        logger_name, sep, prefix = key.partition(":")
+        if logger_name != name:
+            continue
+        if sep:
+            prefixed.append((prefix, rate))
+        else:
+            whole.append((None, rate))
+    # longest prefix first, then the logger-wide rate
+    prefixed.sort(key=lambda rule: len(rule[0]), reverse=True)
+    return prefixed + whole
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -33,17 +191,7 @@ def get_logger(name: str) -> logging.Logger:
         return logger
 
     logger.setLevel(logging.INFO)
-    handler = logging.StreamHandler(sys.stdout)
-
-    if _get_log_format() == "json":
-        handler.setFormatter(_JsonFormatter())
-    else:
-        handler.setFormatter(logging.Formatter(
-            fmt="%(asctime)s %(levelname)s %(name)s - %(message)s",
-            datefmt="%Y-%m-%dT%H:%M:%S%z",
-        ))
-
-    logger.addHandler(handler)
+    logger.addFilter(_ContextFilter(_sampling_rules(name)))
+    logger.addHandler(_shared_handler())
     logger.propagate = False
     return logger
-
@@ -1,23 +1,27 @@
 from __future__ import annotations
 
+import hashlib
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
 
-import httpx
 import jwt
 
 from config.config import settings
+from core.plugins.auth.jwks_store import JwksKeyStore, JwksUnavailableError
+from core.plugins.metrics import AUTH_TOKEN_CACHE_LOOKUPS
 
 
 class AuthError(Exception):
     pass
 
 
-@dataclass
-class JwksCache:
-    jwks: Optional[Dict[str, Any]] = None
-    expires_at: float = 0.0
+class InvalidTokenError(AuthError):
+    """The token itself was rejected (as opposed to auth being misconfigured or JWKS unreachable)."""
+
+
+_LEEWAY_SECONDS = 30
 
 
 @dataclass
@@ -26,24 +30,97 @@ class AuthClaims:
     email: str | None = None
 
 
-_cache = JwksCache()
-
-
-async def _get_jwks() -> Dict[str, Any]:
-    if _cache.jwks and _cache.expires_at > time.time():
-        return _cache.jwks
-
+@dataclass
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verification results keyed by a digest of the raw token.
+
+    Verified claims are held until the token's `exp` minus the verification leeway, so a
+    cached token never outlives what a full check would accept. Rejections (bad
+    signature, expired, unknown kid, ...) are kept for `negative_ttl_seconds` so a client
+    retrying a bad token doesn't cost a signature check each time.
+
+    Lookups are counted in `auth_token_cache_lookups_total{result}` on /metrics (summed
+    across workers); the per-worker counters here back /admin/cache-stats.
+    """
+
+    max_entries: int = 10_000
+    negative_ttl_seconds: float = 5.0
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    _entries: "OrderedDict[bytes, Tuple[float, AuthClaims | str]]" = field(default_factory=OrderedDict)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=20).digest()
+
+    def get(self, key: bytes) -> AuthClaims | str | None:
+        """Cached claims, a rejection reason, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            AUTH_TOKEN_CACHE_LOOKUPS.inc("miss")
+            return None
+        self._entries.move_to_end(key)
+        if isinstance(entry[1], AuthClaims):
+            self.hits += 1
+            AUTH_TOKEN_CACHE_LOOKUPS.inc("hit")
+        else:
+            self.negative_hits += 1
+            AUTH_TOKEN_CACHE_LOOKUPS.inc("negative_hit")
+        return entry[1]
+
+    def put_verified(self, key: bytes, claims: AuthClaims, exp: float) -> None:
+        expires_at = exp - _LEEWAY_SECONDS
+        if expires_at > time.time():
+            self._put(key, expires_at, claims)
+
+    def put_rejected(self, key: bytes, reason: str) -> None:
+        if self.negative_ttl_seconds > 0:
+            self._put(key, time.time() + self.negative_ttl_seconds, reason)
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "negativeHits": self.negative_hits,
+            "misses": self.misses,
+            "hitRate": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def _put(self, key: bytes, expires_at: float, value: AuthClaims | str) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_key_store: JwksKeyStore | None = None
+_token_cache = VerifiedTokenCache(
+    max_entries=settings.auth_token_cache_max_entries,
+    negative_ttl_seconds=settings.auth_token_cache_negative_ttl_seconds,
+)
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    return _token_cache
+
+
+def get_jwks_store() -> JwksKeyStore:
+    global _key_store
     if not settings.clerk_jwks_url:
         raise AuthError("CLERK_JWKS_URL not configured")
-
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        resp = await client.get(settings.clerk_jwks_url)
-        resp.raise_for_status()
-        jwks = resp.json()
-
-    _cache.jwks = jwks
-    _cache.expires_at = time.time() + 60 * 10
-    return jwks
+    if _key_store is None:
+        _key_store = JwksKeyStore(url=settings.clerk_jwks_url)
+    return _key_store
 
 
 async def verify_clerk_bearer_token(token: str) -> AuthClaims:
@@ -53,38 +130,60 @@ async def verify_clerk_bearer_token(token: str) -> AuthClaims:
     if not settings.clerk_issuer:
         raise AuthError("CLERK_ISSUER not configured")
 
-    jwks = await _get_jwks()
+    if not _token_cache.enabled:
+        claims, _ = await _verify_token(token)
+        return claims
+
+    key = _token_cache.key(token)
+    cached = _token_cache.get(key)
+    if isinstance(cached, AuthClaims):
+        return cached
+    if cached is not None:
+        raise InvalidTokenError(cached)
+
+    try:
+        claims, exp = await _verify_token(token)
+    except InvalidTokenError as e:
+        _token_cache.put_rejected(key, str(e))
+        raise
+    if exp is not None:
+        _token_cache.put_verified(key, claims, exp)
+    return claims
+
+
+async def _verify_token(token: str) -> Tuple[AuthClaims, Optional[float]]:
+    """Full signature check. Returns the claims and the token's `exp`, if any."""
+    store = get_jwks_store()
     try:
         unverified = jwt.get_unverified_header(token)
         kid = unverified.get("kid")
         if not kid:
             raise AuthError("missing kid")
     except Exception as e:  # noqa: BLE001
-        raise AuthError("invalid token header") from e
+        raise InvalidTokenError("invalid token header") from e
 
-    key = None
-    for k in jwks.get("keys", []):
-        if k.get("kid") == kid:
-            key = k
-            break
-    if not key:
-        raise AuthError("unknown kid")
+    try:
+        key = await store.get_key(kid)
+    except JwksUnavailableError as e:
+        raise AuthError("signing keys unavailable") from e
+    if key is None:
+        raise InvalidTokenError("unknown kid")
 
     try:
         claims = jwt.decode(
             token,
-            jwt.algorithms.RSAAlgorithm.from_jwk(key),
+            key,
             algorithms=["RS256"],
             issuer=settings.clerk_issuer,
             options={"verify_aud": False},
-            leeway=30,
+            leeway=_LEEWAY_SECONDS,
         )
     except Exception as e:  # noqa: BLE001
-        raise AuthError("token verification failed") from e
+        raise InvalidTokenError("token verification failed") from e
 
     sub = claims.get("sub")
     if not sub:
-        raise AuthError("missing sub")
+        raise InvalidTokenError("missing sub")
 
     email = claims.get("email") or claims.get("primary_email_address")
     if not email:
@@ -94,4 +193,8 @@ async def verify_clerk_bearer_token(token: str) -> AuthClaims:
             if isinstance(first, dict):
                 email = first.get("email_address")
 
-    return AuthClaims(user_id=str(sub), email=str(email).lower() if email else None)
+    exp = claims.get("exp")
+    return (
+        AuthClaims(user_id=str(sub), email=str(email).lower() if email else None),
+        float(exp) if isinstance(exp, (int, float)) else None,
+    )
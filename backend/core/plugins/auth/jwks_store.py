@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+import httpx
+import jwt
+
+from core.logger.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class JwksUnavailableError(Exception):
+    """No signing keys could be loaded and none are cached."""
+
+
+@dataclass
+class JwksKeyStore:
+    """
+    Signing keys indexed by `kid`, parsed once into ready-to-use public key objects.
+
+    - A background task refreshes the set before it expires, so requests never wait on
+      the JWKS URL in the steady state.
+    - Fetches are single-flight: every caller that needs a fetch at the same moment
+      awaits the same one.
+    - An unknown `kid` (key rotation) triggers at most one fetch per
+      `unknown_kid_refetch_seconds`, so garbage kids can't hammer the JWKS URL.
+    - A failed fetch keeps the previous keys; stale keys are served until a fetch succeeds.
+    """
+
+    url: str
+    ttl_seconds: float = 600.0
+    refresh_ahead_seconds: float = 60.0
+    retry_seconds: float = 30.0
+    unknown_kid_refetch_seconds: float = 30.0
+    _keys: Dict[str, Any] = field(default_factory=dict)
+    _expires_at: float = 0.0
+    _last_fetch_at: float = 0.0
+    _inflight: "asyncio.Future[bool] | None" = None
+    _task: asyncio.Task[None] | None = None
+    _running: bool = False
+
+    def load(self, jwks: Dict[str, Any]) -> int:
+        """Parse a JWKS document and swap it in. Returns the number of usable keys."""
+        keys: Dict[str, Any] = {}
+        for jwk in jwks.get("keys", []):
+            kid = jwk.get("kid")
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+            except Exception as e:  # noqa: BLE001
+                logger.warning("jwks skipping unusable key kid=%s err=%s", kid, e)
+        if not keys:
+            raise JwksUnavailableError("JWKS contains no usable RSA keys")
+        self._keys = keys
+        self._expires_at = time.time() + self.ttl_seconds
+        return len(keys)
+
+    async def get_key(self, kid: str) -> Any | None:
+        """The parsed key for `kid`, or None if the current key set doesn't have it."""
+        key = self._keys.get(kid)
+        if key is not None:
+            now = time.time()
+            if self._expires_at <= now and not self._running and now - self._last_fetch_at >= self.retry_seconds:
+                # no background refresher: refresh lazily, still serving what we have on failure
+                await self.refresh()
+                key = self._keys.get(kid, key)
+            return key
+
+        if not self._keys or time.time() - self._last_fetch_at >= self.unknown_kid_refetch_seconds:
+            await self.refresh()
+        if not self._keys:
+            raise JwksUnavailableError("JWKS unavailable")
+        return self._keys.get(kid)
+
+    async def refresh(self) -> bool:
+        """Single-flight fetch. Returns False (keeping any previous keys) on failure."""
+        if self._inflight is not None:
+            return await asyncio.shield(self._inflight)
+
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._inflight = future
+        ok = False
+        try:
+            self._last_fetch_at = time.time()
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                resp = await client.get(self.url)
+                resp.raise_for_status()
+                count = self.load(resp.json())
+            logger.info("jwks refreshed keys=%s", count)
+            ok = True
+        except Exception as e:  # noqa: BLE001
+            logger.warning("jwks refresh failed, serving %s cached keys err=%s", len(self._keys), e)
+        finally:
+            future.set_result(ok)
+            self._inflight = None
+        return ok
+
+    async def _worker(self) -> None:
+        while self._running:
+            ok = await self.refresh()
+            if ok:
+                delay = max(1.0, self._expires_at - time.time() - self.refresh_ahead_seconds)
+            else:
+                delay = self.retry_seconds
+            # jitter so workers started together don't refresh in lockstep
+            await asyncio.sleep(delay * random.uniform(0.9, 1.0))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._running = True
+            self._task = asyncio.create_task(self._worker())
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
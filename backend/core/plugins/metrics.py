@@ -0,0 +1,282 @@
+"""
+Prometheus-style metrics (counters, histograms, gauges) with text exposition at /metrics.
+
+Recording is lock-free: each thread writes to its own shard of every metric (the event
+loop thread in practice; Mongo driver callbacks arrive on executor threads), and shards
+are only summed when a snapshot is taken.
+
+Across uvicorn workers: each worker writes its snapshot to `<metrics dir>/<pid>.json`
+every `flush_seconds`, and whichever worker serves /metrics sums its live values with
+the other workers' files. Files not refreshed for three flush intervals belong to dead
+workers and are ignored, so their counters drop out (Prometheus treats it as a reset).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+from config.config import settings
+from core.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+class _Sharded:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict[Labels, Any]] = []
+
+    def _shard(self) -> Dict[Labels, Any]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: Dict[Labels, Any] = {}
+            self._local.shard = shard
+            self._shards.append(shard)
+            return shard
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def collect(self) -> Dict[Labels, float]:
+        totals: Dict[Labels, float] = {}
+        for shard in list(self._shards):
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+
+class Histogram(_Sharded):
+    """Bucket counts are stored per bucket (not cumulative), followed by the sum."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        row = shard.get(labels)
+        if row is None:
+            row = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def collect(self) -> Dict[Labels, List[float]]:
+        totals: Dict[Labels, List[float]] = {}
+        for shard in list(self._shards):
+            for labels, row in list(shard.items()):
+                total = totals.get(labels)
+                if total is None:
+                    totals[labels] = list(row)
+                else:
+                    for i, value in enumerate(row):
+                        total[i] += value
+        return totals
+
+
+@dataclass
+class Gauge:
+    """A value read from `read()` at snapshot time (queue depths, pool checkouts)."""
+
+    name: str
+    help: str
+    read: Callable[[], float]
+    kind: str = "gauge"
+
+
+@dataclass
+class MetricsRegistry:
+    _metrics: Dict[str, Any] = field(default_factory=dict)
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, read: Callable[[], float]) -> Gauge:
+        gauge = Gauge(name, help, read)
+        self._metrics[name] = gauge
+        return gauge
+
+    def snapshot(self) -> Dict[str, Any]:
+        """This process's values, JSON-serializable: {name: [[labels, value], ...]}."""
+        out: Dict[str, Any] = {}
+        for name, metric in self._metrics.items():
+            if isinstance(metric, Gauge):
+                try:
+                    out[name] = [[[], float(metric.read())]]
+                except Exception:
+                    logger.exception("gauge read failed name=%s", name)
+            else:
+                out[name] = [[list(labels), value] for labels, value in metric.collect().items()]
+        return out
+
+    def render(self, snapshots: List[Dict[str, Any]]) -> str:
+        """Sum `snapshots` (one per worker) and render the Prometheus text format."""
+        lines: List[str] = []
+        for name, metric in self._metrics.items():
+            merged: Dict[Labels, Any] = {}
+            for snapshot in snapshots:
+                for labels, value in snapshot.get(name, ()):
+                    key = tuple(labels)
+                    current = merged.get(key)
+                    if current is None:
+                        merged[key] = list(value) if isinstance(value, list) else value
+                    elif isinstance(current, list):
+                        for i, v in enumerate(value):
+                            current[i] += v
+                    else:
+                        merged[key] = current + value
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            labelnames = getattr(metric, "labelnames", ())
+            for labels, value in sorted(merged.items()):
+                pairs = [f'{k}="{_escape(v)}"' for k, v in zip(labelnames, labels)]
+                if isinstance(metric, Histogram):
+                    cumulative = 0
+                    for le, count in zip((*metric.buckets, math.inf), value):
+                        cumulative += count
+                        le_pair = 'le="+Inf"' if le == math.inf else f'le="{le:g}"'
+                        lines.append(f"{name}_bucket{{{','.join([*pairs, le_pair])}}} {cumulative:g}")
+                    suffix = f"{{{','.join(pairs)}}}" if pairs else ""
+                    lines.append(f"{name}_sum{suffix} {value[-1]:g}")
+                    lines.append(f"{name}_count{suffix} {cumulative:g}")
+                else:
+                    suffix = f"{{{','.join(pairs)}}}" if pairs else ""
+                    lines.append(f"{name}{suffix} {value:g}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@dataclass
+class MetricsExporter:
+    """Publishes this worker's snapshot for the others and collects theirs."""
+
+    registry: MetricsRegistry
+    directory: str = ""
+    flush_seconds: float = 5.0
+    _task: asyncio.Task[None] | None = None
+    _running: bool = False
+
+    def __post_init__(self) -> None:
+        if not self.directory:
+            base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+            self.directory = os.path.join(base, "memetok-metrics")
+        self._path = os.path.join(self.directory, f"{os.getpid()}.json")
+
+    def flush(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self._path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(self.registry.snapshot()))
+        os.replace(tmp, self._path)
+
+    def collect(self) -> List[Dict[str, Any]]:
+        """This worker's live snapshot plus every other live worker's last flush."""
+        snapshots = [self.registry.snapshot()]
+        if self.flush_seconds <= 0:
+            return snapshots
+        cutoff = time.time() - 3 * self.flush_seconds
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return snapshots
+        for entry in entries:
+            if not entry.name.endswith(".json") or entry.path == self._path:
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    continue
+                with open(entry.path, "rb") as f:
+                    snapshots.append(orjson.loads(f.read()))
+            except (OSError, orjson.JSONDecodeError):
+                continue
+        return snapshots
+
+    def render(self) -> str:
+        return self.registry.render(self.collect())
+
+    async def _worker(self) -> None:
+        while self._running:
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("metrics flush failed path=%s", self._path)
+            await asyncio.sleep(self.flush_seconds)
+
+    def start(self) -> None:
+        if self.flush_seconds <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._running = True
+            self._task = asyncio.create_task(self._worker())
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        try:
+            os.unlink(self._path)
+        except OSError:
+            pass
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")
+)
+HTTP_RESPONSES = metrics.counter("http_responses_total", "HTTP responses by status code.", ("status",))
+RATE_LIMITED = metrics.counter("rate_limited_total", "Requests rejected with 429, by limiter.", ("limiter",))
+CQRS_ACTION_SECONDS = metrics.histogram(
+    "cqrs_action_duration_seconds", "CQRS handler latency by action and outcome.", ("type", "action", "outcome")
+)
+AUTH_TOKEN_CACHE_LOOKUPS = metrics.counter(
+    "auth_token_cache_lookups_total", "Verified-token cache lookups by result (hit, negative_hit, miss).", ("result",)
+)
+
+_exporter: Optional[MetricsExporter] = None
+
+
+def get_metrics_exporter() -> MetricsExporter:
+    global _exporter
+    if _exporter is None:
+        _exporter = MetricsExporter(
+            registry=metrics, directory=settings.metrics_dir, flush_seconds=settings.metrics_flush_seconds
+        )
+    return _exporter
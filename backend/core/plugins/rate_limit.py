@@ -0,0 +1,176 @@
+"""
+GCRA (generic cell rate algorithm) limiter shared by the global IP limiter and the upload limiter.
+
+Each key holds a single float, its theoretical arrival time (TAT): requests are spaced
+`window / max_requests` apart and up to `max_requests` may arrive back to back. A check
+is O(1) and memory per key is constant, unlike a log of request timestamps.
+
+Where the TATs live is pluggable (`create_rate_limiter`):
+
+- "memory": a dict in each worker process, so N workers allow N times the limit;
+- "shm": an mmap'd table shared by every worker on the host (`rate_limit_shm`);
+- "mongo": a collection shared by every node (`rate_limit_mongo`).
+
+The shared backends fall back to an in-process limiter while their store is unavailable.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Protocol
+
+from config.config import settings
+from core.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    # seconds until a request would be allowed again (0 when allowed)
+    retry_after: float = 0.0
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+_ALLOWED = RateLimitDecision(allowed=True)
+
+
+class GcraRateLimiter:
+    """
+    `max_requests` per `window_seconds`, per key: a burst of `max_requests`, then one
+    request every `window_seconds / max_requests`.
+
+    Keys whose TAT has passed carry no state worth keeping and are swept about once per
+    window. Tracking is capped at `max_keys`: a sweep triggered by the cap always trims
+    to nine tenths of it, forgetting the longest-tracked live keys if expiry alone
+    doesn't, which can only make the limiter more lenient for those keys, never
+    stricter. Sweeps are O(keys) but run at most once per window or per `max_keys / 10`
+    new keys, so checks stay O(1) amortized.
+    """
+
+    def __init__(
+        self,
+        max_requests: int,
+        window_seconds: float,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._interval = window_seconds / max(1, max_requests)
+        self._clock = clock
+        self._tat: Dict[str, float] = {}
+        self._next_sweep = 0.0
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+    def hit(self, key: str) -> RateLimitDecision:
+        """Count one request for `key` if it is within the limit."""
+        now = self._clock()
+        tats = self._tat
+        tat = tats.get(key)
+        known = tat is not None
+        if not known or tat < now:
+            tat = now
+        new_tat = tat + self._interval
+        # earliest moment this request would conform
+        allow_at = new_tat - self.window_seconds
+        if allow_at > now:
+            return RateLimitDecision(allowed=False, retry_after=allow_at - now)
+
+        tats[key] = new_tat
+        if not known:
+            if len(tats) > self.max_keys:
+                self._sweep(now, keep=self.max_keys * 9 // 10)
+            elif now >= self._next_sweep:
+                self._sweep(now)
+        return _ALLOWED
+
+    def _sweep(self, now: float, keep: Optional[int] = None) -> None:
+        """Drop expired keys, then, if `keep` is given, the longest-tracked live keys beyond it."""
+        live = {k: v for k, v in self._tat.items() if v > now}
+        if keep is not None and len(live) > keep:
+            # dicts keep insertion order, so this drops the longest-tracked keys
+            live = dict(islice(live.items(), len(live) - keep, None))
+        self._tat = live
+        self._next_sweep = now + self.window_seconds
+
+
+class RateLimiter(Protocol):
+    async def hit(self, key: str) -> RateLimitDecision:
+        ...
+
+
+class LocalRateLimiter:
+    """Per-process backend: a `GcraRateLimiter` behind the async `RateLimiter` interface."""
+
+    def __init__(self, limiter: GcraRateLimiter):
+        self.limiter = limiter
+
+    async def hit(self, key: str) -> RateLimitDecision:
+        return self.limiter.hit(key)
+
+
+_limiters: List[RateLimiter] = []
+
+
+def create_rate_limiter(
+    name: str,
+    max_requests: int,
+    window_seconds: float,
+    max_keys: int = 100_000,
+    backend: Optional[str] = None,
+) -> RateLimiter:
+    """
+    Build the limiter for one policy. `name` namespaces its keys in the shared stores, so
+    each policy (IP, uploads, ...) needs its own. A shared backend that can't be opened
+    degrades to the per-process limiter instead of failing startup.
+    """
+    backend = backend or settings.rate_limit_backend
+    local = GcraRateLimiter(max_requests, window_seconds, max_keys=max_keys)
+    limiter: RateLimiter = LocalRateLimiter(local)
+    if backend == "shm":
+        from core.plugins.rate_limit_shm import SharedMemoryRateLimiter
+
+        try:
+            limiter = SharedMemoryRateLimiter.open(
+                name=name,
+                max_requests=max_requests,
+                window_seconds=window_seconds,
+                max_keys=max_keys,
+                directory=settings.rate_limit_shm_dir,
+                fallback=local,
+            )
+        except (ImportError, OSError, ValueError):
+            logger.warning("shared-memory rate limiter unavailable name=%s, using per-worker limits", name, exc_info=True)
+    elif backend == "mongo":
+        from core.plugins.rate_limit_mongo import MongoRateLimiter
+
+        limiter = MongoRateLimiter(
+            name=name,
+            max_requests=max_requests,
+            window_seconds=window_seconds,
+            fallback=local,
+            timeout_seconds=settings.rate_limit_store_timeout_ms / 1000,
+        )
+    elif backend != "memory":
+        raise ValueError(f"unknown rate limit backend: {backend!r}")
+    _limiters.append(limiter)
+    return limiter
+
+
+async def setup_rate_limiters() -> None:
+    """Prepare the stores of every limiter created so far (e.g. Mongo TTL indexes)."""
+    for limiter in _limiters:
+        setup = getattr(limiter, "setup", None)
+        if setup is not None:
+            await setup()
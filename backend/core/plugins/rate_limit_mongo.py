@@ -0,0 +1,126 @@
+"""
+Cluster-wide GCRA state in MongoDB, for deployments running more than one host.
+
+Each key is one document `{_id: "<policy>:<key>", tat, allowed, expiresAt}` updated by a
+single `find_one_and_update` pipeline, so the check-and-set is atomic on the server no
+matter how many nodes hit the same key. A TTL index removes documents once their TAT
+has passed. TATs are wall-clock seconds from the calling node, so node clocks should be
+NTP-synced; skew shifts a key's allowance by at most the skew.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from core.logger.logger import get_logger
+from core.plugins.rate_limit import _ALLOWED, GcraRateLimiter, RateLimitDecision
+from database.mongo_factory import get_mongo
+
+logger = get_logger(__name__)
+
+RATE_LIMITS_COLLECTION = "rate_limits"
+
+
+class MongoRateLimiter:
+    """
+    `max_requests` per `window_seconds` per key, counted across every node sharing the
+    database.
+
+    A check that errors or takes longer than `timeout_seconds` is answered by `fallback`
+    (per-process limits), and the store is then bypassed for `retry_seconds` so an outage
+    costs each request nothing beyond the local check.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_requests: int,
+        window_seconds: float,
+        fallback: GcraRateLimiter,
+        timeout_seconds: float = 0.1,
+        retry_seconds: float = 10.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.name = name
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.fallback = fallback
+        self.timeout_seconds = timeout_seconds
+        self.retry_seconds = retry_seconds
+        self._interval = window_seconds / max(1, max_requests)
+        self._clock = clock
+        self._bypass_until = -math.inf
+
+    async def setup(self) -> None:
+        try:
+            col = get_mongo().db[RATE_LIMITS_COLLECTION]
+            await col.create_index("expiresAt", expireAfterSeconds=0, background=True)
+        except PyMongoError:
+            logger.warning("failed to ensure rate limit TTL index", exc_info=True)
+
+    async def hit(self, key: str) -> RateLimitDecision:
+        if time.monotonic() < self._bypass_until:
+            return self.fallback.hit(key)
+        try:
+            return await asyncio.wait_for(self._hit(key), timeout=self.timeout_seconds)
+        except (PyMongoError, asyncio.TimeoutError) as e:
+            self._bypass_until = time.monotonic() + self.retry_seconds
+            logger.warning(
+                "rate limit store unavailable name=%s error=%s, using per-worker limits for %ss",
+                self.name,
+                type(e).__name__,
+                self.retry_seconds,
+            )
+            return self.fallback.hit(key)
+
+    async def _hit(self, key: str) -> RateLimitDecision:
+        col = get_mongo().db[RATE_LIMITS_COLLECTION]
+        now = self._clock()
+        window = self.window_seconds
+        pipeline = [
+            # missing, expired, or beyond now + window (a clock ahead of ours): start from now
+            {
+                "$set": {
+                    "tat": {
+                        "$let": {
+                            "vars": {"t": {"$ifNull": ["$tat", now]}},
+                            "in": {"$cond": [{"$and": [{"$gte": ["$$t", now]}, {"$lte": ["$$t", now + window]}]}, "$$t", now]},
+                        }
+                    }
+                }
+            },
+            {"$set": {"allowed": {"$lte": [{"$add": ["$tat", self._interval - window]}, now]}}},
+            {
+                "$set": {
+                    "tat": {"$cond": ["$allowed", {"$add": ["$tat", self._interval]}, "$tat"]},
+                    "expiresAt": datetime.fromtimestamp(now + window, tz=timezone.utc),
+                }
+            },
+        ]
+        doc_id = f"{self.name}:{key}"
+        try:
+            doc = await self._apply(col, doc_id, pipeline)
+        except DuplicateKeyError:
+            # two first hits for a key raced on the upsert; the loser retries as an update
+            doc = await self._apply(col, doc_id, pipeline)
+
+        if doc["allowed"]:
+            return _ALLOWED
+        return RateLimitDecision(allowed=False, retry_after=doc["tat"] + self._interval - window - now)
+
+    @staticmethod
+    async def _apply(col, doc_id: str, pipeline: list) -> dict:
+        return await col.find_one_and_update(
+            {"_id": doc_id},
+            pipeline,
+            projection={"_id": 0, "tat": 1, "allowed": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
@@ -0,0 +1,160 @@
+"""
+Host-wide GCRA state in an mmap'd file shared by every worker process.
+
+The file is an open-addressed hash table of fixed 16-byte slots (8-byte key hash, 8-byte
+TAT as wall-clock seconds). A key lives in one of `_PROBES` consecutive slots starting
+at its home slot; that probe window is held under an fcntl byte-range lock for the
+read-modify-write, so an update is atomic across processes while checks for keys in
+other windows proceed in parallel.
+
+A slot whose TAT has passed holds nothing worth keeping and is reused, which doubles as
+expiry. When every slot in a window is live, the one closest to expiring is evicted:
+like the in-process key cap, that can only make the limiter more lenient for that key.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import math
+import mmap
+import os
+import struct
+import tempfile
+import time
+from hashlib import blake2b
+from typing import Callable
+
+from core.logger.logger import get_logger
+from core.plugins.rate_limit import _ALLOWED, GcraRateLimiter, RateLimitDecision
+
+logger = get_logger(__name__)
+
+_MAGIC = b"MTRLSHM1"
+_HEADER = struct.Struct("<8sQ")  # magic, slot count
+_SLOT = struct.Struct("<Qd")  # key hash (0 = never used), TAT
+_PROBES = 8
+_FALLBACK_LOG_INTERVAL_SECONDS = 60.0
+
+
+def _key_hash(key: str) -> int:
+    return int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+class SharedMemoryRateLimiter:
+    """
+    `max_requests` per `window_seconds` per key, counted across every process that maps
+    the same file. Use `open()`; the file name encodes the policy and table size, so a
+    deploy that changes either starts on a fresh table instead of reinterpreting one a
+    still-running worker has mapped.
+
+    If a lock or mmap operation fails mid-flight, the check is answered by `fallback`
+    (per-process limits) rather than failing the request.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_requests: int,
+        window_seconds: float,
+        slots: int,
+        fallback: GcraRateLimiter,
+        clock: Callable[[], float] = time.time,
+    ):
+        if slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        self.path = path
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.fallback = fallback
+        self._interval = window_seconds / max(1, max_requests)
+        self._clock = clock
+        self._mask = slots - 1
+        self._probe_bytes = _PROBES * _SLOT.size
+        self._last_fallback_log = -math.inf
+
+        size = _HEADER.size + (slots + _PROBES) * _SLOT.size  # tail slack: probes never wrap
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size != size:
+                    os.ftruncate(fd, size)
+                mm = mmap.mmap(fd, size)
+                if _HEADER.unpack_from(mm, 0) != (_MAGIC, slots):
+                    mm[:] = bytes(size)
+                    _HEADER.pack_into(mm, 0, _MAGIC, slots)
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self._mm = mm
+
+    @classmethod
+    def open(
+        cls,
+        name: str,
+        max_requests: int,
+        window_seconds: float,
+        max_keys: int,
+        fallback: GcraRateLimiter,
+        directory: str = "",
+    ) -> "SharedMemoryRateLimiter":
+        # twice the key cap keeps probe windows mostly empty
+        slots = 1 << max(10, (2 * max_keys - 1).bit_length())
+        directory = directory or ("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+        path = os.path.join(directory, f"memetok-rl-{name}-{max_requests}-{window_seconds:g}-{slots}.bin")
+        limiter = cls(path, max_requests, window_seconds, slots, fallback)
+        logger.info("shared-memory rate limiter name=%s path=%s slots=%d", name, path, slots)
+        return limiter
+
+    async def hit(self, key: str) -> RateLimitDecision:
+        try:
+            return self.hit_sync(key)
+        except (OSError, ValueError):
+            now = time.monotonic()
+            if now - self._last_fallback_log >= _FALLBACK_LOG_INTERVAL_SECONDS:
+                self._last_fallback_log = now
+                logger.warning("shared-memory rate limiter failed path=%s, using per-worker limits", self.path, exc_info=True)
+            return self.fallback.hit(key)
+
+    def hit_sync(self, key: str) -> RateLimitDecision:
+        """Count one request for `key` if it is within the limit."""
+        h = _key_hash(key)
+        start = _HEADER.size + (h & self._mask) * _SLOT.size
+        mm = self._mm
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, self._probe_bytes, start)
+        try:
+            now = self._clock()
+            slot = free = victim = -1
+            victim_tat = math.inf
+            tat = now
+            for off in range(start, start + self._probe_bytes, _SLOT.size):
+                slot_hash, slot_tat = _SLOT.unpack_from(mm, off)
+                if slot_hash == h:
+                    slot, tat = off, slot_tat
+                    break
+                if slot_tat <= now:
+                    if free < 0:
+                        free = off
+                elif slot_tat < victim_tat:
+                    victim, victim_tat = off, slot_tat
+            if slot < 0:
+                slot = free if free >= 0 else victim
+            # a TAT beyond now + window can only come from a clock step back; don't honour it
+            if tat < now or tat > now + self.window_seconds:
+                tat = now
+
+            new_tat = tat + self._interval
+            allow_at = new_tat - self.window_seconds
+            if allow_at > now:
+                return RateLimitDecision(allowed=False, retry_after=allow_at - now)
+            _SLOT.pack_into(mm, slot, h, new_tat)
+            return _ALLOWED
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, self._probe_bytes, start)
+
+    def close(self) -> None:
+        self._mm.close()
+        os.close(self._fd)
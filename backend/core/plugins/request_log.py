@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import time
+from uuid import uuid4
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.logger.logger import get_logger, request_id_var
+from core.plugins.metrics import HTTP_REQUEST_SECONDS, HTTP_RESPONSES
+
+logger = get_logger(__name__)
+
+
+class RequestLogMiddleware:
+    """
+    Logs start/end (status, duration) of every HTTP request and records them in the
+    HTTP metrics, labelled by route template (not raw path). Pure ASGI.
+
+    The request id is also published in `request_id_var`, so every line logged while
+    serving the request carries it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        req_id = uuid4().hex[:12]
+        token = request_id_var.set(req_id)
+        start = time.perf_counter()
+        status = 0
+        logger.info("req start id=%s method=%s path=%s", req_id, scope["method"], scope["path"])
+
+        async def send_capturing_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_capturing_status)
+        except Exception:
+            status = status or 500
+            dur_ms = int((time.perf_counter() - start) * 1000)
+            logger.exception("req error id=%s dur_ms=%s", req_id, dur_ms)
+            raise
+        else:
+            dur_ms = int((time.perf_counter() - start) * 1000)
+            logger.info("req end id=%s status=%s dur_ms=%s", req_id, status, dur_ms)
+        finally:
+            request_id_var.reset(token)
+            # the router stores the matched route in the scope; unmatched paths share a label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, scope["method"], route)
+            HTTP_RESPONSES.inc(str(status))
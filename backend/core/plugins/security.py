@@ -3,22 +3,25 @@ Production security middleware for MemeToken backend.
 
 Provides:
 - Security response headers (HSTS, CSP, X-Frame-Options, etc.)
-- Global IP-based rate limiting (sliding window)
+- Global IP-based rate limiting (GCRA)
 - Request timeout enforcement
+
+All three are pure ASGI middlewares: they act on the `send` messages directly instead
+of wrapping every request in a task and re-streaming the response, and pass
+non-HTTP scopes (lifespan, websockets) through untouched.
 """
 
 from __future__ import annotations
 
 import asyncio
-import time
-from collections import defaultdict
-from typing import Callable, Dict, List, Tuple
+from typing import List, Tuple
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from core.logger.logger import get_logger
+from core.plugins.metrics import RATE_LIMITED
+from core.plugins.rate_limit import create_rate_limiter
 
 logger = get_logger(__name__)
 
@@ -38,98 +41,130 @@ _SECURITY_HEADERS = {
 }
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Adds security headers to every HTTP response."""
+_ENCODED_SECURITY_HEADERS: List[Tuple[bytes, bytes]] = [
+    (k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in _SECURITY_HEADERS.items()
+]
+_SECURITY_HEADER_NAMES = frozenset(k for k, _ in _ENCODED_SECURITY_HEADERS)
+
+
+class SecurityHeadersMiddleware:
+    """Adds security headers to every HTTP response, replacing any the app set."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [h for h in message.get("headers", []) if h[0].lower() not in _SECURITY_HEADER_NAMES]
+                headers.extend(_ENCODED_SECURITY_HEADERS)
+                message["headers"] = headers
+            await send(message)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        for header, value in _SECURITY_HEADERS.items():
-            response.headers[header] = value
-        return response
+        await self.app(scope, receive, send_with_headers)
 
 
 # ---------------------------------------------------------------------------
-# 2. Global Rate Limiter Middleware (sliding-window, IP-based)
+# 2. Global Rate Limiter Middleware (GCRA, IP-based)
 # ---------------------------------------------------------------------------
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
-    IP-based sliding-window rate limiter.
+    IP-based rate limiter.
 
-    Tracks request timestamps per IP and rejects requests that exceed
-    `max_requests` within a rolling `window_seconds` period.
-    Cleanup of stale entries runs every `_CLEANUP_INTERVAL` seconds.
+    Allows `max_requests` per `window_seconds` per client IP using the shared O(1)
+    GCRA limiter, tracking at most `max_tracked_ips` addresses. `backend` picks where
+    the counts live (see `create_rate_limiter`); only "shm" and "mongo" hold the limit
+    across worker processes.
     """
 
-    _CLEANUP_INTERVAL = 60  # seconds between stale-entry cleanups
-
-    def __init__(self, app, max_requests: int = 600, window_seconds: int = 60, exempt_paths: list[str] | None = None):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_requests: int = 600,
+        window_seconds: int = 60,
+        exempt_paths: list[str] | None = None,
+        max_tracked_ips: int = 100_000,
+        backend: str = "memory",
+    ):
+        self.app = app
         self.max_requests = max_requests
         self.window_seconds = window_seconds
         self.exempt_paths = set(exempt_paths or ["/health"])
-        self._buckets: Dict[str, List[float]] = defaultdict(list)
-        self._last_cleanup = time.monotonic()
-
-    def _get_client_ip(self, request: Request) -> str:
-        forwarded = request.headers.get("x-forwarded-for")
-        if forwarded:
-            return forwarded.split(",")[0].strip()
-        return request.client.host if request.client else "unknown"
-
-    def _cleanup_stale(self, now: float) -> None:
-        if now - self._last_cleanup < self._CLEANUP_INTERVAL:
+        self._limiter = create_rate_limiter(
+            "ip", max_requests, window_seconds, max_keys=max_tracked_ips, backend=backend
+        )
+
+    @staticmethod
+    def _get_client_ip(scope: Scope) -> str:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
             return
-        cutoff = now - self.window_seconds
-        stale_keys = [k for k, v in self._buckets.items() if not v or v[-1] < cutoff]
-        for k in stale_keys:
-            del self._buckets[k]
-        self._last_cleanup = now
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        if request.url.path in self.exempt_paths:
-            return await call_next(request)
-
-        now = time.monotonic()
-        self._cleanup_stale(now)
-
-        client_ip = self._get_client_ip(request)
-        bucket = self._buckets[client_ip]
-        cutoff = now - self.window_seconds
-        # trim old entries
-        while bucket and bucket[0] < cutoff:
-            bucket.pop(0)
-
-        if len(bucket) >= self.max_requests:
-            retry_after = int(self.window_seconds - (now - bucket[0])) + 1
-            logger.warning("rate limit exceeded ip=%s count=%d", client_ip, len(bucket))
-            return JSONResponse(
+
+        client_ip = self._get_client_ip(scope)
+        decision = await self._limiter.hit(client_ip)
+        if not decision.allowed:
+            RATE_LIMITED.inc("ip")
+            logger.warning("rate limit exceeded ip=%s retry_after=%.1fs", client_ip, decision.retry_after)
+            response = JSONResponse(
                 status_code=429,
                 content={"detail": "Too many requests. Please slow down."},
-                headers={"Retry-After": str(retry_after)},
+                headers={"Retry-After": decision.retry_after_header},
             )
+            await response(scope, receive, send)
+            return
 
-        bucket.append(now)
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
 # ---------------------------------------------------------------------------
 # 3. Request Timeout Middleware
 # ---------------------------------------------------------------------------
 
-class RequestTimeoutMiddleware(BaseHTTPMiddleware):
-    """Enforces a maximum duration for request handling."""
+class RequestTimeoutMiddleware:
+    """
+    Enforces a maximum duration for request handling.
+
+    Returns 504 if the app hasn't started its response in time; a response that is
+    already streaming is cut off instead, since its status line has been sent.
+    """
 
-    def __init__(self, app, timeout_seconds: int = 120):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, timeout_seconds: int = 120):
+        self.app = app
         self.timeout_seconds = timeout_seconds
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await asyncio.wait_for(call_next(request), timeout=self.timeout_seconds)
+            await asyncio.wait_for(self.app(scope, receive, send_tracking), timeout=self.timeout_seconds)
         except asyncio.TimeoutError:
-            logger.error("request timeout path=%s timeout=%ds", request.url.path, self.timeout_seconds)
-            return JSONResponse(
+            logger.error("request timeout path=%s timeout=%ds", scope["path"], self.timeout_seconds)
+            if response_started:
+                return
+            response = JSONResponse(
                 status_code=504,
                 content={"detail": "Request timed out"},
             )
+            await response(scope, receive, send)
@@ -0,0 +1,58 @@
+"""
+A host-wide generation counter in an mmap'd 8-byte file, for per-worker caches that must
+be dropped in every worker when one of them sees a mutation.
+
+Writers bump the counter under an fcntl lock; readers compare it with the value they last
+saw, which is a plain memory read. A reader that somehow sees a torn value only
+invalidates once too often.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import mmap
+import os
+import struct
+import tempfile
+
+from core.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+_COUNTER = struct.Struct("<Q")
+
+
+class SharedGeneration:
+    def __init__(self, path: str):
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size != _COUNTER.size:
+                    os.ftruncate(fd, _COUNTER.size)
+                mm = mmap.mmap(fd, _COUNTER.size)
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self._mm = mm
+
+    @classmethod
+    def open(cls, name: str, directory: str = "") -> "SharedGeneration":
+        directory = directory or ("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+        return cls(os.path.join(directory, f"memetok-gen-{name}.bin"))
+
+    def read(self) -> int:
+        return _COUNTER.unpack_from(self._mm, 0)[0]
+
+    def bump(self) -> int:
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            value = (self.read() + 1) & 0xFFFFFFFFFFFFFFFF
+            _COUNTER.pack_into(self._mm, 0, value)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        return value
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -22,3 +22,21 @@ class ProcessDueJobsResponseDTO(BaseModel):
     processed: int
     posted: int
     deferred: int
+    durationMs: float = 0.0
+    jobsPerSecond: float = 0.0
+
+
+class RecomputeCountsRequestDTO(BaseModel):
+    postIds: List[str] = Field(min_length=1, max_length=500)
+
+
+class RecomputeCountsResponseDTO(BaseModel):
+    modified: int
+
+
+class RecomputeCollectionCountsRequestDTO(BaseModel):
+    userIds: List[str] = Field(min_length=1, max_length=100)
+
+
+class RecomputeCollectionCountsResponseDTO(BaseModel):
+    counts: Dict[str, int]
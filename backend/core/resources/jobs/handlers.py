@@ -4,8 +4,16 @@ from fastapi import APIRouter, Header, HTTPException, Query
 
 from config.config import settings
 from core.logger.logger import get_logger
+from core.resources.jobs.dtos import (
+    RecomputeCollectionCountsRequestDTO,
+    RecomputeCollectionCountsResponseDTO,
+    RecomputeCountsRequestDTO,
+    RecomputeCountsResponseDTO,
+)
 from core.resources.jobs.service import JobsService
 from core.resources.jobs.shared import get_shared_jobs_service
+from core.resources.posts.repositories import PostsRepository, UserStatsRepository
+from database.mongo_common import now_utc
 
 
 router = APIRouter(tags=["jobs"])
@@ -29,3 +37,35 @@ async def process_jobs(
     logger.info("process_jobs start limit=%s", limit)
     return await svc.process_due(limit=limit)
 
+
+@router.post("/internal/posts/recompute-counts")
+async def recompute_post_counts(
+    body: RecomputeCountsRequestDTO,
+    x_internal_jobs_secret: str | None = Header(default=None),
+) -> RecomputeCountsResponseDTO:
+    """Repair like/comment counts, e.g. for posts named in a dropped counter flush."""
+    if x_internal_jobs_secret != settings.internal_jobs_secret:
+        logger.info("recompute_post_counts forbidden")
+        raise HTTPException(status_code=403, detail="forbidden")
+
+    modified = await PostsRepository().recompute_counts(body.postIds)
+    logger.info("recompute_post_counts posts=%s modified=%s", len(body.postIds), modified)
+    return RecomputeCountsResponseDTO(modified=modified)
+
+
+@router.post("/internal/users/recompute-collection-counts")
+async def recompute_collection_counts(
+    body: RecomputeCollectionCountsRequestDTO,
+    x_internal_jobs_secret: str | None = Header(default=None),
+) -> RecomputeCollectionCountsResponseDTO:
+    """Repair per-user collection counters now instead of at their next periodic recompute."""
+    if x_internal_jobs_secret != settings.internal_jobs_secret:
+        logger.info("recompute_collection_counts forbidden")
+        raise HTTPException(status_code=403, detail="forbidden")
+
+    repo = UserStatsRepository()
+    counts = {}
+    for user_id in body.userIds:
+        counts[user_id], _ = await repo.recompute_collection_count(user_id, None, now_utc())
+    logger.info("recompute_collection_counts users=%s", len(body.userIds))
+    return RecomputeCollectionCountsResponseDTO(counts=counts)
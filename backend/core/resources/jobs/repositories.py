@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
+
+from pymongo import DeleteOne, UpdateOne
 
 from common.app_constants import JOB_TYPE_VERIFY_MEDIA
 from database.mongo_factory import get_mongo
@@ -38,3 +40,22 @@ class JobsRepository:
         mongo = get_mongo()
         await mongo.db[JOBS_COLLECTION].delete_one({"_id": job_id})
 
+    async def apply_results(
+        self,
+        delete_ids: List[Any],
+        deferrals: List[Tuple[Any, int, datetime]],
+        now: datetime,
+    ) -> None:
+        """
+        Delete finished jobs and reschedule deferred ones `(job_id, attempts, next_run_at)`
+        in one unordered bulk_write.
+        """
+        ops: List[Any] = [DeleteOne({"_id": job_id}) for job_id in delete_ids]
+        ops.extend(
+            UpdateOne({"_id": job_id}, {"$set": {"attempts": attempts, "nextRunAt": next_run, "updatedAt": now}})
+            for job_id, attempts, next_run in deferrals
+        )
+        if not ops:
+            return
+        mongo = get_mongo()
+        await mongo.db[JOBS_COLLECTION].bulk_write(ops, ordered=False)
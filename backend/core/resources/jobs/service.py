@@ -1,29 +1,56 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from dataclasses import dataclass, field
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Any, List, Tuple
 
 from common.app_constants import JOB_TYPE_VERIFY_MEDIA, POST_STATUS_POSTED
+from config.config import settings
 from core.logger.logger import get_logger
 from core.resources.jobs.dtos import ProcessDueJobsResponseDTO, VerifyMediaJobDTO
 from core.resources.jobs.repositories import JobsRepository
+from core.resources.posts.constants import FEED_CHANGED_EVENT
 from core.resources.posts.repositories import PostsRepository
+from core.services.cqrs.event_bus import get_event_bus
 from core.services.streamlander.client import StreamlanderClient
 from database.mongo_common import now_utc
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class _BatchResult:
+    processed: int = 0
+    posted: int = 0
+    deferred: int = 0
+
+
 @dataclass
 class JobsService:
+    """
+    Verify-media jobs: confirms each uploaded media item exists on Streamlander, then
+    marks its post as posted, or reschedules the job with exponential backoff.
+
+    Jobs are verified in batches of `batch_size` with at most `jobs_verify_concurrency`
+    probes in flight, so one slow probe no longer holds up the whole queue.
+    """
+
     jobs_repo: JobsRepository
     posts_repo: PostsRepository
     streamlander: StreamlanderClient
+    batch_size: int = field(default_factory=lambda: max(1, settings.jobs_verify_batch_size))
+    _probe_semaphore: asyncio.Semaphore = field(
+        default_factory=lambda: asyncio.Semaphore(max(1, settings.jobs_verify_concurrency))
+    )
     _queue: asyncio.Queue[VerifyMediaJobDTO] = field(default_factory=asyncio.Queue)
     _worker_task: asyncio.Task[None] | None = None
     _running: bool = False
 
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
     async def enqueue_verify_media(self, post_id: str, media_id: str, media_type: str) -> None:
         now = now_utc()
         logger.info("job enqueue verify_media post_id=%s media_id=%s media_type=%s", post_id, media_id, media_type)
@@ -41,68 +68,101 @@ class JobsService:
         queue_job = job.model_copy(update={"id": job_id})
         await self._queue.put(queue_job)
 
-    async def _process_verify_media_job(self, job: VerifyMediaJobDTO) -> tuple[bool, bool]:
-        post = await self.posts_repo.find_by_id(job.postId)
-        if not post:
-            logger.info("job drop verify_media (post missing) post_id=%s media_id=%s", job.postId, job.mediaId)
-            return True, False
+    async def _verify_batch(self, jobs: List[VerifyMediaJobDTO]) -> _BatchResult:
+        """
+        Verify a batch of jobs: one `$in` lookup for their posts, media probes with bounded
+        concurrency, one status update for the posts that became ready, and one bulk_write
+        deleting finished jobs and rescheduling the rest.
+        """
+        result = _BatchResult()
+        existing = await self.posts_repo.find_existing_ids(list({job.postId for job in jobs}))
+        delete_ids: List[Any] = []
+
+        to_probe: List[VerifyMediaJobDTO] = []
+        for job in jobs:
+            if job.type != JOB_TYPE_VERIFY_MEDIA:
+                delete_ids.append(job.id)
+            elif job.postId not in existing:
+                logger.info("job drop verify_media (post missing) post_id=%s media_id=%s", job.postId, job.mediaId)
+                delete_ids.append(job.id)
+            else:
+                to_probe.append(job)
+
+        async def _probe(job: VerifyMediaJobDTO) -> bool:
+            async with self._probe_semaphore:
+                return await self.streamlander.media_exists(job.mediaId)
 
-        exists = await self.streamlander.media_exists(job.mediaId)
-        if exists:
-            logger.info("media exists -> post posted post_id=%s media_id=%s", job.postId, job.mediaId)
-            await self.posts_repo.set_status(job.postId, POST_STATUS_POSTED)
-            return True, True
+        found = await asyncio.gather(*(_probe(job) for job in to_probe))
 
         now = now_utc()
-        attempts = job.attempts + 1
-        delay_s = min(30 * (2 ** (attempts - 1)), 60 * 30)
-        next_run = now + timedelta(seconds=delay_s)
-        logger.info(
-            "media not exists -> defer post_id=%s media_id=%s attempts=%s next_run_in_s=%s",
-            job.postId,
-            job.mediaId,
-            attempts,
-            delay_s,
+        posted_ids: List[str] = []
+        deferrals: List[Tuple[Any, int, datetime]] = []
+        for job, exists in zip(to_probe, found):
+            if exists:
+                logger.info("media exists -> post posted post_id=%s media_id=%s", job.postId, job.mediaId)
+                posted_ids.append(job.postId)
+                delete_ids.append(job.id)
+                continue
+            attempts = job.attempts + 1
+            delay_s = min(30 * (2 ** (attempts - 1)), 60 * 30)
+            logger.info(
+                "media not exists -> defer post_id=%s media_id=%s attempts=%s next_run_in_s=%s",
+                job.postId,
+                job.mediaId,
+                attempts,
+                delay_s,
+            )
+            deferrals.append((job.id, attempts, now + timedelta(seconds=delay_s)))
+
+        if posted_ids:
+            await self.posts_repo.set_status_many(posted_ids, POST_STATUS_POSTED)
+            await get_event_bus().publish(FEED_CHANGED_EVENT, {"postId": posted_ids[0], "postIds": posted_ids})
+        await self.jobs_repo.apply_results(
+            [job_id for job_id in delete_ids if job_id is not None],
+            [d for d in deferrals if d[0] is not None],
+            now,
         )
 
+        result.processed = len(jobs)
+        result.posted = len(posted_ids)
+        result.deferred = len(deferrals)
+        return result
+
+    async def _resolve_job_id(self, job: VerifyMediaJobDTO) -> VerifyMediaJobDTO | None:
         if job.id:
-            await self.jobs_repo.update(
-                job.id,
-                {
-                    "$set": {"attempts": attempts, "nextRunAt": next_run, "updatedAt": now},
-                },
-            )
-        return False, False
+            return job
+        db_job = await self.jobs_repo.find_by_post_id(job.postId)
+        if db_job:
+            return VerifyMediaJobDTO.model_validate(db_job)
+        logger.warning("job not found in db post_id=%s", job.postId)
+        return None
 
     async def _worker(self) -> None:
-        logger.info("queue worker started")
+        logger.info("queue worker started batch_size=%s", self.batch_size)
         while self._running:
             try:
-                job = await asyncio.wait_for(self._queue.get(), timeout=1.0)
-                if job.type != JOB_TYPE_VERIFY_MEDIA:
-                    self._queue.task_done()
-                    continue
-
-                job_id = job.id
-                if not job_id:
-                    db_job = await self.jobs_repo.find_by_post_id(job.postId)
-                    if db_job:
-                        job = VerifyMediaJobDTO.model_validate(db_job)
-                        job_id = job.id
-                    else:
-                        logger.warning("job not found in db post_id=%s", job.postId)
-                        self._queue.task_done()
-                        continue
-
-                completed, posted = await self._process_verify_media_job(job)
-                if completed and job_id:
-                    await self.jobs_repo.delete(job_id)
-                self._queue.task_done()
+                first = await asyncio.wait_for(self._queue.get(), timeout=1.0)
             except asyncio.TimeoutError:
                 continue
+            # take whatever else is already queued, up to a batch
+            batch = [first]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                jobs = []
+                for job in batch:
+                    if job.type != JOB_TYPE_VERIFY_MEDIA:
+                        continue
+                    resolved = await self._resolve_job_id(job)
+                    if resolved is not None:
+                        jobs.append(resolved)
+                if jobs:
+                    await self._verify_batch(jobs)
             except Exception as e:
                 logger.exception("queue worker error: %s", e)
-                self._queue.task_done()
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
 
     def start_worker(self) -> None:
         if self._worker_task is None or self._worker_task.done():
@@ -122,28 +182,30 @@ class JobsService:
         logger.info("queue worker stopped")
 
     async def process_due(self, limit: int) -> dict:
-        now = now_utc()
-        job_docs = await self.jobs_repo.fetch_due(now=now, limit=limit)
+        started = time.perf_counter()
+        job_docs = await self.jobs_repo.fetch_due(now=now_utc(), limit=limit)
         jobs = [VerifyMediaJobDTO.model_validate(job_doc) for job_doc in job_docs]
-        processed = 0
-        posted = 0
-        deferred = 0
-
-        for job in jobs:
-            processed += 1
-            if job.type != JOB_TYPE_VERIFY_MEDIA:
-                if job.id:
-                    await self.jobs_repo.delete(job.id)
-                continue
-
-            completed, was_posted = await self._process_verify_media_job(job)
-            if completed:
-                if was_posted:
-                    posted += 1
-                if job.id:
-                    await self.jobs_repo.delete(job.id)
-            else:
-                deferred += 1
-
-        result = ProcessDueJobsResponseDTO(processed=processed, posted=posted, deferred=deferred)
+        totals = _BatchResult()
+        for i in range(0, len(jobs), self.batch_size):
+            batch = await self._verify_batch(jobs[i : i + self.batch_size])
+            totals.processed += batch.processed
+            totals.posted += batch.posted
+            totals.deferred += batch.deferred
+
+        elapsed = time.perf_counter() - started
+        result = ProcessDueJobsResponseDTO(
+            processed=totals.processed,
+            posted=totals.posted,
+            deferred=totals.deferred,
+            durationMs=round(elapsed * 1000, 1),
+            jobsPerSecond=round(totals.processed / elapsed, 1) if elapsed > 0 else 0.0,
+        )
+        logger.info(
+            "process_due done processed=%s posted=%s deferred=%s dur_ms=%s jobs_per_s=%s",
+            result.processed,
+            result.posted,
+            result.deferred,
+            result.durationMs,
+            result.jobsPerSecond,
+        )
         return result.model_dump()
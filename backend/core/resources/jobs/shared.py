@@ -3,7 +3,7 @@ from __future__ import annotations
 from core.resources.jobs.repositories import JobsRepository
 from core.resources.jobs.service import JobsService
 from core.resources.posts.repositories import PostsRepository
-from core.services.streamlander.client import StreamlanderClient
+from core.services.streamlander.client import get_shared_streamlander_client
 
 
 _jobs_service: JobsService | None = None
@@ -15,6 +15,6 @@ def get_shared_jobs_service() -> JobsService:
         _jobs_service = JobsService(
             jobs_repo=JobsRepository(),
             posts_repo=PostsRepository(),
-            streamlander=StreamlanderClient(),
+            streamlander=get_shared_streamlander_client(),
         )
     return _jobs_service
@@ -1,33 +1,115 @@
 from __future__ import annotations
 
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import FrozenSet, Optional, Tuple
 
-from core.resources.uploaders.dtos import ApiKeyValidationRequest
-from core.resources.uploaders.service import UploaderService
+from config.config import settings
+from core.logger.logger import get_logger
+from core.plugins.shm_generation import SharedGeneration
+from core.resources.uploaders.service import UploaderService, hash_api_key
+
+logger = get_logger(__name__)
+
+
+def _open_shared_generation() -> Optional[SharedGeneration]:
+    try:
+        return SharedGeneration.open("access")
+    except (OSError, ValueError):
+        logger.warning("access cache generation file unavailable; uploader cache disabled", exc_info=True)
+        return None
+
+
+@dataclass(frozen=True)
+class _UploaderAccess:
+    uploader_id: str
+    active: bool
+    key_hashes: FrozenSet[str]
 
 
 @dataclass
 class AccessControlService:
+    """
+    Uploader checks for the upload and "my posts" paths.
+
+    Uploader status and active key hashes are cached per email for `cache_ttl_seconds`
+    (non-uploaders too), so the common path does no database I/O. Every uploader
+    mutation made through `uploader_service` bumps a host-wide generation counter, and
+    each lookup drops this worker's cache when the counter has moved, so revocations,
+    new uploaders and rotated keys take effect immediately in every worker on the host.
+    Without the counter file nothing is cached.
+    """
+
     uploader_service: UploaderService = field(default_factory=UploaderService)
+    cache_ttl_seconds: float = field(default_factory=lambda: settings.access_cache_ttl_seconds)
+    cache_max_entries: int = field(default_factory=lambda: settings.access_cache_max_entries)
+    _cache: "OrderedDict[str, Tuple[float, Optional[_UploaderAccess]]]" = field(default_factory=OrderedDict)
+    shared_generation: Optional[SharedGeneration] = field(default_factory=_open_shared_generation)
+    _generation: int = 0
+    _shared_seen: int = 0
+
+    def __post_init__(self) -> None:
+        self.uploader_service.on_change = self.invalidate
+        if self.shared_generation is None:
+            self.cache_ttl_seconds = 0
+        else:
+            self._shared_seen = self.shared_generation.read()
 
     async def setup(self) -> None:
-        # Repositories handle their own setup if needed, 
+        # Repositories handle their own setup if needed,
         # but we could add an ensure_indexes to UploaderRepository
         pass
 
+    def invalidate(self) -> None:
+        self._generation += 1
+        if self.shared_generation is not None:
+            self.shared_generation.bump()
+        self._cache.clear()
+
+    def _sync(self) -> Tuple[int, int]:
+        """Drop the cache if any worker invalidated since the last check; returns the generation."""
+        shared = self.shared_generation.read() if self.shared_generation is not None else 0
+        if shared != self._shared_seen:
+            self._shared_seen = shared
+            self._cache.clear()
+        return self._generation, shared
+
     async def validate_uploader(self, email: str, api_key: str) -> bool:
         if not api_key or not email:
             return False
-        
-        request = ApiKeyValidationRequest(email=email, apiKey=api_key)
-        return await self.uploader_service.validate_api_key(request)
+
+        access = await self._access(email)
+        return access is not None and access.active and hash_api_key(api_key) in access.key_hashes
 
     async def is_uploader_user(self, email: Optional[str]) -> bool:
         if not email:
             return False
+        return await self._access(email) is not None
+
+    async def _access(self, email: str) -> Optional[_UploaderAccess]:
+        generation = self._sync()
+        entry = self._cache.get(email)
+        if entry is not None and entry[0] > time.monotonic():
+            self._cache.move_to_end(email)
+            return entry[1]
+
+        access = await self._load(email)
+        # a mutation landed while loading: the result may predate it, so don't keep it
+        if generation == self._sync() and self.cache_ttl_seconds > 0 and self.cache_max_entries > 0:
+            self._cache[email] = (time.monotonic() + self.cache_ttl_seconds, access)
+            self._cache.move_to_end(email)
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+        return access
+
+    async def _load(self, email: str) -> Optional[_UploaderAccess]:
         uploader = await self.uploader_service.get_uploader_by_email(email)
-        return uploader is not None
+        if uploader is None:
+            return None
+        active = uploader.status == "active"
+        hashes = await self.uploader_service.api_key_repo.list_active_hashes(uploader.id) if active else []
+        return _UploaderAccess(uploader_id=uploader.id, active=active, key_hashes=frozenset(hashes))
 
 
 _access_service = AccessControlService()
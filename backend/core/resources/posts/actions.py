@@ -5,6 +5,7 @@ from enum import Enum
 
 class PostsQueryAction(str, Enum):
     LIST_POSTS = "list_posts"
+    LIST_HOT_POSTS = "list_hot_posts"
     GET_POST = "get_post"
     LIST_USER_POSTS = "list_user_posts"
     GET_POST_STATS = "get_post_stats"
@@ -19,4 +20,6 @@ class PostsMutationAction(str, Enum):
     TOGGLE_LIKE = "toggle_like"
     ADD_COMMENT = "add_comment"
     TOGGLE_SAVE_POST = "toggle_save_post"
+    SET_LIKE = "set_like"
+    SET_SAVE = "set_save"
     DELETE_POST = "delete_post"
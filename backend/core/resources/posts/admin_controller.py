@@ -6,23 +6,28 @@ from typing import Any, Dict, List
 from fastapi import APIRouter, Header, HTTPException, Query
 
 from config.config import settings
+from core.plugins.auth.clerk_jwt import get_token_cache
 from core.resources.posts.upload_errors_repository import UploadErrorsRepository
+from database.fanout import gather_reads
 
 router = APIRouter(tags=["admin"])
 repo = UploadErrorsRepository()
 
 
+def _require_super_admin(x_super_admin_key: str | None) -> None:
+    if not x_super_admin_key or not hmac.compare_digest(x_super_admin_key, settings.super_admin_api_key):
+        raise HTTPException(status_code=403, detail="Super admin access denied")
+
+
 @router.get("/admin/upload-errors")
 async def get_upload_errors(
     limit: int = Query(default=50, ge=1, le=100),
     skip: int = Query(default=0, ge=0),
     x_super_admin_key: str = Header(default=None, alias="X-Super-Admin-Key"),
 ):
-    if not x_super_admin_key or not hmac.compare_digest(x_super_admin_key, settings.super_admin_api_key):
-        raise HTTPException(status_code=403, detail="Super admin access denied")
+    _require_super_admin(x_super_admin_key)
 
-    errors = await repo.find_all(limit=limit, skip=skip)
-    total = await repo.count_all()
+    errors, total = await gather_reads(repo.find_all(limit=limit, skip=skip), repo.count_all())
 
     # Convert ObjectId to string if necessary, though typical for our mongo_common.py
     # but let's be safe and ensure they are serializable
@@ -36,3 +41,12 @@ async def get_upload_errors(
         "limit": limit,
         "skip": skip,
     }
+
+
+@router.get("/admin/cache-stats")
+async def get_cache_stats(
+    x_super_admin_key: str = Header(default=None, alias="X-Super-Admin-Key"),
+) -> Dict[str, Any]:
+    """Per-worker cache counters (this process only)."""
+    _require_super_admin(x_super_admin_key)
+    return {"authTokens": get_token_cache().snapshot()}
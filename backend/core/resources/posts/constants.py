@@ -2,3 +2,11 @@ POSTS_COLLECTION = "posts"
 COMMENTS_COLLECTION = "comments"
 LIKES_COLLECTION = "likes"
 SAVED_POSTS_COLLECTION = "saved_posts"
+USER_STATS_COLLECTION = "user_stats"
+
+FEED_CHANGED_EVENT = "posts.feed_changed"
+
+# Hot ranking: hotScore = log10(max(1, likes + HOT_COMMENT_WEIGHT * comments)) + createdAt / HOT_DECAY_SECONDS.
+# Every HOT_DECAY_SECONDS of age costs one order of magnitude of engagement.
+HOT_COMMENT_WEIGHT = 2
+HOT_DECAY_SECONDS = 45000
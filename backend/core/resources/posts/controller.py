@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import hmac
 import tempfile
-import time
-from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Any, AsyncIterator, Dict, List
 import mimetypes
 from uuid import uuid4
 
@@ -15,56 +15,51 @@ from fastapi import APIRouter, File, Form, Header, HTTPException, UploadFile
 from config.config import settings
 from core.logger.logger import get_logger
 from core.plugins.auth.clerk_jwt import AuthClaims, AuthError, verify_clerk_bearer_token
+from core.plugins.metrics import RATE_LIMITED
+from core.plugins.rate_limit import create_rate_limiter
 from core.resources.posts.access_control import get_access_control_service
 from core.resources.jobs.shared import get_shared_jobs_service
 from core.resources.posts.pipeline import PipelineContext
 from core.resources.posts.pipeline_shared import get_shared_pipeline
-from core.resources.posts.repositories import CommentsRepository, LikesRepository, PostsRepository, SavedPostsRepository
+from core.resources.posts.repositories import (
+    CommentsRepository,
+    LikesRepository,
+    PostsRepository,
+    SavedPostsRepository,
+    UserStatsRepository,
+)
 from core.resources.posts.service import PostsService
+from core.resources.posts.upload_errors_repository import UploadErrorsRepository
+from database.mongo_common import now_utc
+from core.services.streamlander.client import get_shared_streamlander_client
 
 router = APIRouter(tags=["posts"])
 logger = get_logger(__name__)
 
 _UPLOAD_CHUNK_SIZE_BYTES = 1024 * 1024  # 1MB
 _MAX_FILE_BYTES = settings.upload_max_file_size_mb * 1024 * 1024
+_DIRECT_MAX_FILE_BYTES = settings.upload_direct_max_file_size_kb * 1024
 _UPLOAD_INGEST_SEMAPHORE = asyncio.Semaphore(max(1, settings.upload_ingest_concurrency))
 
 
-class UploadRateLimiter:
-    def __init__(self, max_requests: int, window_seconds: int):
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self.uploads: defaultdict[str, list[float]] = defaultdict(list)
+_upload_limiter = create_rate_limiter(
+    "upload", max_requests=5, window_seconds=3600, max_keys=settings.rate_limit_max_tracked_keys
+)  # 5 uploads per hour
 
-    def is_allowed(self, client_id: str) -> bool:
-        now = time.time()
-        self.uploads[client_id] = [t for t in self.uploads[client_id] if now - t < self.window_seconds]
-        if len(self.uploads[client_id]) >= self.max_requests:
-            return False
-        self.uploads[client_id].append(now)
-        return True
 
-
-_upload_limiter = UploadRateLimiter(max_requests=5, window_seconds=3600)  # 5 uploads per hour
-
-
-def _is_valid_magic_bytes(file_path: Path, expected_type: str) -> bool:
-    try:
-        with open(file_path, "rb") as f:
-            magic = f.read(12)
-        if not magic:
-            return False
-        if expected_type == "video":
-            return b"ftyp" in magic
-        elif expected_type == "image":
-            return (
-                magic.startswith(b"\xff\xd8") or
-                magic.startswith(b"\x89PNG") or
-                magic.startswith(b"GIF")
-            )
-        return False
-    except IOError:
+def _magic_matches(magic: bytes, expected_type: str) -> bool:
+    """`magic` is the first 12 bytes of the file."""
+    if not magic:
         return False
+    if expected_type == "video":
+        return b"ftyp" in magic
+    elif expected_type == "image":
+        return (
+            magic.startswith(b"\xff\xd8") or
+            magic.startswith(b"\x89PNG") or
+            magic.startswith(b"GIF")
+        )
+    return False
 
 
 def _get_posts_service() -> PostsService:
@@ -74,28 +69,143 @@ def _get_posts_service() -> PostsService:
         likes_repo=LikesRepository(),
         comments_repo=CommentsRepository(),
         saved_posts_repo=SavedPostsRepository(),
+        user_stats_repo=UserStatsRepository(),
         jobs_service=jobs_service,
     )
 
 
 _svc = _get_posts_service()
+_upload_errors = UploadErrorsRepository()
 
 
-async def _persist_upload_file(file: UploadFile, file_path: Path) -> int:
+@dataclass
+class _PersistedFile:
+    size: int
+    hash: str
+
+
+async def _persist_upload_file(file: UploadFile, file_path: Path, media_type: str, filename: str) -> _PersistedFile:
+    """
+    Write `file` to `file_path` in one pass: magic bytes are checked on the first chunk
+    (before anything is written) and size and MD5 are accumulated per chunk, so the file
+    is never re-read to validate or hash it.
+    """
+    digest = hashlib.md5()
     total_written = 0
-    with open(file_path, "wb") as handle:
+
+    def _write(handle, chunk: bytes) -> None:
+        handle.write(chunk)
+        digest.update(chunk)
+
+    try:
+        with open(file_path, "wb") as handle:
+            while True:
+                chunk = await file.read(_UPLOAD_CHUNK_SIZE_BYTES)
+                if not chunk:
+                    break
+                if total_written == 0 and not _magic_matches(chunk[:12], media_type):
+                    raise HTTPException(status_code=400, detail=f"File {filename} content does not match extension")
+                total_written += len(chunk)
+                if total_written > _MAX_FILE_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File {file.filename} exceeds max size of {settings.upload_max_file_size_mb}MB",
+                    )
+                # write and hash off the event loop; a 1MB MD5 update is ~2ms of CPU
+                await asyncio.to_thread(_write, handle, chunk)
+        if total_written == 0:
+            raise HTTPException(status_code=400, detail=f"File {filename} content does not match extension")
+    except HTTPException:
+        file_path.unlink(missing_ok=True)
+        raise
+    return _PersistedFile(size=total_written, hash=digest.hexdigest())
+
+
+async def _upload_direct(file: UploadFile, filename: str, content_type: str, media_type: str) -> Dict[str, Any] | None:
+    """
+    Stream `file` from the request straight to Streamlander, checking magic bytes on the
+    first chunk and hashing as it goes. Returns the media item, or None if the upload
+    failed; the file is then rewound so the caller can fall back to the temp-file path.
+    """
+    first = await file.read(_UPLOAD_CHUNK_SIZE_BYTES)
+    if not _magic_matches(first[:12], media_type):
+        raise HTTPException(status_code=400, detail=f"File {filename} content does not match extension")
+    digest = hashlib.md5(first)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield first
         while True:
             chunk = await file.read(_UPLOAD_CHUNK_SIZE_BYTES)
             if not chunk:
-                break
-            total_written += len(chunk)
-            if total_written > _MAX_FILE_BYTES:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"File {file.filename} exceeds max size of {settings.upload_max_file_size_mb}MB",
-                )
-            handle.write(chunk)
-    return total_written
+                return
+            digest.update(chunk)
+            yield chunk
+
+    try:
+        result = await get_shared_streamlander_client().upload_stream(
+            filename=filename,
+            content_type=content_type,
+            chunks=chunks(),
+            size=file.size,
+            timeout=settings.upload_direct_timeout_seconds,
+        )
+        media_id = result.get("id")
+        if not media_id:
+            raise Exception("Streamlander did not return a media ID")
+    except Exception:
+        logger.warning("direct upload failed, falling back to tmp file filename=%s", filename, exc_info=True)
+        await file.seek(0)
+        return None
+    return {"type": media_type, "id": media_id, "hash": digest.hexdigest()}
+
+
+async def _precheck_upload_file(file: UploadFile, media_type: str) -> None:
+    """
+    Reject a file on its declared size and magic bytes before any file of the request is
+    ingested, so a bad file can't abort the request after an earlier one was already
+    streamed to Streamlander.
+    """
+    if file.size is not None and file.size > _MAX_FILE_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File {file.filename} exceeds max size of {settings.upload_max_file_size_mb}MB",
+        )
+    magic = await file.read(12)
+    await file.seek(0)
+    if not _magic_matches(magic, media_type):
+        raise HTTPException(status_code=400, detail=f"File {file.filename} content does not match extension")
+
+
+async def _record_orphaned_media(post_id: str, user_id: str, file_infos: List[Dict[str, Any]]) -> None:
+    """The request failed after some files went direct to Streamlander: record their media ids."""
+    for info in file_infos:
+        media = info.get("media")
+        if media is None:
+            continue
+        logger.error("upload aborted, orphaned streamlander media post_id=%s media_id=%s", post_id, media["id"])
+        try:
+            await _upload_errors.insert(
+                {
+                    "postId": post_id,
+                    "userId": user_id,
+                    "filename": info["filename"],
+                    "error": f"Upload aborted after streaming to Streamlander; media {media['id']} is orphaned",
+                    "hash": media.get("hash"),
+                    "mediaId": media["id"],
+                    "createdAt": now_utc(),
+                }
+            )
+        except Exception:
+            logger.exception("failed to record orphaned media post_id=%s media_id=%s", post_id, media["id"])
+
+
+def _use_direct_upload(file: UploadFile) -> bool:
+    return (
+        _DIRECT_MAX_FILE_BYTES > 0
+        and file.size is not None
+        and file.size <= _DIRECT_MAX_FILE_BYTES
+        and get_shared_streamlander_client().upload_retry_after() <= 0
+    )
 
 
 @router.post("/posts/upload")
@@ -146,8 +256,15 @@ async def upload_and_create_post(
             logger.info("upload denied for user_id=%s email=%s", claims.user_id, valid_email)
             raise HTTPException(status_code=403, detail="Uploader access denied")
 
-    if not is_super_admin and not _upload_limiter.is_allowed(claims.user_id):
-        raise HTTPException(status_code=429, detail="Rate limit exceeded. Try again later.")
+    if not is_super_admin:
+        decision = await _upload_limiter.hit(claims.user_id)
+        if not decision.allowed:
+            RATE_LIMITED.inc("upload")
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded. Try again later.",
+                headers={"Retry-After": decision.retry_after_header},
+            )
 
     if not files:
         raise HTTPException(status_code=400, detail="At least one file is required")
@@ -179,6 +296,10 @@ async def upload_and_create_post(
     if videos and images:
         raise HTTPException(status_code=400, detail="Cannot mix videos and images in one post")
 
+    # all of them before the post exists or anything is uploaded
+    for file in files:
+        await _precheck_upload_file(file, "video" if file in videos else "image")
+
     tag_list = [t.strip() for t in tags.split(",") if t.strip()][:20]
 
     post = await _svc.create_post(
@@ -190,10 +311,7 @@ async def upload_and_create_post(
         profile_photo=profilePhoto,
     )
 
-    tmp_base = Path(tempfile.gettempdir()) / "memetok_uploads"
-    tmp_base.mkdir(parents=True, exist_ok=True)
-    tmp_dir = tmp_base / str(uuid4())
-    tmp_dir.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.gettempdir()) / "memetok_uploads" / str(uuid4())
 
     file_infos = []
     async with _UPLOAD_INGEST_SEMAPHORE:
@@ -213,12 +331,24 @@ async def upload_and_create_post(
             file_path = tmp_dir / filename
 
             try:
-                size = await _persist_upload_file(file, file_path)
-                
-                # Validate actual file magic bytes to prevent spoofing
-                if not _is_valid_magic_bytes(file_path, media_type):
-                    file_path.unlink(missing_ok=True)
-                    raise HTTPException(status_code=400, detail=f"File {filename} content does not match extension")
+                if _use_direct_upload(file):
+                    media = await _upload_direct(file, filename, content_type, media_type)
+                    if media is not None:
+                        file_infos.append(
+                            {
+                                "filename": filename,
+                                "content_type": content_type,
+                                "media_type": media_type,
+                                "media": media,
+                            }
+                        )
+                        logger.info("streamed file to streamlander post_id=%s filename=%s media_id=%s", post.id, filename, media["id"])
+                        continue
+
+                # created on first use: a post whose files all went direct never touches disk
+                tmp_dir.mkdir(parents=True, exist_ok=True)
+                # also validates the actual magic bytes, to prevent spoofing
+                persisted = await _persist_upload_file(file, file_path, media_type, filename)
 
                 file_infos.append(
                     {
@@ -226,13 +356,17 @@ async def upload_and_create_post(
                         "filename": filename,
                         "content_type": content_type,
                         "media_type": media_type,
+                        "size": persisted.size,
+                        "hash": persisted.hash,
                     }
                 )
-                logger.info("saved file to tmp post_id=%s filename=%s size=%d", post.id, filename, size)
+                logger.info("saved file to tmp post_id=%s filename=%s size=%d", post.id, filename, persisted.size)
             except HTTPException:
+                await _record_orphaned_media(post.id, claims.user_id, file_infos)
                 raise
             except Exception as exc:
                 logger.exception("failed to save file to tmp post_id=%s filename=%s", post.id, filename)
+                await _record_orphaned_media(post.id, claims.user_id, file_infos)
                 raise HTTPException(status_code=500, detail=f"Failed to save file: {str(exc)}") from exc
             finally:
                 await file.close()
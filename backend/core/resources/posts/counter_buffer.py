@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Collection, Dict, List, Protocol, Tuple
+
+from core.logger.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class CounterFlushError(Exception):
+    """A flush failed, and the increments for `unapplied` (post ids) were certainly not
+    written; the rest of the batch was."""
+
+    def __init__(self, message: str, unapplied: Collection[str]):
+        super().__init__(message)
+        self.unapplied = unapplied
+
+
+class CounterSink(Protocol):
+    async def bulk_inc_counts(self, deltas: Dict[str, Tuple[int, int]]) -> int: ...
+
+
+@dataclass
+class CounterAggregator:
+    """
+    Write-behind buffer for post like/comment counters.
+
+    Deltas are summed per post in memory and written with one bulk_write every
+    `flush_interval_ms`, or sooner once `max_pending_deltas` have accumulated, so a
+    viral post costs one update per flush instead of one per interaction.
+
+    Reads add `pending()` to the persisted value. Deltas are per worker: other workers
+    see them once flushed. An increment is never sent twice: a failed flush puts back
+    only the deltas the sink reports as certainly unapplied (`CounterFlushError`); when
+    the outcome is unknown the deltas are dropped and logged, and those posts can be
+    repaired with `PostsRepository.recompute_counts`. `stop()` drains everything and
+    must run before Mongo goes away.
+    """
+
+    sink: CounterSink
+    flush_interval_ms: int = 200
+    max_pending_deltas: int = 500
+    _pending: Dict[str, List[int]] = field(default_factory=dict)
+    _inflight: Dict[str, List[int]] = field(default_factory=dict)
+    _pending_count: int = 0
+    _flush_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    _wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    _task: asyncio.Task[None] | None = None
+    _running: bool = False
+
+    def add(self, post_id: str, likes_delta: int = 0, comments_delta: int = 0) -> None:
+        entry = self._pending.setdefault(post_id, [0, 0])
+        entry[0] += likes_delta
+        entry[1] += comments_delta
+        self._pending_count += 1
+        if self._pending_count >= self.max_pending_deltas:
+            self._wakeup.set()
+
+    def pending(self, post_id: str) -> Tuple[int, int]:
+        """Deltas not yet acknowledged by Mongo, including a flush in progress."""
+        likes = comments = 0
+        for buf in (self._pending, self._inflight):
+            entry = buf.get(post_id)
+            if entry is not None:
+                likes += entry[0]
+                comments += entry[1]
+        return likes, comments
+
+    def apply(self, post_id: str, stats: Dict[str, Any] | None) -> Dict[str, int]:
+        """Persisted stats plus pending deltas, as a new dict."""
+        stats = stats or {}
+        likes_delta, comments_delta = self.pending(post_id)
+        return {
+            "likes": int(stats.get("likes", 0)) + likes_delta,
+            "comments": int(stats.get("comments", 0)) + comments_delta,
+        }
+
+    def overlay(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Copies of serialized list items whose stats have pending deltas; others are shared."""
+        if not self._pending and not self._inflight:
+            return items
+        out = []
+        for item in items:
+            post_id = item["id"]
+            if post_id in self._pending or post_id in self._inflight:
+                item = {**item, "stats": self.apply(post_id, item.get("stats"))}
+            out.append(item)
+        return out
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending, self._pending_count = self._pending, {}, 0
+            self._inflight = batch
+            deltas = {pid: (d[0], d[1]) for pid, d in batch.items() if d[0] or d[1]}
+            try:
+                modified = await self.sink.bulk_inc_counts(deltas)
+                logger.debug("counter flush posts=%s modified=%s", len(deltas), modified)
+                return len(deltas)
+            except CounterFlushError as e:
+                # retry what certainly wasn't written; it merges with anything buffered meanwhile
+                for post_id in e.unapplied:
+                    likes_delta, comments_delta = deltas[post_id]
+                    self.add(post_id, likes_delta, comments_delta)
+                raise
+            except BaseException:
+                # the bulk_write may have been applied: retrying could double count
+                logger.error("counter flush outcome unknown, dropping deltas (recompute these posts) deltas=%s", deltas)
+                raise
+            finally:
+                self._inflight = {}
+
+    async def _worker(self) -> None:
+        logger.info(
+            "counter aggregator started interval_ms=%s max_pending=%s",
+            self.flush_interval_ms,
+            self.max_pending_deltas,
+        )
+        while self._running:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.exception("counter flush error: %s", e)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._running = True
+            self._task = asyncio.create_task(self._worker())
+
+    async def stop(self) -> None:
+        # wake the worker and let it finish its current flush rather than cancelling it:
+        # a cancelled bulk_write may still have been applied, and retrying it would double count
+        self._running = False
+        self._wakeup.set()
+        if self._task and not self._task.done():
+            await self._task
+        try:
+            flushed = await self.flush()
+            logger.info("counter aggregator stopped flushed_posts=%s", flushed)
+        except Exception as e:
+            logger.exception("counter aggregator final flush failed pending_posts=%s: %s", len(self._pending), e)
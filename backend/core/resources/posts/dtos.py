@@ -76,6 +76,7 @@ class ListPostsResponse(BaseModel):
     take: int
     skip: int
     total: Optional[int] = None
+    nextCursor: Optional[str] = None
 
 
 class PostStatsResponse(BaseModel):
@@ -125,6 +126,10 @@ class PaginationPayloadDTO(PostsPayloadDTO):
     skip: int = 0
 
 
+class FeedPaginationPayloadDTO(PaginationPayloadDTO):
+    cursor: Optional[str] = None
+
+
 class PostIdPayloadDTO(PostsPayloadDTO):
     postId: str = Field(min_length=1)
 
@@ -142,6 +147,14 @@ class ToggleSavePayloadDTO(PostIdPayloadDTO):
     pass
 
 
+class SetLikePayloadDTO(PostIdPayloadDTO):
+    liked: bool
+
+
+class SetSavePayloadDTO(PostIdPayloadDTO):
+    saved: bool
+
+
 class AddCommentPayloadDTO(PostIdPayloadDTO):
     text: str = Field(min_length=1, max_length=300)
     firstName: Optional[str] = None
@@ -1,3 +1,6 @@
 class PostNotFoundError(Exception):
     pass
 
+
+class InvalidCursorError(ValueError):
+    pass
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+FeedPage = Tuple[List[Dict[str, Any]], Optional[str]]
+
+
+@dataclass
+class FeedPageCache:
+    """
+    Bounded, TTL'd LRU of serialized anonymous feed pages.
+
+    Pages hold no per-user fields; callers overlay likedByUser/savedByUser on copies.
+    `generation` is bumped on every invalidation so a page fetched before an
+    invalidation can never be stored after it.
+    """
+
+    max_pages: int = 64
+    ttl_seconds: float = 15.0
+    generation: int = 0
+    _pages: "OrderedDict[Hashable, tuple[float, FeedPage]]" = field(default_factory=OrderedDict)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_pages > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> FeedPage | None:
+        entry = self._pages.get(key)
+        if entry is None:
+            return None
+        expires_at, page = entry
+        if expires_at <= time.monotonic():
+            del self._pages[key]
+            return None
+        self._pages.move_to_end(key)
+        return page
+
+    def put(self, key: Hashable, page: FeedPage, generation: int) -> None:
+        if not self.enabled or generation != self.generation:
+            return
+        self._pages[key] = (time.monotonic() + self.ttl_seconds, page)
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self._pages.clear()
@@ -11,15 +11,19 @@ from core.resources.posts.access_control import get_access_control_service
 from core.resources.posts.actions import PostsMutationAction, PostsQueryAction
 from core.resources.posts.dtos import (
     AddCommentPayloadDTO,
+    FeedPaginationPayloadDTO,
     PaginationPayloadDTO,
     PostCommentsPayloadDTO,
     PostIdPayloadDTO,
     SearchPostsPayloadDTO,
+    SetLikePayloadDTO,
+    SetSavePayloadDTO,
 )
-from core.resources.posts.exceptions import PostNotFoundError
+from core.resources.posts.exceptions import InvalidCursorError, PostNotFoundError
 from core.resources.posts.service import PostsService
 from core.resources.posts.upload_errors_repository import UploadErrorsRepository
 from core.services.cqrs.handler_registry import Payload, mutation_registry, query_registry
+from database.fanout import gather_reads
 
 logger = get_logger(__name__)
 
@@ -37,17 +41,39 @@ def _parse_payload(payload_model: type[PayloadDTO], payload: Payload) -> Payload
 def register_posts_handlers(svc: PostsService, errors_repo: UploadErrorsRepository) -> None:
     async def handle_list_posts(payload: Payload) -> Dict[str, Any]:
         try:
-            req = _parse_payload(PaginationPayloadDTO, payload)
+            req = _parse_payload(FeedPaginationPayloadDTO, payload)
             take = max(1, min(req.take, 50))
             skip = max(0, req.skip)
             user_id = req.auth.user.user_id if req.auth.user else None
-            logger.info("list_posts take=%s skip=%s user_id=%s", take, skip, user_id)
-            items = await svc.list_posts(take=take, skip=skip, user_id=user_id)
-            return {"items": [i.model_dump() for i in items], "take": take, "skip": skip, "total": None}
+            logger.info("list_posts take=%s skip=%s cursor=%s user_id=%s", take, skip, bool(req.cursor), user_id)
+            items, next_cursor = await svc.list_posts(take=take, skip=skip, user_id=user_id, cursor=req.cursor)
+            return {
+                "items": items,
+                "take": take,
+                "skip": skip,
+                "total": None,
+                "nextCursor": next_cursor,
+            }
+        except InvalidCursorError as e:
+            logger.info("list_posts invalid cursor")
+            raise HTTPException(status_code=422, detail="invalid cursor") from e
         except PyMongoError as e:
             logger.exception("list_posts db error")
             raise HTTPException(status_code=503, detail="db unavailable") from e
 
+    async def handle_list_hot_posts(payload: Payload) -> Dict[str, Any]:
+        try:
+            req = _parse_payload(PaginationPayloadDTO, payload)
+            take = max(1, min(req.take, 50))
+            skip = max(0, req.skip)
+            user_id = req.auth.user.user_id if req.auth.user else None
+            logger.info("list_hot_posts take=%s skip=%s user_id=%s", take, skip, user_id)
+            items = await svc.list_hot_posts(take=take, skip=skip, user_id=user_id)
+            return {"items": items, "take": take, "skip": skip, "total": None}
+        except PyMongoError as e:
+            logger.exception("list_hot_posts db error")
+            raise HTTPException(status_code=503, detail="db unavailable") from e
+
     async def handle_get_post(payload: Payload) -> Dict[str, Any]:
         try:
             req = _parse_payload(PostIdPayloadDTO, payload)
@@ -78,9 +104,11 @@ def register_posts_handlers(svc: PostsService, errors_repo: UploadErrorsReposito
             take = max(1, min(req.take, 100))
             skip = max(0, req.skip)
             logger.info("list_user_posts user_id=%s take=%s skip=%s", user_id, take, skip)
-            items = await svc.list_posts_by_user(user_id=user_id, take=take, skip=skip)
-            total = await svc.count_posts_by_user(user_id=user_id)
-            return {"items": [i.model_dump() for i in items], "take": take, "skip": skip, "total": total}
+            items, total = await gather_reads(
+                svc.list_posts_by_user(user_id=user_id, take=take, skip=skip),
+                svc.count_posts_by_user(user_id=user_id),
+            )
+            return {"items": items, "take": take, "skip": skip, "total": total}
         except PyMongoError as e:
             logger.exception("list_user_posts db error")
             raise HTTPException(status_code=503, detail="db unavailable") from e
@@ -94,9 +122,11 @@ def register_posts_handlers(svc: PostsService, errors_repo: UploadErrorsReposito
             take = max(1, min(req.take, 100))
             skip = max(0, req.skip)
             logger.info("list_saved_posts user_id=%s take=%s skip=%s", user_id, take, skip)
-            items = await svc.list_saved_posts(user_id=user_id, take=take, skip=skip)
-            total = await svc.count_saved_posts(user_id=user_id)
-            return {"items": [i.model_dump() for i in items], "take": take, "skip": skip, "total": total}
+            items, total = await gather_reads(
+                svc.list_saved_posts(user_id=user_id, take=take, skip=skip),
+                svc.count_saved_posts(user_id=user_id),
+            )
+            return {"items": items, "take": take, "skip": skip, "total": total}
         except PyMongoError as e:
             logger.exception("list_saved_posts db error")
             raise HTTPException(status_code=503, detail="db unavailable") from e
@@ -149,6 +179,32 @@ def register_posts_handlers(svc: PostsService, errors_repo: UploadErrorsReposito
             logger.info("toggle_save_post not found post_id=%s", payload.get("postId"))
             raise HTTPException(status_code=404, detail="post not found") from e
 
+    async def handle_set_like(payload: Payload) -> Dict[str, Any]:
+        try:
+            req = _parse_payload(SetLikePayloadDTO, payload)
+            user_id = req.auth.user.user_id if req.auth.user else ""
+            if not user_id:
+                raise HTTPException(status_code=401, detail="authentication required")
+            logger.info("set_like post_id=%s user_id=%s liked=%s", req.postId, user_id, req.liked)
+            liked, likes = await svc.set_like(post_id=req.postId, user_id=user_id, liked=req.liked)
+            return {"postId": req.postId, "liked": liked, "likes": likes}
+        except PostNotFoundError as e:
+            logger.info("set_like not found post_id=%s", payload.get("postId"))
+            raise HTTPException(status_code=404, detail="post not found") from e
+
+    async def handle_set_save(payload: Payload) -> Dict[str, Any]:
+        try:
+            req = _parse_payload(SetSavePayloadDTO, payload)
+            user_id = req.auth.user.user_id if req.auth.user else ""
+            if not user_id:
+                raise HTTPException(status_code=401, detail="authentication required")
+            logger.info("set_save post_id=%s user_id=%s saved=%s", req.postId, user_id, req.saved)
+            saved = await svc.set_save(post_id=req.postId, user_id=user_id, saved=req.saved)
+            return {"postId": req.postId, "saved": saved}
+        except PostNotFoundError as e:
+            logger.info("set_save not found post_id=%s", payload.get("postId"))
+            raise HTTPException(status_code=404, detail="post not found") from e
+
     async def handle_add_comment(payload: Payload) -> Dict[str, Any]:
         try:
             req = _parse_payload(AddCommentPayloadDTO, payload)
@@ -169,7 +225,7 @@ def register_posts_handlers(svc: PostsService, errors_repo: UploadErrorsReposito
             skip = max(0, req.skip)
             logger.info("search_posts query=%r take=%s skip=%s", req.query, take, skip)
             items = await svc.search_posts(query=req.query, take=take, skip=skip)
-            return {"items": [i.model_dump() for i in items], "take": take, "skip": skip}
+            return {"items": items, "take": take, "skip": skip}
         except PyMongoError as e:
             logger.exception("search_posts db error")
             raise HTTPException(status_code=503, detail="db unavailable") from e
@@ -213,8 +269,10 @@ def register_posts_handlers(svc: PostsService, errors_repo: UploadErrorsReposito
             skip = max(0, req.skip)
 
             logger.info("list_upload_errors user_id=%s take=%s skip=%s", user_id, take, skip)
-            items = await errors_repo.find_by_user_id(user_id=user_id, limit=take, skip=skip)
-            total = await errors_repo.count_by_user_id(user_id=user_id)
+            items, total = await gather_reads(
+                errors_repo.find_by_user_id(user_id=user_id, limit=take, skip=skip),
+                errors_repo.count_by_user_id(user_id=user_id),
+            )
 
             result_items = []
             for item in items:
@@ -239,8 +297,7 @@ def register_posts_handlers(svc: PostsService, errors_repo: UploadErrorsReposito
             skip = max(0, req.skip)
 
             logger.info("list_all_upload_errors take=%s skip=%s", take, skip)
-            items = await errors_repo.find_all(limit=take, skip=skip)
-            total = await errors_repo.count_all()
+            items, total = await gather_reads(errors_repo.find_all(limit=take, skip=skip), errors_repo.count_all())
 
             result_items = []
             for item in items:
@@ -257,6 +314,7 @@ def register_posts_handlers(svc: PostsService, errors_repo: UploadErrorsReposito
             raise HTTPException(status_code=503, detail="db unavailable") from e
 
     query_registry.register(PostsQueryAction.LIST_POSTS, handle_list_posts)
+    query_registry.register(PostsQueryAction.LIST_HOT_POSTS, handle_list_hot_posts)
     query_registry.register(PostsQueryAction.GET_POST, handle_get_post)
     query_registry.register(PostsQueryAction.LIST_USER_POSTS, handle_list_user_posts)
     query_registry.register(PostsQueryAction.GET_POST_STATS, handle_get_post_stats)
@@ -269,4 +327,6 @@ def register_posts_handlers(svc: PostsService, errors_repo: UploadErrorsReposito
     mutation_registry.register(PostsMutationAction.TOGGLE_LIKE, handle_toggle_like)
     mutation_registry.register(PostsMutationAction.ADD_COMMENT, handle_add_comment)
     mutation_registry.register(PostsMutationAction.TOGGLE_SAVE_POST, handle_toggle_save_post)
+    mutation_registry.register(PostsMutationAction.SET_LIKE, handle_set_like)
+    mutation_registry.register(PostsMutationAction.SET_SAVE, handle_set_save)
     mutation_registry.register(PostsMutationAction.DELETE_POST, handle_delete_post)
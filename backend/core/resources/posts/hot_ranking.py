@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+from core.logger.logger import get_logger
+from core.resources.posts.repositories import PostsRepository
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class HotScoreRefresher:
+    """
+    Periodically recomputes hotScore for all posted posts.
+
+    inc_counts and set_status keep scores current incrementally; this pass backfills
+    posts that predate the field and repairs any drift from out-of-band stats edits.
+    """
+
+    posts_repo: PostsRepository
+    interval_seconds: float = 900.0
+    _task: asyncio.Task[None] | None = None
+    _running: bool = False
+
+    async def _worker(self) -> None:
+        logger.info("hot score refresher started interval_s=%s", self.interval_seconds)
+        while self._running:
+            try:
+                modified = await self.posts_repo.recompute_hot_scores()
+                logger.info("hot scores recomputed modified=%s", modified)
+            except Exception as e:
+                logger.exception("hot score refresh error: %s", e)
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._running = True
+            self._task = asyncio.create_task(self._worker())
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("hot score refresher stopped")
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+
+@dataclass
+class InteractionSets:
+    liked: Set[str]
+    saved: Set[str]
+    expires_at: float = 0.0
+
+    def size(self) -> int:
+        return len(self.liked) + len(self.saved)
+
+
+InteractionLoader = Callable[[str], Awaitable[Optional[InteractionSets]]]
+
+
+@dataclass
+class UserInteractionCache:
+    """
+    LRU of per-user liked/saved post-id sets, so likedByUser/savedByUser overlays are set lookups.
+
+    - Loaded lazily, once per user, with single-flight: concurrent misses share one load.
+    - Kept current in place by the toggle paths (`record_like` / `record_save`).
+    - A toggle that lands while a load is in flight marks it stale; the load result is
+      then discarded and the caller falls back to direct queries.
+    - Entries expire after `ttl_seconds`, which bounds staleness from toggles handled
+      by other workers.
+    - Bounded by user count and a global id budget; users whose history exceeds
+      `max_ids_per_user` are never cached (the loader returns None for them).
+    """
+
+    max_users: int = 5000
+    max_ids_per_user: int = 1000
+    max_total_ids: int = 200_000
+    ttl_seconds: float = 120.0
+    hits: int = 0
+    misses: int = 0
+    _entries: "OrderedDict[str, InteractionSets]" = field(default_factory=OrderedDict)
+    _total_ids: int = 0
+    _inflight: Dict[str, "asyncio.Future[Optional[InteractionSets]]"] = field(default_factory=dict)
+    _stale: Set[str] = field(default_factory=set)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_users > 0 and self.max_ids_per_user > 0 and self.ttl_seconds > 0
+
+    async def get(self, user_id: str, loader: InteractionLoader) -> InteractionSets | None:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._evict(user_id)
+            entry = None
+        if entry is not None:
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        pending = self._inflight.get(user_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[Optional[InteractionSets]] = asyncio.get_running_loop().create_future()
+        self._inflight[user_id] = future
+        loaded: InteractionSets | None = None
+        try:
+            loaded = await loader(user_id)
+            if loaded is not None and user_id in self._stale:
+                loaded = None
+            if loaded is not None:
+                self._store(user_id, loaded)
+            return loaded
+        finally:
+            # waiters fall back to direct queries on None, including when the load raised
+            future.set_result(loaded)
+            del self._inflight[user_id]
+            self._stale.discard(user_id)
+
+    def record_like(self, user_id: str, post_id: str, liked: bool) -> None:
+        self._record(user_id, post_id, liked, "liked")
+
+    def record_save(self, user_id: str, post_id: str, saved: bool) -> None:
+        self._record(user_id, post_id, saved, "saved")
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "users": len(self._entries),
+            "ids": self._total_ids,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _record(self, user_id: str, post_id: str, present: bool, kind: str) -> None:
+        if user_id in self._inflight:
+            self._stale.add(user_id)
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return
+        ids: Set[str] = getattr(entry, kind)
+        before = len(ids)
+        if present:
+            ids.add(post_id)
+        else:
+            ids.discard(post_id)
+        self._total_ids += len(ids) - before
+        if entry.size() > self.max_ids_per_user:
+            self._evict(user_id)
+        else:
+            self._trim()
+
+    def _store(self, user_id: str, sets: InteractionSets) -> None:
+        if not self.enabled or sets.size() > self.max_ids_per_user:
+            return
+        self._evict(user_id)
+        sets.expires_at = time.monotonic() + self.ttl_seconds
+        self._entries[user_id] = sets
+        self._total_ids += sets.size()
+        self._trim()
+
+    def _evict(self, user_id: str) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._total_ids -= entry.size()
+
+    def _trim(self) -> None:
+        while self._entries and (len(self._entries) > self.max_users or self._total_ids > self.max_total_ids):
+            _, entry = self._entries.popitem(last=False)
+            self._total_ids -= entry.size()
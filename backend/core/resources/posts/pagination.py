@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+from core.resources.posts.exceptions import InvalidCursorError
+
+
+FeedCursor = Tuple[datetime, str]
+
+
+def encode_cursor(created_at: datetime, post_id: str) -> str:
+    """Opaque keyset cursor: (createdAt, id) of the last item on a page."""
+    raw = json.dumps({"t": created_at.isoformat(), "id": post_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> FeedCursor:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        created_at = datetime.fromisoformat(data["t"])
+        post_id = data["id"]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursorError("invalid cursor") from exc
+    if not isinstance(post_id, str) or not post_id:
+        raise InvalidCursorError("invalid cursor")
+    return created_at, post_id
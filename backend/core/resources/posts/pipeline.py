@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import asyncio
-import hashlib
 import os
 import tempfile
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from config.config import settings
 from core.logger.logger import get_logger
+from core.resources.posts.constants import FEED_CHANGED_EVENT
 from core.resources.posts.upload_errors_repository import UploadErrorsRepository
 from core.resources.posts.repositories import PostsRepository
+from core.services.cqrs.event_bus import get_event_bus
+from core.services.streamlander.circuit_breaker import CircuitOpenError
 from core.services.streamlander.client import StreamlanderClient
 from database.mongo_common import now_utc
 
@@ -41,64 +45,94 @@ class UploadPipeline:
     def __post_init__(self):
         self._tmp_base.mkdir(parents=True, exist_ok=True)
 
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
     async def enqueue(self, context: PipelineContext) -> None:
         await self._queue.put(context)
         logger.info("pipeline enqueued post_id=%s file_count=%s", context.post_id, len(context.files))
 
     async def _process_upload(self, context: PipelineContext, file_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        async with self._semaphore:
-            file_path = file_info["path"]
-            filename = file_info["filename"]
-            content_type = file_info["content_type"]
-            media_type = file_info["media_type"]
-            
-            try:
-                def _hash_file(path: str) -> str:
-                    h = hashlib.md5()
-                    with open(path, "rb") as f:
-                        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                            h.update(chunk)
-                    return h.hexdigest()
+        """
+        Upload one file, parking it while Streamlander's upload circuit is open: a parked
+        file waits without holding an upload slot, and is recorded as failed only after
+        `streamlander_park_max_seconds`.
+        """
+        if "media" in file_info:
+            # already streamed to Streamlander by the upload request
+            return file_info["media"]
+        park_deadline = time.monotonic() + settings.streamlander_park_max_seconds
+        parked = False
+        while True:
+            wait = self.streamlander.upload_retry_after()
+            if wait <= 0:
+                async with self._semaphore:
+                    try:
+                        return await self._upload_file(context, file_info)
+                    except CircuitOpenError as e:
+                        wait = e.retry_after
+            remaining = park_deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not parked:
+                parked = True
+                logger.warning(
+                    "streamlander upload circuit open, parking post_id=%s filename=%s retry_in_s=%.1f",
+                    context.post_id,
+                    file_info["filename"],
+                    wait,
+                )
+            await asyncio.sleep(min(wait, remaining, 5.0))
+
+        logger.error("upload parked too long post_id=%s filename=%s", context.post_id, file_info["filename"])
+        context.errors.append({
+            "filename": file_info["filename"],
+            "error": "Streamlander unavailable (circuit open)",
+            "hash": file_info.get("hash"),
+        })
+        return None
+
+    async def _upload_file(self, context: PipelineContext, file_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Upload one file; errors are recorded on the context, except CircuitOpenError. The
+        hash and size were computed while the request persisted the file, so the upload is
+        the only read of it.
+        """
+        file_path = file_info["path"]
+        filename = file_info["filename"]
+        content_type = file_info["content_type"]
+        media_type = file_info["media_type"]
+        file_size = file_info["size"]
+        file_hash = file_info["hash"]
 
-                file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
-                file_hash = await asyncio.to_thread(_hash_file, file_path)
-
-                logger.info("uploading to streamlander post_id=%s filename=%s content_type=%s size=%d", context.post_id, filename, content_type, file_size)
+        try:
+            logger.info("uploading to streamlander post_id=%s filename=%s content_type=%s size=%d", context.post_id, filename, content_type, file_size)
 
-                with open(file_path, "rb") as upload_file:
-                    upload_result = await self.streamlander.upload(
-                        filename=filename,
-                        content_type=content_type,
-                        data=upload_file,
-                    )
+            with open(file_path, "rb") as upload_file:
+                upload_result = await self.streamlander.upload(
+                    filename=filename,
+                    content_type=content_type,
+                    data=upload_file,
+                )
 
-                media_id = upload_result.get("id")
-                if not media_id:
-                    raise Exception("Streamlander did not return a media ID")
+            media_id = upload_result.get("id")
+            if not media_id:
+                raise Exception("Streamlander did not return a media ID")
 
-                logger.info("streamlander upload success post_id=%s media_id=%s", context.post_id, media_id)
-                return {"type": media_type, "id": media_id, "hash": file_hash}
+            logger.info("streamlander upload success post_id=%s media_id=%s", context.post_id, media_id)
+            return {"type": media_type, "id": media_id, "hash": file_hash}
 
-            except Exception as e:
-                logger.exception("upload failed post_id=%s filename=%s", context.post_id, filename)
-                file_hash = None
-                try:
-                    if os.path.exists(file_path):
-                        def _hash_err(path: str) -> str:
-                            h = hashlib.md5()
-                            with open(path, "rb") as f:
-                                for ch in iter(lambda: f.read(1024 * 1024), b""):
-                                    h.update(ch)
-                            return h.hexdigest()
-                        file_hash = await asyncio.to_thread(_hash_err, file_path)
-                except Exception:
-                    pass
-                context.errors.append({
-                    "filename": filename,
-                    "error": str(e),
-                    "hash": file_hash,
-                })
-                return None
+        except CircuitOpenError:
+            # the breaker opened after `upload_retry_after()` was checked: park, don't fail
+            raise
+        except Exception as e:
+            logger.exception("upload failed post_id=%s filename=%s", context.post_id, filename)
+            context.errors.append({
+                "filename": filename,
+                "error": str(e),
+                "hash": file_hash,
+            })
+            return None
 
     async def _process_stage1_upload(self, context: PipelineContext) -> None:
         logger.info("stage1: starting uploads post_id=%s file_count=%s", context.post_id, len(context.files))
@@ -131,6 +165,7 @@ class UploadPipeline:
         if context.media_items:
             await self.posts_repo.update_media(context.post_id, context.media_items)
             await self.posts_repo.set_status(context.post_id, "posted")
+            await get_event_bus().publish(FEED_CHANGED_EVENT, {"postId": context.post_id})
             logger.info("stage2: post updated to posted post_id=%s media_count=%s", context.post_id, len(context.media_items))
         elif context.errors:
             await self.posts_repo.set_status(context.post_id, "failed")
@@ -3,7 +3,7 @@ from __future__ import annotations
 from core.resources.posts.pipeline import UploadPipeline
 from core.resources.posts.repositories import PostsRepository
 from core.resources.posts.upload_errors_repository import UploadErrorsRepository
-from core.services.streamlander.client import StreamlanderClient
+from core.services.streamlander.client import get_shared_streamlander_client
 
 _pipeline: UploadPipeline | None = None
 
@@ -14,6 +14,6 @@ def get_shared_pipeline() -> UploadPipeline:
         _pipeline = UploadPipeline(
             posts_repo=PostsRepository(),
             errors_repo=UploadErrorsRepository(),
-            streamlander=StreamlanderClient(),
+            streamlander=get_shared_streamlander_client(),
         )
     return _pipeline
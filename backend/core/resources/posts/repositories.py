@@ -1,17 +1,68 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, List, Optional
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
-from pymongo import ReturnDocument, ASCENDING, DESCENDING, TEXT
+from pymongo import ReturnDocument, ASCENDING, DESCENDING, TEXT, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, ServerSelectionTimeoutError
 
 from database.mongo_factory import get_mongo
-from core.resources.posts.constants import COMMENTS_COLLECTION, LIKES_COLLECTION, POSTS_COLLECTION, SAVED_POSTS_COLLECTION
+from core.resources.posts.counter_buffer import CounterFlushError
+from core.resources.posts.constants import (
+    COMMENTS_COLLECTION,
+    HOT_COMMENT_WEIGHT,
+    HOT_DECAY_SECONDS,
+    LIKES_COLLECTION,
+    POSTS_COLLECTION,
+    SAVED_POSTS_COLLECTION,
+    USER_STATS_COLLECTION,
+)
 from common.app_constants import POST_STATUS_POSTED
 from core.resources.posts.types import CommentDoc, MediaItemDoc, PostDoc
 
 
+# Server-side hotScore expression. Age decay is folded into createdAt: subtracting "now" would
+# shift every post by the same amount, so the stored score never needs a time-based rewrite
+# and reading the hot feed is a plain index scan on (status, hotScore).
+_HOT_SCORE_EXPR: dict[str, Any] = {
+    "$add": [
+        {
+            "$log10": {
+                "$max": [
+                    1,
+                    {
+                        "$add": [
+                            {"$ifNull": ["$stats.likes", 0]},
+                            {"$multiply": [HOT_COMMENT_WEIGHT, {"$ifNull": ["$stats.comments", 0]}]},
+                        ]
+                    },
+                ]
+            }
+        },
+        {"$divide": [{"$toLong": "$createdAt"}, HOT_DECAY_SECONDS * 1000]},
+    ]
+}
+
+
+def _set_status_update(status: str) -> Any:
+    if status == POST_STATUS_POSTED:
+        # seed hotScore as the post enters the feed
+        return [{"$set": {"status": status}}, {"$set": {"hotScore": _HOT_SCORE_EXPR}}]
+    return {"$set": {"status": status}}
+
+
+def _inc_counts_update(likes_delta: int, comments_delta: int) -> list[dict[str, Any]] | None:
+    inc: dict[str, Any] = {}
+    if likes_delta:
+        inc["stats.likes"] = {"$add": [{"$ifNull": ["$stats.likes", 0]}, likes_delta]}
+    if comments_delta:
+        inc["stats.comments"] = {"$add": [{"$ifNull": ["$stats.comments", 0]}, comments_delta]}
+    if not inc:
+        return None
+    return [{"$set": inc}, {"$set": {"hotScore": _HOT_SCORE_EXPR}}]
+
+
 @dataclass
 class PostsRepository:
     async def ensure_indexes(self) -> None:
@@ -19,7 +70,10 @@ class PostsRepository:
         mongo = get_mongo()
         col = mongo.db[POSTS_COLLECTION]
         await col.create_index([("status", ASCENDING), ("createdAt", DESCENDING)], background=True)
+        # Keyset pagination: (createdAt, id) tiebreak must be covered to keep every page a pure range scan
+        await col.create_index([("status", ASCENDING), ("createdAt", DESCENDING), ("id", DESCENDING)], background=True)
         await col.create_index([("author.userId", ASCENDING), ("createdAt", DESCENDING)], background=True)
+        await col.create_index([("status", ASCENDING), ("hotScore", DESCENDING), ("id", DESCENDING)], background=True)
         await col.create_index([("id", ASCENDING)], unique=True, background=True)
         # Full-text search index
         try:
@@ -45,18 +99,51 @@ class PostsRepository:
         count = await mongo.db[POSTS_COLLECTION].count_documents({"author.userId": user_id, "status": {"$ne": "deleted"}})
         return count
 
-    async def find_latest_posted(self, take: int, skip: int) -> List[PostDoc]:
-        """Include stats in feed response — eliminates N+1 stat requests."""
+    async def find_latest_posted(self, take: int, skip: int = 0, after: Optional[Tuple[datetime, str]] = None) -> List[PostDoc]:
+        """Include stats in feed response — eliminates N+1 stat requests.
+
+        When `after` (createdAt, id) is given, pages with a range predicate instead of skip
+        so every page costs the same regardless of scroll depth. `skip` is the legacy fallback.
+        """
+        mongo = get_mongo()
+        query: dict[str, Any] = {"status": POST_STATUS_POSTED}
+        if after is not None:
+            created_at, post_id = after
+            query["$or"] = [
+                {"createdAt": {"$lt": created_at}},
+                {"createdAt": created_at, "id": {"$lt": post_id}},
+            ]
+        cursor = (
+            mongo.db[POSTS_COLLECTION]
+            .find(query)
+            .sort([("createdAt", DESCENDING), ("id", DESCENDING)])
+        )
+        if after is None and skip:
+            cursor = cursor.skip(skip)
+        cursor = cursor.limit(take)
+        return [d async for d in cursor]
+
+    async def find_hot_posted(self, take: int, skip: int) -> List[PostDoc]:
+        """Hot feed: index scan on (status, hotScore, id), no in-memory sort."""
         mongo = get_mongo()
         cursor = (
             mongo.db[POSTS_COLLECTION]
             .find({"status": POST_STATUS_POSTED})
-            .sort("createdAt", -1)
+            .sort([("hotScore", DESCENDING), ("id", DESCENDING)])
             .skip(skip)
             .limit(take)
         )
         return [d async for d in cursor]
 
+    async def recompute_hot_scores(self) -> int:
+        """Rewrite hotScore for every posted post server-side (backfill / drift repair)."""
+        mongo = get_mongo()
+        result = await mongo.db[POSTS_COLLECTION].update_many(
+            {"status": POST_STATUS_POSTED},
+            [{"$set": {"hotScore": _HOT_SCORE_EXPR}}],
+        )
+        return result.modified_count
+
     async def find_by_user_id(self, user_id: str, take: int, skip: int) -> List[PostDoc]:
         """Show all uploader posts (pending + posted + failed) so they can see their own drafts and errors."""
         mongo = get_mongo()
@@ -109,22 +196,34 @@ class PostsRepository:
         # Preserve the original ordering from post_ids
         return [docs[pid] for pid in post_ids if pid in docs]
 
+    async def find_existing_ids(self, post_ids: List[str]) -> Set[str]:
+        """Which of `post_ids` exist, in any status — one `$in` query, ids only."""
+        if not post_ids:
+            return set()
+        mongo = get_mongo()
+        cursor = mongo.db[POSTS_COLLECTION].find({"id": {"$in": post_ids}}, {"_id": 0, "id": 1})
+        return {d["id"] async for d in cursor}
+
     async def set_status(self, post_id: str, status: str) -> None:
         mongo = get_mongo()
-        await mongo.db[POSTS_COLLECTION].update_one({"id": post_id}, {"$set": {"status": status}})
+        await mongo.db[POSTS_COLLECTION].update_one({"id": post_id}, _set_status_update(status))
+
+    async def set_status_many(self, post_ids: List[str], status: str) -> int:
+        if not post_ids:
+            return 0
+        mongo = get_mongo()
+        result = await mongo.db[POSTS_COLLECTION].update_many({"id": {"$in": post_ids}}, _set_status_update(status))
+        return result.modified_count
 
     async def update_media(self, post_id: str, media_items: List[MediaItemDoc]) -> None:
         mongo = get_mongo()
         await mongo.db[POSTS_COLLECTION].update_one({"id": post_id}, {"$set": {"media": media_items}})
 
     async def inc_counts(self, post_id: str, likes_delta: int = 0, comments_delta: int = 0) -> PostDoc | None:
+        """Increment stats and refresh hotScore in the same single-document update."""
         mongo = get_mongo()
-        update: dict[str, Any] = {"$inc": {}}
-        if likes_delta:
-            update["$inc"]["stats.likes"] = likes_delta
-        if comments_delta:
-            update["$inc"]["stats.comments"] = comments_delta
-        if not update["$inc"]:
+        update = _inc_counts_update(likes_delta, comments_delta)
+        if update is None:
             return await mongo.db[POSTS_COLLECTION].find_one({"id": post_id})
         return await mongo.db[POSTS_COLLECTION].find_one_and_update(
             {"id": post_id},
@@ -132,6 +231,63 @@ class PostsRepository:
             return_document=ReturnDocument.AFTER,
         )
 
+    async def bulk_inc_counts(self, deltas: Dict[str, Tuple[int, int]]) -> int:
+        """
+        Apply many (likes_delta, comments_delta) increments in one unordered bulk_write.
+
+        Raises CounterFlushError naming the posts whose increments were certainly not
+        applied (per-op write errors, or no server to send to); any other error leaves
+        the outcome unknown.
+        """
+        ops = []
+        post_ids = []
+        for post_id, (likes_delta, comments_delta) in deltas.items():
+            update = _inc_counts_update(likes_delta, comments_delta)
+            if update is not None:
+                ops.append(UpdateOne({"id": post_id}, update))
+                post_ids.append(post_id)
+        if not ops:
+            return 0
+        mongo = get_mongo()
+        try:
+            result = await mongo.db[POSTS_COLLECTION].bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            # unordered: every op without a write error was applied
+            failed = [post_ids[err["index"]] for err in e.details.get("writeErrors", [])]
+            raise CounterFlushError(f"{len(failed)} of {len(ops)} counter updates failed", failed) from e
+        except ServerSelectionTimeoutError as e:
+            raise CounterFlushError("no Mongo server selected, nothing was sent", post_ids) from e
+        return result.modified_count
+
+    async def recompute_counts(self, post_ids: List[str]) -> int:
+        """
+        Reset stats.likes / stats.comments of `post_ids` from the likes and comments
+        collections (drift repair). Deltas still buffered in a worker are applied on
+        top, so run it on posts that are quiet.
+        """
+        if not post_ids:
+            return 0
+        mongo = get_mongo()
+        counts: Dict[str, Dict[str, int]] = {post_id: {"likes": 0, "comments": 0} for post_id in post_ids}
+        for field_name, collection in (("likes", LIKES_COLLECTION), ("comments", COMMENTS_COLLECTION)):
+            cursor = mongo.db[collection].aggregate(
+                [{"$match": {"postId": {"$in": post_ids}}}, {"$group": {"_id": "$postId", "n": {"$sum": 1}}}]
+            )
+            async for doc in cursor:
+                counts[doc["_id"]][field_name] = int(doc["n"])
+        ops = [
+            UpdateOne(
+                {"id": post_id},
+                [
+                    {"$set": {"stats.likes": c["likes"], "stats.comments": c["comments"]}},
+                    {"$set": {"hotScore": _HOT_SCORE_EXPR}},
+                ],
+            )
+            for post_id, c in counts.items()
+        ]
+        result = await mongo.db[POSTS_COLLECTION].bulk_write(ops, ordered=False)
+        return result.modified_count
+
 
 @dataclass
 class LikesRepository:
@@ -140,15 +296,23 @@ class LikesRepository:
         col = mongo.db[LIKES_COLLECTION]
         await col.create_index([("postId", ASCENDING), ("userId", ASCENDING)], unique=True, background=True)
         await col.create_index([("userId", ASCENDING)], background=True)
+        await col.create_index([("userId", ASCENDING), ("createdAt", DESCENDING)], background=True)
 
-    async def toggle(self, post_id: str, user_id: str, now: datetime) -> bool:
+    async def set_like(self, post_id: str, user_id: str, liked: bool, now: datetime) -> bool:
+        """
+        Idempotently set the reaction in one round trip (conditional upsert or delete).
+        Returns True only if this call changed state, so callers can drive counters off it.
+        """
         mongo = get_mongo()
-        existing = await mongo.db[LIKES_COLLECTION].find_one({"postId": post_id, "userId": user_id})
-        if existing:
-            await mongo.db[LIKES_COLLECTION].delete_one({"_id": existing["_id"]})
-            return False
-        await mongo.db[LIKES_COLLECTION].insert_one({"postId": post_id, "userId": user_id, "createdAt": now})
-        return True
+        key = {"postId": post_id, "userId": user_id}
+        if not liked:
+            result = await mongo.db[LIKES_COLLECTION].delete_one(key)
+            return result.deleted_count == 1
+        try:
+            result = await mongo.db[LIKES_COLLECTION].update_one(key, {"$setOnInsert": {"createdAt": now}}, upsert=True)
+        except DuplicateKeyError:
+            return False  # lost a concurrent upsert race: the other writer owns the change
+        return result.upserted_id is not None
 
     async def exists(self, post_id: str, user_id: str) -> bool:
         mongo = get_mongo()
@@ -163,10 +327,26 @@ class LikesRepository:
         cursor = mongo.db[LIKES_COLLECTION].find({"userId": user_id, "postId": {"$in": post_ids}}, {"_id": 0, "postId": 1})
         return [d["postId"] async for d in cursor]
 
-    async def list_all_liked(self, user_id: str) -> dict[str, datetime]:
+    async def list_post_ids_by_user(self, user_id: str, limit: int) -> list[str]:
+        """Every post id the user liked, capped at `limit` (covered by the userId index)."""
         mongo = get_mongo()
-        cursor = mongo.db[LIKES_COLLECTION].find({"userId": user_id}, {"_id": 0, "postId": 1, "createdAt": 1})
-        return {d["postId"]: d.get("createdAt", datetime.min) async for d in cursor}
+        cursor = mongo.db[LIKES_COLLECTION].find({"userId": user_id}, {"_id": 0, "postId": 1}).limit(limit)
+        return [d["postId"] async for d in cursor]
+
+    async def iter_by_user(self, user_id: str, batch_size: int) -> AsyncIterator[tuple[str, datetime]]:
+        """Stream (postId, createdAt) newest first off the (userId, createdAt) index."""
+        mongo = get_mongo()
+        cursor = (
+            mongo.db[LIKES_COLLECTION]
+            .find({"userId": user_id}, {"_id": 0, "postId": 1, "createdAt": 1})
+            .sort("createdAt", DESCENDING)
+            .batch_size(batch_size)
+        )
+        try:
+            async for d in cursor:
+                yield d["postId"], d.get("createdAt", datetime.min)
+        finally:
+            await cursor.close()
 
 
 @dataclass
@@ -177,14 +357,18 @@ class SavedPostsRepository:
         await col.create_index([("userId", ASCENDING), ("createdAt", DESCENDING)], background=True)
         await col.create_index([("postId", ASCENDING), ("userId", ASCENDING)], unique=True, background=True)
 
-    async def toggle(self, post_id: str, user_id: str, now: datetime) -> bool:
+    async def set_save(self, post_id: str, user_id: str, saved: bool, now: datetime) -> bool:
+        """Same contract as LikesRepository.set_like."""
         mongo = get_mongo()
-        existing = await mongo.db[SAVED_POSTS_COLLECTION].find_one({"postId": post_id, "userId": user_id})
-        if existing:
-            await mongo.db[SAVED_POSTS_COLLECTION].delete_one({"_id": existing["_id"]})
-            return False
-        await mongo.db[SAVED_POSTS_COLLECTION].insert_one({"postId": post_id, "userId": user_id, "createdAt": now})
-        return True
+        key = {"postId": post_id, "userId": user_id}
+        if not saved:
+            result = await mongo.db[SAVED_POSTS_COLLECTION].delete_one(key)
+            return result.deleted_count == 1
+        try:
+            result = await mongo.db[SAVED_POSTS_COLLECTION].update_one(key, {"$setOnInsert": {"createdAt": now}}, upsert=True)
+        except DuplicateKeyError:
+            return False  # lost a concurrent upsert race: the other writer owns the change
+        return result.upserted_id is not None
 
     async def exists(self, post_id: str, user_id: str) -> bool:
         mongo = get_mongo()
@@ -213,10 +397,119 @@ class SavedPostsRepository:
         cursor = mongo.db[SAVED_POSTS_COLLECTION].find({"userId": user_id, "postId": {"$in": post_ids}}, {"_id": 0, "postId": 1})
         return [d["postId"] async for d in cursor]
 
-    async def list_all_saved(self, user_id: str) -> dict[str, datetime]:
+    async def list_post_ids_by_user(self, user_id: str, limit: int) -> list[str]:
+        """Every post id the user saved, capped at `limit`."""
+        mongo = get_mongo()
+        cursor = mongo.db[SAVED_POSTS_COLLECTION].find({"userId": user_id}, {"_id": 0, "postId": 1}).limit(limit)
+        return [d["postId"] async for d in cursor]
+
+    async def iter_by_user(self, user_id: str, batch_size: int) -> AsyncIterator[tuple[str, datetime]]:
+        """Stream (postId, createdAt) newest first off the (userId, createdAt) index."""
         mongo = get_mongo()
-        cursor = mongo.db[SAVED_POSTS_COLLECTION].find({"userId": user_id}, {"_id": 0, "postId": 1, "createdAt": 1})
-        return {d["postId"]: d.get("createdAt", datetime.min) async for d in cursor}
+        cursor = (
+            mongo.db[SAVED_POSTS_COLLECTION]
+            .find({"userId": user_id}, {"_id": 0, "postId": 1, "createdAt": 1})
+            .sort("createdAt", DESCENDING)
+            .batch_size(batch_size)
+        )
+        try:
+            async for d in cursor:
+                yield d["postId"], d.get("createdAt", datetime.min)
+        finally:
+            await cursor.close()
+
+
+@dataclass
+class UserStatsRepository:
+    """Per-user counters maintained by the write paths so reads never count history."""
+
+    async def ensure_indexes(self) -> None:
+        mongo = get_mongo()
+        await mongo.db[USER_STATS_COLLECTION].create_index([("userId", ASCENDING)], unique=True, background=True)
+
+    async def get_collection_count(self, user_id: str) -> Tuple[Optional[int], int, Optional[datetime]]:
+        """(count, or None if never computed; change sequence; when the count was last computed)."""
+        mongo = get_mongo()
+        doc = await mongo.db[USER_STATS_COLLECTION].find_one(
+            {"userId": user_id}, {"_id": 0, "collectionCount": 1, "collectionSeq": 1, "collectionCountAt": 1}
+        )
+        doc = doc or {}
+        count = doc.get("collectionCount")
+        computed_at = doc.get("collectionCountAt")
+        if computed_at is not None and computed_at.tzinfo is None:
+            computed_at = computed_at.replace(tzinfo=timezone.utc)
+        return (int(count) if count is not None else None), int(doc.get("collectionSeq", 0)), computed_at
+
+    async def set_collection_count(self, user_id: str, count: int, seq: int, now: datetime) -> bool:
+        """
+        Store an exact count computed after reading change sequence `seq`. Refused (False)
+        when an increment landed since: the computed count may or may not include it.
+        """
+        mongo = get_mongo()
+        seq_filter: Any = seq if seq else {"$in": [0, None]}
+        try:
+            result = await mongo.db[USER_STATS_COLLECTION].update_one(
+                {"userId": user_id, "collectionSeq": seq_filter},
+                {"$set": {"collectionCount": count, "collectionCountAt": now}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False  # the document exists with another sequence
+        return result.matched_count == 1 or result.upserted_id is not None
+
+    async def inc_collection_count(self, user_id: str, delta: int) -> None:
+        """
+        Always bump the change sequence, so a count being computed concurrently is not
+        stored; move the count itself only once it has been computed.
+        """
+        mongo = get_mongo()
+        await mongo.db[USER_STATS_COLLECTION].update_one(
+            {"userId": user_id},
+            [
+                {
+                    "$set": {
+                        "collectionSeq": {"$add": [{"$ifNull": ["$collectionSeq", 0]}, 1]},
+                        "collectionCount": {
+                            "$cond": [
+                                {"$eq": [{"$type": "$collectionCount"}, "missing"]},
+                                "$$REMOVE",
+                                {"$add": ["$collectionCount", delta]},
+                            ]
+                        },
+                    }
+                }
+            ],
+            upsert=True,
+        )
+
+    async def recompute_collection_count(self, user_id: str, seq: Optional[int], now: datetime) -> Tuple[int, bool]:
+        """
+        Compute the exact count and store it unless the counter moved since change
+        sequence `seq` was read (None: read it now). Returns (count, stored).
+        """
+        if seq is None:
+            _, seq, _ = await self.get_collection_count(user_id)
+        count = await self.compute_collection_count(user_id)
+        return count, await self.set_collection_count(user_id, count, seq, now)
+
+    async def compute_collection_count(self, user_id: str) -> int:
+        """Exact |liked ∪ saved| for the user — seeds and periodically repairs the counter."""
+        mongo = get_mongo()
+        pipeline = [
+            {"$match": {"userId": user_id}},
+            {"$project": {"_id": 0, "postId": 1}},
+            {
+                "$unionWith": {
+                    "coll": SAVED_POSTS_COLLECTION,
+                    "pipeline": [{"$match": {"userId": user_id}}, {"$project": {"_id": 0, "postId": 1}}],
+                }
+            },
+            {"$group": {"_id": "$postId"}},
+            {"$count": "n"},
+        ]
+        docs = await mongo.db[LIKES_COLLECTION].aggregate(pipeline).to_list(length=1)
+        return int(docs[0]["n"]) if docs else 0
+
 
 @dataclass
 class CommentsRepository:
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List
+
+from config.config import settings
+from core.resources.posts.dtos import PostListDTO
+from core.resources.posts.types import PostDoc
+
+
+def project_post_list_item(doc: PostDoc) -> Dict[str, Any]:
+    """
+    Project a trusted Mongo post doc straight to the PostListDTO wire shape.
+
+    Skips pydantic validation: the field set and defaults must stay in sync with PostListDTO.
+    """
+    author = doc.get("author") or {}
+    stats = doc.get("stats")
+    return {
+        "id": doc["id"],
+        "media": [{"type": m["type"], "id": m["id"]} for m in doc.get("media") or []],
+        "caption": doc.get("caption", ""),
+        "description": doc.get("description", ""),
+        "tags": doc.get("tags") or [],
+        "status": doc.get("status"),
+        "createdAt": doc.get("createdAt"),
+        "author": {
+            "userId": author.get("userId"),
+            "username": author.get("username"),
+            "profilePhoto": author.get("profilePhoto"),
+        },
+        "stats": {"likes": int(stats.get("likes", 0)), "comments": int(stats.get("comments", 0))} if stats else None,
+        "likedByUser": bool(doc.get("likedByUser", False)),
+        "savedByUser": bool(doc.get("savedByUser", False)),
+        "error": doc.get("error"),
+    }
+
+
+def serialize_post_list(docs: Iterable[PostDoc]) -> List[Dict[str, Any]]:
+    """Serialize post docs for list responses using the configured serializer."""
+    if settings.execute_serializer == "orjson":
+        return [project_post_list_item(d) for d in docs]
+    return [PostListDTO.model_validate(d).model_dump() for d in docs]
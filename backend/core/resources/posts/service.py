@@ -1,17 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Protocol
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol
 from uuid import uuid4
 
 from common.app_constants import POST_STATUS_PENDING
+from config.config import settings
+from database.fanout import gather_reads
 from database.mongo_common import now_utc
 from core.resources.jobs.service import JobsService
-from core.resources.posts.dtos import CommentDTO, PostDTO, PostListDTO, PostStatsDTO
+from core.resources.posts.constants import FEED_CHANGED_EVENT
+from core.resources.posts.counter_buffer import CounterAggregator
+from core.resources.posts.dtos import CommentDTO, PostDTO, PostStatsDTO
 from core.resources.posts.exceptions import PostNotFoundError
+from core.resources.posts.feed_cache import FeedPage, FeedPageCache
+from core.resources.posts.interaction_cache import InteractionSets, UserInteractionCache
+from core.resources.posts.pagination import FeedCursor, decode_cursor, encode_cursor
+from core.resources.posts.serializers import serialize_post_list
 from core.resources.posts.types import CommentDoc, PostDoc
 from core.resources.posts.validators import normalize_tags
+from core.services.cqrs.event_bus import get_event_bus
 from core.logger.logger import get_logger
 
 
@@ -20,7 +30,8 @@ logger = get_logger(__name__)
 
 class PostsRepositoryProtocol(Protocol):
     async def insert(self, doc: PostDoc) -> None: ...
-    async def find_latest_posted(self, take: int, skip: int) -> list[PostDoc]: ...
+    async def find_latest_posted(self, take: int, skip: int = 0, after: FeedCursor | None = None) -> list[PostDoc]: ...
+    async def find_hot_posted(self, take: int, skip: int) -> list[PostDoc]: ...
     async def find_by_user_id(self, user_id: str, take: int, skip: int) -> list[PostDoc]: ...
     async def count_posts_by_user(self, user_id: str) -> int: ...
     async def find_by_ids(self, post_ids: list[str]) -> list[PostDoc]: ...
@@ -33,15 +44,24 @@ class PostsRepositoryProtocol(Protocol):
 class LikesRepositoryProtocol(Protocol):
     async def list_liked_post_ids(self, user_id: str, post_ids: list[str]) -> list[str]: ...
     async def exists(self, post_id: str, user_id: str) -> bool: ...
-    async def toggle(self, post_id: str, user_id: str, now: datetime) -> bool: ...
-    async def list_all_liked(self, user_id: str) -> dict[str, datetime]: ...
+    async def set_like(self, post_id: str, user_id: str, liked: bool, now: datetime) -> bool: ...
+    async def iter_by_user(self, user_id: str, batch_size: int) -> AsyncIterator[tuple[str, datetime]]: ...
+    async def list_post_ids_by_user(self, user_id: str, limit: int) -> list[str]: ...
 
 
 class SavedPostsRepositoryProtocol(Protocol):
     async def list_saved_post_ids_for_posts(self, user_id: str, post_ids: list[str]) -> list[str]: ...
     async def exists(self, post_id: str, user_id: str) -> bool: ...
-    async def toggle(self, post_id: str, user_id: str, now: datetime) -> bool: ...
-    async def list_all_saved(self, user_id: str) -> dict[str, datetime]: ...
+    async def set_save(self, post_id: str, user_id: str, saved: bool, now: datetime) -> bool: ...
+    async def iter_by_user(self, user_id: str, batch_size: int) -> AsyncIterator[tuple[str, datetime]]: ...
+    async def list_post_ids_by_user(self, user_id: str, limit: int) -> list[str]: ...
+
+
+class UserStatsRepositoryProtocol(Protocol):
+    async def get_collection_count(self, user_id: str) -> tuple[int | None, int, datetime | None]: ...
+    async def recompute_collection_count(self, user_id: str, seq: int | None, now: datetime) -> tuple[int, bool]: ...
+    async def inc_collection_count(self, user_id: str, delta: int) -> None: ...
+    async def compute_collection_count(self, user_id: str) -> int: ...
 
 
 class CommentsRepositoryProtocol(Protocol):
@@ -55,7 +75,40 @@ class PostsService:
     likes_repo: LikesRepositoryProtocol
     comments_repo: CommentsRepositoryProtocol
     saved_posts_repo: SavedPostsRepositoryProtocol
+    user_stats_repo: UserStatsRepositoryProtocol
     jobs_service: JobsService
+    feed_cache: FeedPageCache = field(
+        default_factory=lambda: FeedPageCache(
+            max_pages=settings.feed_cache_max_pages,
+            ttl_seconds=settings.feed_cache_ttl_seconds,
+        )
+    )
+    interactions: UserInteractionCache = field(
+        default_factory=lambda: UserInteractionCache(
+            max_users=settings.interaction_cache_max_users,
+            max_ids_per_user=settings.interaction_cache_max_ids_per_user,
+            max_total_ids=settings.interaction_cache_max_total_ids,
+            ttl_seconds=settings.interaction_cache_ttl_seconds,
+        )
+    )
+    # write-behind like/comment counters; None writes each delta straight through inc_counts
+    counters: CounterAggregator | None = None
+
+    def _stats(self, post: PostDoc) -> Dict[str, int]:
+        """Persisted stats plus this worker's unflushed counter deltas."""
+        if self.counters is not None:
+            return self.counters.apply(post["id"], post.get("stats"))
+        stats = post.get("stats") or {}
+        return {"likes": int(stats.get("likes", 0)), "comments": int(stats.get("comments", 0))}
+
+    def _with_pending_stats(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return items if self.counters is None else self.counters.overlay(items)
+
+    def invalidate_feed_cache(self, payload: Dict[str, Any] | None = None) -> None:
+        """EventBus handler for FEED_CHANGED_EVENT."""
+        self.feed_cache.invalidate()
+        payload = payload or {}
+        logger.info("feed cache invalidated post_id=%s", payload.get("postIds") or payload.get("postId"))
 
     async def create_post(self, user_id: str, caption: str, description: str, tags: list[str], username: str | None = None, profile_photo: str | None = None) -> PostDTO:
         now = now_utc()
@@ -80,76 +133,181 @@ class PostsService:
         logger.info("post created (pending) post_id=%s user_id=%s", post_id, user_id)
         return PostDTO.model_validate(doc)
 
-    async def list_posts(self, take: int, skip: int, user_id: str | None = None) -> List[PostListDTO]:
-        docs = await self.posts_repo.find_latest_posted(take=take, skip=skip)
-        if user_id and docs:
-            post_ids = [d.get("id") for d in docs if d.get("id")]
+    async def _load_interaction_sets(self, user_id: str) -> InteractionSets | None:
+        cap = self.interactions.max_ids_per_user
+        liked = await self.likes_repo.list_post_ids_by_user(user_id=user_id, limit=cap + 1)
+        if len(liked) > cap:
+            return None
+        saved = await self.saved_posts_repo.list_post_ids_by_user(user_id=user_id, limit=cap + 1 - len(liked))
+        if len(liked) + len(saved) > cap:
+            return None
+        return InteractionSets(liked=set(liked), saved=set(saved))
+
+    async def _interaction_sets(self, user_id: str) -> InteractionSets | None:
+        """Cached liked/saved sets for the user, or None when the caller must query directly."""
+        if not self.interactions.enabled:
+            return None
+        return await self.interactions.get(user_id, self._load_interaction_sets)
+
+    async def _load_feed_page(self, take: int, skip: int, cursor: str | None) -> FeedPage:
+        """Anonymous (no per-user flags) serialized feed page, served from the page cache when warm."""
+        key = (take, 0 if cursor else skip, cursor)
+        cached = self.feed_cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = self.feed_cache.generation
+        after = decode_cursor(cursor) if cursor else None
+        docs = await self.posts_repo.find_latest_posted(take=take, skip=skip, after=after)
+        items = serialize_post_list(docs)
+        next_cursor = encode_cursor(items[-1]["createdAt"], items[-1]["id"]) if len(items) == take else None
+        page: FeedPage = (items, next_cursor)
+        self.feed_cache.put(key, page, generation)
+        return page
+
+    async def list_posts(
+        self, take: int, skip: int, user_id: str | None = None, cursor: str | None = None
+    ) -> tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return one serialized feed page plus the cursor for the next one (None when exhausted)."""
+        items, next_cursor = await self._load_feed_page(take=take, skip=skip, cursor=cursor)
+        items = self._with_pending_stats(items)
+        if user_id:
+            items = await self._overlay_user_flags(items, user_id)
+        logger.info("list_posts ok take=%s skip=%s cursor=%s count=%s", take, skip, bool(cursor), len(items))
+        return items, next_cursor
+
+    async def list_hot_posts(self, take: int, skip: int, user_id: str | None = None) -> List[Dict[str, Any]]:
+        """Feed ordered by precomputed, time-decayed hotScore."""
+        key = ("hot", take, skip)
+        page = self.feed_cache.get(key)
+        if page is None:
+            generation = self.feed_cache.generation
+            docs = await self.posts_repo.find_hot_posted(take=take, skip=skip)
+            page = (serialize_post_list(docs), None)
+            self.feed_cache.put(key, page, generation)
+        items = self._with_pending_stats(page[0])
+        if user_id:
+            items = await self._overlay_user_flags(items, user_id)
+        logger.info("list_hot_posts ok take=%s skip=%s count=%s", take, skip, len(items))
+        return items
+
+    async def _overlay_user_flags(self, items: List[Dict[str, Any]], user_id: str) -> List[Dict[str, Any]]:
+        if not items:
+            return items
+        sets = await self._interaction_sets(user_id)
+        if sets is not None:
+            liked_ids, saved_ids = sets.liked, sets.saved
+        else:
+            post_ids = [i["id"] for i in items]
             liked_ids = set(await self.likes_repo.list_liked_post_ids(user_id=user_id, post_ids=post_ids))
             saved_ids = set(await self.saved_posts_repo.list_saved_post_ids_for_posts(user_id=user_id, post_ids=post_ids))
-            for d in docs:
-                post_id = d.get("id")
-                d["likedByUser"] = post_id in liked_ids
-                d["savedByUser"] = post_id in saved_ids
-        logger.info("list_posts ok take=%s skip=%s count=%s", take, skip, len(docs))
-        return [PostListDTO.model_validate(d) for d in docs]
-
-    async def list_posts_by_user(self, user_id: str, take: int, skip: int) -> List[PostListDTO]:
+        # cached base pages are shared — overlay on copies, never in place
+        return [
+            {**i, "likedByUser": i["id"] in liked_ids, "savedByUser": i["id"] in saved_ids}
+            for i in items
+        ]
+
+    async def list_posts_by_user(self, user_id: str, take: int, skip: int) -> List[Dict[str, Any]]:
         docs = await self.posts_repo.find_by_user_id(user_id=user_id, take=take, skip=skip)
         logger.info("list_posts_by_user user_id=%s take=%s skip=%s count=%s", user_id, take, skip, len(docs))
-        return [PostListDTO.model_validate(d) for d in docs]
+        return serialize_post_list(docs)
 
     async def count_posts_by_user(self, user_id: str) -> int:
         return await self.posts_repo.count_posts_by_user(user_id=user_id)
 
 
 
-    async def list_saved_posts(self, user_id: str, take: int, skip: int) -> List[PostListDTO]:
-        saved_dict = await self.saved_posts_repo.list_all_saved(user_id=user_id)
-        liked_dict = await self.likes_repo.list_all_liked(user_id=user_id)
-        
-        merged = {}
-        for pid, dt in saved_dict.items():
-            merged[pid] = dt
-        for pid, dt in liked_dict.items():
-            if pid not in merged or dt > merged[pid]:
-                merged[pid] = dt
-        
-        # Sort by date descending
-        sorted_pairs = sorted(merged.items(), key=lambda x: x[1], reverse=True)
-        # Paginate
-        page_pairs = sorted_pairs[skip : skip + take]
-        post_ids = [pid for pid, dt in page_pairs]
-        
+    async def _merged_collection_ids(self, user_id: str, limit: int) -> List[str]:
+        """
+        K-way merge of the user's saves and likes, newest first, de-duplicated by post.
+
+        Each stream is an index-ordered cursor on (userId, createdAt); the merge stops as
+        soon as `limit` distinct posts are produced, so a page never reads whole histories.
+        A post present in several streams is ranked by its newest interaction, which is
+        always the first one the merge sees.
+        """
+        streams = [
+            self.saved_posts_repo.iter_by_user(user_id=user_id, batch_size=limit),
+            self.likes_repo.iter_by_user(user_id=user_id, batch_size=limit),
+        ]
+        try:
+            heads: List[tuple[str, datetime] | None] = [await anext(s, None) for s in streams]
+            seen: set[str] = set()
+            out: List[str] = []
+            while len(out) < limit:
+                live = [i for i, h in enumerate(heads) if h is not None]
+                if not live:
+                    break
+                idx = max(live, key=lambda i: heads[i][1])  # type: ignore[index]
+                post_id, _ = heads[idx]  # type: ignore[misc]
+                heads[idx] = await anext(streams[idx], None)
+                if post_id in seen:
+                    continue
+                seen.add(post_id)
+                out.append(post_id)
+            return out
+        finally:
+            for s in streams:
+                await s.aclose()
+
+    async def list_saved_posts(self, user_id: str, take: int, skip: int) -> List[Dict[str, Any]]:
+        """The user's collection (saved or liked posts), newest interaction first."""
+        merged_ids = await self._merged_collection_ids(user_id=user_id, limit=skip + take)
+        post_ids = merged_ids[skip:]
         if not post_ids:
             return []
 
+        # find_by_ids keeps only posted posts and preserves the merge order
         posts = await self.posts_repo.find_by_ids(post_ids)
-        by_id = {p.get("id"): p for p in posts if p.get("status") == "posted"}
-        items: List[PostListDTO] = []
-        for post_id in post_ids:
-            post = by_id.get(post_id)
-            if not post:
-                continue
-            post["savedByUser"] = post_id in saved_dict
-            post["likedByUser"] = post_id in liked_dict
-            items.append(PostListDTO.model_validate(post))
-        return items
+        return await self._overlay_user_flags(self._with_pending_stats(serialize_post_list(posts)), user_id)
 
     async def count_saved_posts(self, user_id: str) -> int:
-        saved_dict = await self.saved_posts_repo.list_all_saved(user_id=user_id)
-        liked_dict = await self.likes_repo.list_all_liked(user_id=user_id)
-        merged = set(saved_dict.keys()).union(liked_dict.keys())
-        return len(merged)
+        """
+        |liked ∪ saved| from the maintained per-user counter. It is computed exactly on
+        first read and again once older than `collection_count_refresh_seconds`, which
+        repairs any drift (a like and a save of the same post racing each other).
+        """
+        count, seq, computed_at = await self.user_stats_repo.get_collection_count(user_id)
+        if (
+            count is not None
+            and computed_at is not None
+            and (now_utc() - computed_at).total_seconds() < settings.collection_count_refresh_seconds
+        ):
+            return max(0, count)
+        count, stored = await self.user_stats_repo.recompute_collection_count(user_id, seq, now_utc())
+        if not stored:
+            logger.info("collection count changed while recomputing user_id=%s", user_id)
+        return count
 
     async def get_post(self, post_id: str, user_id: str | None = None) -> PostDTO:
-        doc = await self.posts_repo.find_by_id(post_id)
-        if not doc:
-            raise PostNotFoundError()
-
-        if user_id:
-            doc["likedByUser"] = await self.likes_repo.exists(post_id=post_id, user_id=user_id)
-            doc["savedByUser"] = await self.saved_posts_repo.exists(post_id=post_id, user_id=user_id)
-
+        if not user_id:
+            doc = await self.posts_repo.find_by_id(post_id)
+            if not doc:
+                raise PostNotFoundError()
+        elif not self.interactions.enabled:
+            doc, liked, saved = await gather_reads(
+                self.posts_repo.find_by_id(post_id),
+                self.likes_repo.exists(post_id=post_id, user_id=user_id),
+                self.saved_posts_repo.exists(post_id=post_id, user_id=user_id),
+            )
+            if not doc:
+                raise PostNotFoundError()
+            doc["likedByUser"], doc["savedByUser"] = liked, saved
+        else:
+            doc, sets = await gather_reads(self.posts_repo.find_by_id(post_id), self._interaction_sets(user_id))
+            if not doc:
+                raise PostNotFoundError()
+            if sets is not None:
+                doc["likedByUser"] = post_id in sets.liked
+                doc["savedByUser"] = post_id in sets.saved
+            else:
+                doc["likedByUser"], doc["savedByUser"] = await gather_reads(
+                    self.likes_repo.exists(post_id=post_id, user_id=user_id),
+                    self.saved_posts_repo.exists(post_id=post_id, user_id=user_id),
+                )
+
+        if self.counters is not None:
+            doc["stats"] = self.counters.apply(post_id, doc.get("stats"))
         logger.info("get_post post_id=%s", post_id)
         return PostDTO.model_validate(doc)
 
@@ -157,31 +315,144 @@ class PostsService:
         post = await self.posts_repo.find_by_id(post_id)
         if not post:
             raise PostNotFoundError()
-        likes = int(post.get("stats", {}).get("likes", 0))
-        comments = int(post.get("stats", {}).get("comments", 0))
-        return PostStatsDTO(postId=post_id, likes=likes, comments=comments)
+        stats = self._stats(post)
+        return PostStatsDTO(postId=post_id, likes=stats["likes"], comments=stats["comments"])
+
+    async def _count_like(self, post_id: str, user_id: str, delta: int, saved: bool) -> PostDoc | None:
+        """Move the post's like counter and, unless the post is saved, the user's collection
+        counter, concurrently. Returns the post, or None when it doesn't exist."""
+        if self.counters is not None:
+            post_update = self.posts_repo.find_by_id(post_id)
+        else:
+            post_update = self.posts_repo.inc_counts(post_id=post_id, likes_delta=delta)
+        if saved:
+            post = await post_update
+        else:
+            post, _ = await asyncio.gather(post_update, self.user_stats_repo.inc_collection_count(user_id, delta))
+        if post is not None and self.counters is not None:
+            self.counters.add(post_id, likes_delta=delta)
+        return post
+
+    async def _uncount_like(self, post_id: str, user_id: str, delta: int, saved: bool, post: PostDoc | None) -> None:
+        """Reverse `_count_like` (which returned `post`)."""
+        undo = []
+        if post is not None:
+            if self.counters is not None:
+                self.counters.add(post_id, likes_delta=-delta)
+            else:
+                undo.append(self.posts_repo.inc_counts(post_id=post_id, likes_delta=-delta))
+        if not saved:
+            undo.append(self.user_stats_repo.inc_collection_count(user_id, -delta))
+        await asyncio.gather(*undo)
+
+    async def _set_like(self, post_id: str, user_id: str, liked: bool | None) -> tuple[bool, int]:
+        """
+        At most two round trips. First: the conditional write, alongside the authoritative
+        "is it saved too?" read the collection counter needs. Second: the counter updates.
+        A toggle tries the delete first; if there was nothing to delete, the insert goes
+        out together with the counter updates, which are reversed if a concurrent call
+        inserted the like first. Counters only move for writes that changed state.
+        """
+        now = now_utc()
 
-    async def toggle_like(self, post_id: str, user_id: str) -> tuple[bool, int]:
-        post = await self.posts_repo.find_by_id(post_id)
-        if not post:
+        async def write(value: bool) -> bool:
+            return await self.likes_repo.set_like(post_id=post_id, user_id=user_id, liked=value, now=now)
+
+        first = False if liked is None else liked
+        changed, saved = await asyncio.gather(
+            write(first), self.saved_posts_repo.exists(post_id=post_id, user_id=user_id)
+        )
+        post: PostDoc | None = None
+        if changed:
+            liked = first
+            post = await self._count_like(post_id, user_id, 1 if liked else -1, saved)
+        elif liked is None:
+            liked = True
+            changed, post = await asyncio.gather(write(True), self._count_like(post_id, user_id, 1, saved))
+            if not changed:
+                # lost the insert race: the winner counts this like
+                await self._uncount_like(post_id, user_id, 1, saved, post)
+                post = None
+        self.interactions.record_like(user_id, post_id, liked)
+
+        if not changed:
+            post = await self.posts_repo.find_by_id(post_id)
+            if not post:
+                raise PostNotFoundError()
+            return liked, self._stats(post)["likes"]
+        if post is None:
+            # no such post: undo the reaction and the collection bump written above
+            delta = 1 if liked else -1
+            await asyncio.gather(write(not liked), self._uncount_like(post_id, user_id, delta, saved, None))
+            self.interactions.record_like(user_id, post_id, not liked)
             raise PostNotFoundError()
+        return liked, self._stats(post)["likes"]
+
+    async def set_like(self, post_id: str, user_id: str, liked: bool) -> tuple[bool, int]:
+        """Idempotent like/unlike; safe under concurrent calls."""
+        return await self._set_like(post_id, user_id, liked)
 
+    async def toggle_like(self, post_id: str, user_id: str) -> tuple[bool, int]:
+        return await self._set_like(post_id, user_id, None)
+
+    async def _count_save(self, post_id: str, user_id: str, delta: int, liked: bool) -> PostDoc | None:
+        """Fetch the post and, unless the post is liked, move the user's collection counter,
+        concurrently. Returns the post, or None when it doesn't exist."""
+        if liked:
+            return await self.posts_repo.find_by_id(post_id)
+        post, _ = await asyncio.gather(
+            self.posts_repo.find_by_id(post_id), self.user_stats_repo.inc_collection_count(user_id, delta)
+        )
+        return post
+
+    async def _uncount_save(self, user_id: str, delta: int, liked: bool) -> None:
+        """Reverse `_count_save`."""
+        if not liked:
+            await self.user_stats_repo.inc_collection_count(user_id, -delta)
+
+    async def _set_save(self, post_id: str, user_id: str, saved: bool | None) -> bool:
+        """
+        At most two round trips, like `_set_like`. First: the conditional write, alongside
+        the authoritative "is it liked too?" read. Second: the post lookup and the
+        collection counter update. Only posted posts can be saved; anything else undoes
+        the write.
+        """
         now = now_utc()
-        liked = await self.likes_repo.toggle(post_id=post_id, user_id=user_id, now=now)
-        delta = 1 if liked else -1
-        updated = await self.posts_repo.inc_counts(post_id=post_id, likes_delta=delta)
-        likes = int((updated or post).get("stats", {}).get("likes", 0))
-        return liked, likes
 
+        async def write(value: bool) -> bool:
+            return await self.saved_posts_repo.set_save(post_id=post_id, user_id=user_id, saved=value, now=now)
 
+        first = False if saved is None else saved
+        changed, liked = await asyncio.gather(
+            write(first), self.likes_repo.exists(post_id=post_id, user_id=user_id)
+        )
+        post: PostDoc | None = None
+        if changed:
+            saved = first
+            post = await self._count_save(post_id, user_id, 1 if saved else -1, liked)
+        elif saved is None:
+            saved = True
+            changed, post = await asyncio.gather(write(True), self._count_save(post_id, user_id, 1, liked))
+            if not changed:
+                # lost the insert race: the winner counts this save
+                await self._uncount_save(user_id, 1, liked)
+        else:
+            post = await self.posts_repo.find_by_id(post_id)
 
-    async def toggle_save_post(self, post_id: str, user_id: str) -> bool:
-        post = await self.posts_repo.find_by_id(post_id)
         if not post or post.get("status") != "posted":
+            if changed:
+                # not saveable: undo the write and the collection bump made above
+                await asyncio.gather(write(not saved), self._uncount_save(user_id, 1 if saved else -1, liked))
             raise PostNotFoundError()
+        self.interactions.record_save(user_id, post_id, saved)
+        return saved
 
-        now = now_utc()
-        return await self.saved_posts_repo.toggle(post_id=post_id, user_id=user_id, now=now)
+    async def set_save(self, post_id: str, user_id: str, saved: bool) -> bool:
+        """Idempotent save/unsave; safe under concurrent calls."""
+        return await self._set_save(post_id, user_id, saved)
+
+    async def toggle_save_post(self, post_id: str, user_id: str) -> bool:
+        return await self._set_save(post_id, user_id, None)
 
     async def add_comment(self, post_id: str, user_id: str, text: str, first_name: str | None = None) -> CommentDTO:
         post = await self.posts_repo.find_by_id(post_id)
@@ -204,7 +475,10 @@ class PostsService:
             "createdAt": now,
         }
         await self.comments_repo.insert(doc)
-        await self.posts_repo.inc_counts(post_id=post_id, comments_delta=1)
+        if self.counters is not None:
+            self.counters.add(post_id, comments_delta=1)
+        else:
+            await self.posts_repo.inc_counts(post_id=post_id, comments_delta=1)
         return CommentDTO.model_validate(doc)
 
     async def delete_post(self, post_id: str, requesting_user_id: str, is_admin: bool = False) -> None:
@@ -215,14 +489,15 @@ class PostsService:
         if not is_admin and post.get("author", {}).get("userId") != requesting_user_id:
             raise PermissionError("You can only delete your own posts")
         await self.posts_repo.soft_delete(post_id)
+        await get_event_bus().publish(FEED_CHANGED_EVENT, {"postId": post_id})
         logger.info("post soft-deleted post_id=%s user_id=%s is_admin=%s", post_id, requesting_user_id, is_admin)
 
-    async def search_posts(self, query: str, take: int, skip: int) -> List[PostListDTO]:
+    async def search_posts(self, query: str, take: int, skip: int) -> List[Dict[str, Any]]:
         """Search posts by text across caption, description and tags."""
         if not query or not query.strip():
             return []
         docs = await self.posts_repo.search(query=query.strip(), take=take, skip=skip)
-        return [PostListDTO.model_validate(d) for d in docs]
+        return serialize_post_list(docs)
 
     async def cleanup_dangling_posts(self, older_than_minutes: int = 60) -> int:
         """Mark as 'failed' any posts that have been pending for too long (upload never completed)."""
@@ -51,6 +51,13 @@ class ApiKeysRepository:
         mongo = get_mongo()
         return await mongo.db[API_KEYS_COLLECTION].find_one({"key_hash": key_hash, "status": "active"})
 
+    async def list_active_hashes(self, uploader_id: str) -> list[str]:
+        mongo = get_mongo()
+        cursor = mongo.db[API_KEYS_COLLECTION].find(
+            {"uploader_id": uploader_id, "status": "active"}, {"_id": 0, "key_hash": 1}
+        )
+        return [d["key_hash"] async for d in cursor]
+
     async def list_by_uploader(self, uploader_id: str) -> list[ApiKeyDoc]:
         mongo = get_mongo()
         cursor = mongo.db[API_KEYS_COLLECTION].find({"uploader_id": uploader_id}).sort("createdAt", -1)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import hashlib
 import secrets
 import uuid
 from dataclasses import dataclass, field
-from typing import List, Optional, Protocol
+from typing import Callable, List, Optional, Protocol
 
 from core.resources.uploaders.dtos import (
     ApiKeyValidationRequest,
@@ -30,13 +31,24 @@ class UploadersRepositoryProtocol(Protocol):
 class ApiKeysRepositoryProtocol(Protocol):
     async def insert(self, doc: ApiKeyDoc) -> None: ...
     async def find_by_hash(self, key_hash: str) -> ApiKeyDoc | None: ...
+    async def list_active_hashes(self, uploader_id: str) -> list[str]: ...
     async def revoke_all_for_uploader(self, uploader_id: str) -> None: ...
 
 
+def hash_api_key(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
 @dataclass
 class UploaderService:
     repository: UploadersRepositoryProtocol = field(default_factory=UploadersRepository)
     api_key_repo: ApiKeysRepositoryProtocol = field(default_factory=ApiKeysRepository)
+    # called after any change to uploader status or keys, so caches can drop stale entries
+    on_change: Optional[Callable[[], None]] = None
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
 
     async def create_uploader(self, request: UploaderCreateRequest) -> tuple[Uploader, Optional[str], bool]:
         existing = await self.repository.find_by_email(request.email)
@@ -55,6 +67,7 @@ class UploaderService:
         await self.repository.insert(uploader.to_dict())
 
         raw_key = await self.generate_api_key(uploader_id)
+        self._changed()
 
         return uploader, raw_key, False
 
@@ -98,15 +111,18 @@ class UploaderService:
 
     async def update_status(self, request: UploaderStatusUpdateRequest) -> None:
         await self.repository.update_status(request.uploaderId, request.status)
+        self._changed()
 
     async def revoke_api_key(self, request: UploaderIdRequest) -> str:
         await self.api_key_repo.revoke_all_for_uploader(request.uploaderId)
-        return await self.generate_api_key(request.uploaderId)
+        # invalidate before issuing the new key: the revoked ones must stop working now
+        self._changed()
+        raw_key = await self.generate_api_key(request.uploaderId)
+        self._changed()
+        return raw_key
 
     def _generate_raw_key(self) -> str:
         return f"mt_{secrets.token_urlsafe(32)}"
 
     def _hash_api_key(self, value: str) -> str:
-        import hashlib
-
-        return hashlib.sha256(value.encode("utf-8")).hexdigest()
+        return hash_api_key(value)
@@ -19,6 +19,9 @@ class EventBus:
     def register(self, event_type: str, handler: Callable[[Dict[str, Any]], Any]) -> None:
         self._handlers[event_type] = handler
 
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
     async def publish(self, event_type: str, payload: Dict[str, Any]) -> None:
         await self._queue.put({"type": event_type, "payload": payload})
 
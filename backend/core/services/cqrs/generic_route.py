@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import time
 from typing import Any, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Header, Request
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field
 
-from core.logger.logger import get_logger
+from config.config import settings
+from core.logger.logger import action_var, get_logger
 from core.services.cqrs.handler_registry import Payload, query_registry, mutation_registry, UnknownActionError
 from core.plugins.auth.clerk_jwt import AuthError, verify_clerk_bearer_token
 from core.plugins.auth.models import AuthUser
+from core.plugins.metrics import CQRS_ACTION_SECONDS
+from database.fanout import close_request_scope, open_request_scope
 
 
 logger = get_logger(__name__)
@@ -23,9 +32,46 @@ class GenericRequest(BaseModel):
     payload: Payload = Field(default_factory=dict)
 
 
+class BatchRequest(BaseModel):
+    operations: list[GenericRequest] = Field(min_length=1, max_length=settings.execute_batch_max_ops)
+
+
 router = APIRouter(tags=["cqrs"])
 
 
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def encode_result(result: Any) -> bytes:
+    """Serialize a handler result to JSON bytes with the configured serializer."""
+    if settings.execute_serializer == "orjson":
+        return orjson.dumps(result, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(jsonable_encoder(result), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def render_result(result: Any) -> Any:
+    """
+    Encode a handler result in one pass with orjson and return it as a raw Response,
+    bypassing FastAPI's jsonable_encoder. Falls through unchanged in "pydantic" mode.
+    """
+    if settings.execute_serializer != "orjson" or isinstance(result, Response):
+        return result
+    return Response(content=encode_result(result), media_type="application/json")
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
 async def get_optional_user(authorization: Optional[str] = Header(default=None)) -> Optional[AuthUser]:
     if not authorization or not authorization.lower().startswith("bearer "):
         return None
@@ -37,36 +83,46 @@ async def get_optional_user(authorization: Optional[str] = Header(default=None))
         return None
 
 
-@router.post("/api/execute")
-async def execute(
+async def _dispatch(
     req: GenericRequest,
-    request: Request,
-    user: Optional[AuthUser] = Depends(get_optional_user),
-):
+    user: Optional[AuthUser],
+    headers: dict[str, str],
+    is_super_admin: bool,
+) -> Any:
+    """Run one CQRS operation. Every failure surfaces as an HTTPException."""
     try:
         registry = query_registry if req.type == "query" else mutation_registry
-        
-        from config.config import settings
-        is_super_admin = request.headers.get("x-super-admin-key") == settings.super_admin_api_key
 
         if req.type == "mutation" and not user and not is_super_admin:
             raise HTTPException(status_code=401, detail="authentication required for mutations")
-        
+
         handler = registry.get(req.action)
-        
+
         payload = req.payload.copy()
         payload["__auth"] = {
             "authenticated": bool(user),
             "user": user,
-            "headers": dict(request.headers),
+            "headers": headers,
             "is_super_admin": is_super_admin
         }
         if user:
             payload["userId"] = user.user_id
             payload["requesterEmail"] = user.email
-        
-        result = await handler(payload)
-        return result
+
+        start = time.perf_counter()
+        outcome = "error"
+        # lets logs and Mongo command monitoring attribute work to this action
+        token = action_var.set(req.action)
+        try:
+            result = await handler(payload)
+            outcome = "ok"
+            return result
+        except HTTPException as e:
+            outcome = str(e.status_code)
+            raise
+        finally:
+            action_var.reset(token)
+            CQRS_ACTION_SECONDS.observe(time.perf_counter() - start, req.type, req.action, outcome)
     except UnknownActionError as e:
         logger.info("unknown action action=%s type=%s", req.action, req.type)
         raise HTTPException(status_code=404, detail=str(e)) from e
@@ -75,3 +131,108 @@ async def execute(
     except Exception as e:
         logger.exception("execute error action=%s type=%s", req.action, req.type)
         raise HTTPException(status_code=500, detail="internal server error") from e
+
+
+@router.post("/api/execute")
+async def execute(
+    req: GenericRequest,
+    request: Request,
+    user: Optional[AuthUser] = Depends(get_optional_user),
+):
+    is_super_admin = request.headers.get("x-super-admin-key") == settings.super_admin_api_key
+    scope = open_request_scope()
+    try:
+        result = await _dispatch(req, user, dict(request.headers), is_super_admin)
+    finally:
+        close_request_scope(scope)
+    return render_result(result)
+
+
+@router.post("/api/execute/batch")
+async def execute_batch(
+    req: BatchRequest,
+    request: Request,
+    user: Optional[AuthUser] = Depends(get_optional_user),
+):
+    """
+    Run several operations behind one round trip, one auth check and one middleware pass.
+
+    Runs of consecutive queries execute concurrently (bounded by `execute_batch_concurrency`);
+    each mutation is a barrier applied in order, so later operations observe its effect.
+    Results are positional: {"ok", "status", "data"} or {"ok", "status", "error"}.
+    """
+    is_super_admin = request.headers.get("x-super-admin-key") == settings.super_admin_api_key
+    headers = dict(request.headers)
+    limiter = asyncio.Semaphore(max(1, settings.execute_batch_concurrency))
+    results: list[dict[str, Any]] = [{} for _ in req.operations]
+
+    async def _run(index: int, op: GenericRequest) -> None:
+        async with limiter:
+            try:
+                data = await _dispatch(op, user, headers, is_super_admin)
+                results[index] = {"ok": True, "status": 200, "data": data}
+            except HTTPException as e:
+                results[index] = {"ok": False, "status": e.status_code, "error": e.detail}
+
+    scope = open_request_scope()
+    try:
+        pending: list[tuple[int, GenericRequest]] = []
+        for index, op in enumerate(req.operations):
+            if op.type == "query":
+                pending.append((index, op))
+                continue
+            await asyncio.gather(*(_run(i, q) for i, q in pending))
+            pending = []
+            await _run(index, op)
+        await asyncio.gather(*(_run(i, q) for i, q in pending))
+    finally:
+        close_request_scope(scope)
+
+    logger.info(
+        "execute_batch ops=%s failed=%s",
+        len(results),
+        sum(1 for r in results if not r["ok"]),
+    )
+    return render_result({"results": results})
+
+
+@router.get("/api/query/{action}")
+async def query_get(
+    action: str,
+    request: Request,
+    user: Optional[AuthUser] = Depends(get_optional_user),
+):
+    """
+    Cacheable GET transport for query actions: query-string parameters become the payload.
+
+    Bodies carry a strong ETag and `If-None-Match` is answered with 304. Anonymous calls to
+    actions in `public_query_actions` are marked publicly cacheable so the edge can serve them;
+    everything else is `private, no-cache` (revalidate via ETag).
+    """
+    payload: Payload = {}
+    for key in request.query_params.keys():
+        values = request.query_params.getlist(key)
+        payload[key] = values if len(values) > 1 else values[0]
+    req = GenericRequest(type="query", action=action, payload=payload)
+    is_super_admin = request.headers.get("x-super-admin-key") == settings.super_admin_api_key
+
+    scope = open_request_scope()
+    try:
+        result = await _dispatch(req, user, dict(request.headers), is_super_admin)
+    finally:
+        close_request_scope(scope)
+
+    if isinstance(result, Response):
+        return result
+    body = encode_result(result)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if not user and not is_super_admin and action in settings.public_query_actions:
+        max_age = settings.query_cache_max_age_seconds
+        cache_control = f"public, max-age={max_age}, stale-while-revalidate={max_age * 6}"
+    else:
+        cache_control = "private, no-cache"
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization, X-Super-Admin-Key"}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
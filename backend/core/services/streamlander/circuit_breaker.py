@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+from core.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose breaker is open."""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"streamlander {endpoint} unavailable (circuit open, retry in {retry_after:.1f}s)")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Failure-rate breaker for one endpoint.
+
+    Closed: calls pass; the last `window` outcomes are kept and once at least
+    `min_calls` are recorded, a failure rate of `failure_rate` or more opens the breaker.
+    Open: calls fail fast with `CircuitOpenError` for `open_seconds` (jittered).
+    Half-open: a single trial call is let through; success closes the breaker, failure
+    reopens it for twice as long as last time, up to `max_open_seconds`.
+
+    `on_transition(endpoint, state)` is called on every state change.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        max_open_seconds: float = 300.0,
+        on_transition: Optional[Callable[[str, str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.endpoint = endpoint
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.on_transition = on_transition
+        self._clock = clock
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._failures = 0
+        self._state = CLOSED
+        self._open_until = 0.0
+        self._next_open_seconds = open_seconds
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() >= self._open_until:
+            return HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        return max(0.0, self._open_until - self._clock()) if self._state == OPEN else 0.0
+
+    def before_call(self) -> None:
+        """Admit a call or raise `CircuitOpenError`. Every admitted call must be followed
+        by `record()` or `abandon()`."""
+        if self._state == CLOSED:
+            return
+        if self._state == OPEN:
+            remaining = self._open_until - self._clock()
+            if remaining > 0:
+                raise CircuitOpenError(self.endpoint, remaining)
+            self._transition(HALF_OPEN)
+        # half-open: one trial at a time
+        if self._trial_in_flight:
+            raise CircuitOpenError(self.endpoint, 1.0)
+        self._trial_in_flight = True
+
+    def record(self, ok: bool) -> None:
+        if self._state == HALF_OPEN:
+            self._trial_in_flight = False
+            if ok:
+                self._outcomes.clear()
+                self._failures = 0
+                self._next_open_seconds = self.open_seconds
+                self._transition(CLOSED)
+            else:
+                self._open()
+            return
+        if self._state == OPEN:
+            # a call admitted before the breaker opened
+            return
+
+        if len(self._outcomes) == self._outcomes.maxlen and not self._outcomes[0]:
+            self._failures -= 1
+        self._outcomes.append(ok)
+        if not ok:
+            self._failures += 1
+            if len(self._outcomes) >= self.min_calls and self._failures >= self.failure_rate * len(self._outcomes):
+                self._open()
+
+    def abandon(self) -> None:
+        """The admitted call ended without an outcome (e.g. cancelled)."""
+        if self._state == HALF_OPEN:
+            self._trial_in_flight = False
+
+    def _open(self) -> None:
+        duration = self._next_open_seconds * random.uniform(0.8, 1.2)
+        self._open_until = self._clock() + duration
+        self._next_open_seconds = min(self._next_open_seconds * 2, self.max_open_seconds)
+        self._trial_in_flight = False
+        self._transition(OPEN)
+        logger.warning(
+            "streamlander circuit open endpoint=%s failures=%s/%s open_s=%.1f",
+            self.endpoint,
+            self._failures,
+            len(self._outcomes),
+            duration,
+        )
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        self._state = state
+        if state != OPEN:
+            logger.info("streamlander circuit %s endpoint=%s", state, self.endpoint)
+        if self.on_transition is not None:
+            self.on_transition(self.endpoint, state)
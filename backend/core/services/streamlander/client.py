@@ -1,35 +1,235 @@
 from __future__ import annotations
 
-from typing import Any, BinaryIO, Dict
+import asyncio
+import random
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, BinaryIO, Callable, Dict, Optional
+from uuid import uuid4
 
 import httpx
 
 from config.config import settings
+from core.logger.logger import get_logger
+from core.plugins.metrics import metrics
+from core.services.streamlander.circuit_breaker import OPEN, CircuitBreaker, CircuitOpenError
+
+logger = get_logger(__name__)
+
+BREAKER_TRANSITIONS = metrics.counter(
+    "streamlander_breaker_transitions_total",
+    "Streamlander circuit breaker state changes, by endpoint and new state.",
+    ("endpoint", "state"),
+)
+
+# breaker endpoints: uploads, /media probes (existence, thumbnails), /stream probes
+UPLOAD, MEDIA, STREAM = "upload", "media", "stream"
+
+# probe bodies up to this size are read so the connection goes back to the pool;
+# a larger one (a server ignoring Range) is cut off instead, at the cost of the connection
+_PROBE_DRAIN_LIMIT_BYTES = 64 * 1024
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
 
 
 class StreamlanderClient:
+    """
+    Streamlander API client over one long-lived, pooled `httpx.AsyncClient`.
+
+    Connections are kept alive across calls, so verify jobs and upload workers reuse
+    TCP/TLS sessions instead of paying setup on every request. Uploads and probes use
+    separate timeout profiles. `start()`/`aclose()` are called from the app lifespan;
+    outside it the pool is opened on first use.
+
+    Each endpoint has a circuit breaker: transport errors and 5xx responses count as
+    failures, and while a breaker is open uploads raise `CircuitOpenError` and probes
+    report "not ready" without touching the network. Probes are idempotent, so failed
+    ones are retried with jittered exponential backoff first.
+    """
+
     def __init__(self, base_url: str | None = None) -> None:
         self._base_url = (base_url or settings.streamlander_base_url).rstrip("/")
+        self._client: httpx.AsyncClient | None = None
+        connect = settings.streamlander_connect_timeout_seconds
+        self._upload_timeout = httpx.Timeout(settings.streamlander_upload_timeout_seconds, connect=connect)
+        self._probe_timeout = httpx.Timeout(settings.streamlander_probe_timeout_seconds, connect=connect)
+        self._probe_retries = settings.streamlander_probe_retries
+        self.breakers = {
+            endpoint: CircuitBreaker(
+                endpoint,
+                failure_rate=settings.streamlander_breaker_failure_rate,
+                window=settings.streamlander_breaker_window,
+                min_calls=settings.streamlander_breaker_min_calls,
+                open_seconds=settings.streamlander_breaker_open_seconds,
+                on_transition=lambda endpoint, state: BREAKER_TRANSITIONS.inc(endpoint, state),
+            )
+            for endpoint in (UPLOAD, MEDIA, STREAM)
+        }
+
+    def start(self) -> None:
+        if self._client is not None:
+            return
+        http2 = settings.streamlander_http2
+        if http2 and not _http2_available():
+            logger.warning("STREAMLANDER_HTTP2 is set but the h2 package is missing; using HTTP/1.1")
+            http2 = False
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.streamlander_max_connections,
+                max_keepalive_connections=settings.streamlander_max_keepalive_connections,
+                keepalive_expiry=settings.streamlander_keepalive_expiry_seconds,
+            ),
+            timeout=self._probe_timeout,
+        )
+        logger.info(
+            "streamlander client opened http2=%s max_connections=%s",
+            http2,
+            settings.streamlander_max_connections,
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+            logger.info("streamlander client closed")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self.start()
+        return self._client
+
+    def open_breakers(self) -> int:
+        return sum(1 for breaker in self.breakers.values() if breaker.state == OPEN)
+
+    def upload_retry_after(self) -> float:
+        """Seconds until the upload breaker admits calls again (0 when it does now)."""
+        return self.breakers[UPLOAD].retry_after()
+
+    async def _guarded(self, endpoint: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Run `send` through `endpoint`'s breaker; raises CircuitOpenError while it is open."""
+        breaker = self.breakers[endpoint]
+        breaker.before_call()
+        try:
+            resp = await send()
+        except httpx.HTTPError:
+            breaker.record(False)
+            raise
+        except BaseException:
+            breaker.abandon()
+            raise
+        breaker.record(resp.status_code < 500)
+        return resp
+
+    async def _probe_with_retry(
+        self, endpoint: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> Optional[httpx.Response]:
+        """A non-5xx response, or None once retries are exhausted or the breaker is open."""
+        for attempt in range(self._probe_retries + 1):
+            try:
+                resp = await self._guarded(endpoint, send)
+                if resp.status_code < 500:
+                    return resp
+            except CircuitOpenError:
+                return None
+            except httpx.HTTPError:
+                pass
+            if attempt < self._probe_retries:
+                # full jitter: uniform over [0, 0.2s * 2^attempt], capped at 2s
+                await asyncio.sleep(random.uniform(0, min(2.0, 0.2 * 2**attempt)))
+        return None
 
     async def upload(self, filename: str, content_type: str, data: bytes | BinaryIO) -> Dict[str, Any]:
         url = f"{self._base_url}/upload"
         # httpx accepts bytes directly in tuple format: (filename, bytes, content_type)
         # This is the recommended way per httpx documentation
         files = {"file": (filename, data, content_type)}
-        async with httpx.AsyncClient(timeout=1600.0) as client:  # Increased timeout for large files
+        try:
+            resp = await self._guarded(
+                UPLOAD,
+                lambda: self.client.post(
+                    url,
+                    headers={"X-API-KEY": settings.streamlander_api_key},
+                    files=files,
+                    timeout=self._upload_timeout,
+                ),
+            )
+            resp.raise_for_status()
+            return resp.json()
+        except httpx.HTTPStatusError as e:
+            # Try to get error details from response
+            error_detail = "Unknown error"
             try:
-                resp = await client.post(url, headers={"X-API-KEY": settings.streamlander_api_key}, files=files)
-                resp.raise_for_status()
-                return resp.json()
-            except httpx.HTTPStatusError as e:
-                # Try to get error details from response
-                error_detail = "Unknown error"
-                try:
-                    if e.response.content:
-                        error_detail = e.response.text[:500]  # Limit error message length
-                except:
-                    pass
-                raise Exception(f"Streamlander upload failed: {e.response.status_code} - {error_detail}") from e
+                if e.response.content:
+                    error_detail = e.response.text[:500]  # Limit error message length
+            except:
+                pass
+            raise Exception(f"Streamlander upload failed: {e.response.status_code} - {error_detail}") from e
+
+    async def upload_stream(
+        self,
+        filename: str,
+        content_type: str,
+        chunks: AsyncIterable[bytes],
+        size: int,
+        timeout: float | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Upload `size` bytes from `chunks` as the same multipart request `upload` sends,
+        without the file ever being on disk. The body is consumed as it is sent, so a
+        failed call cannot be retried from here; callers keep their own fallback.
+        """
+        url = f"{self._base_url}/upload"
+        boundary = uuid4().hex
+        quoted = filename.replace("\\", "\\\\").replace('"', "%22")
+        head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{quoted}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+
+        async def body() -> AsyncIterator[bytes]:
+            yield head
+            async for chunk in chunks:
+                yield chunk
+            yield tail
+
+        upload_timeout = self._upload_timeout if timeout is None else httpx.Timeout(timeout, connect=self._upload_timeout.connect)
+        resp = await self._guarded(
+            UPLOAD,
+            lambda: self.client.post(
+                url,
+                headers={
+                    "X-API-KEY": settings.streamlander_api_key,
+                    "Content-Type": f"multipart/form-data; boundary={boundary}",
+                    "Content-Length": str(len(head) + size + len(tail)),
+                },
+                content=body(),
+                timeout=upload_timeout,
+            ),
+        )
+        if resp.status_code >= 400:
+            raise Exception(f"Streamlander upload failed: {resp.status_code} - {resp.text[:500]}")
+        return resp.json()
+
+    async def _probe(self, url: str) -> bool:
+        """GET the first byte of `url`; True on 200/206."""
+
+        async def send() -> httpx.Response:
+            async with self.client.stream("GET", url, headers={"Range": "bytes=0-0"}) as resp:
+                length = resp.headers.get("content-length")
+                if length is not None and length.isdigit() and int(length) <= _PROBE_DRAIN_LIMIT_BYTES:
+                    await resp.aread()
+                return resp
+
+        resp = await self._probe_with_retry(MEDIA, send)
+        return resp is not None and resp.status_code in (200, 206)
 
     async def video_ready(self, media_id: str) -> bool:
         """
@@ -37,40 +237,35 @@ class StreamlanderClient:
         This endpoint returns headers + X-Accel-Redirect (no body), so it's a cheap probe.
         """
         url = f"{self._base_url}/stream/{media_id}"
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            try:
-                resp = await client.get(url)
-                return resp.status_code == 200
-            except httpx.HTTPError:
-                return False
+        resp = await self._probe_with_retry(STREAM, lambda: self.client.get(url))
+        return resp is not None and resp.status_code == 200
 
     async def thumbnail_ready(self, media_id: str) -> bool:
         """
         Memetok placeholders use thumb=true. Don't mark posted until thumb is available.
         """
-        url = f"{self._base_url}/media/{media_id}?thumb=true"
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            try:
-                async with client.stream("GET", url) as resp:
-                    return resp.status_code == 200
-            except httpx.HTTPError:
-                return False
+        return await self._probe(f"{self._base_url}/media/{media_id}?thumb=true")
 
     async def media_exists(self, media_id: str) -> bool:
         """
         Simple check: does the media exist at all? Just verify the /media endpoint returns 200.
         This is the basic verification needed - is the post real or not?
         """
-        url = f"{self._base_url}/media/{media_id}"
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            try:
-                async with client.stream("GET", url) as resp:
-                    return resp.status_code == 200
-            except httpx.HTTPError:
-                return False
+        return await self._probe(f"{self._base_url}/media/{media_id}")
 
     async def media_ready(self, media_id: str, media_type: str | None = None) -> bool:
         if (media_type or "").lower() == "video":
             return await self.video_ready(media_id)
         # images (and unknown types) require thumbnail for UI placeholders
         return await self.thumbnail_ready(media_id)
+
+
+_client: StreamlanderClient | None = None
+
+
+def get_shared_streamlander_client() -> StreamlanderClient:
+    global _client
+    if _client is None:
+        _client = StreamlanderClient()
+        metrics.gauge("streamlander_breakers_open", "Streamlander endpoints whose circuit is open.", _client.open_breakers)
+    return _client
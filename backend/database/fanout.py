@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar, Token
+from typing import Any, Awaitable
+
+from config.config import settings
+
+
+# One semaphore per request (set by the route) so nested fan-outs share a single budget
+# of in-flight Mongo operations and a burst of requests can't drain the connection pool.
+_request_slots: ContextVar[asyncio.Semaphore | None] = ContextVar("mongo_request_slots", default=None)
+
+
+def open_request_scope(limit: int | None = None) -> Token:
+    return _request_slots.set(asyncio.Semaphore(max(1, limit or settings.mongo_max_inflight_per_request)))
+
+
+def close_request_scope(token: Token) -> None:
+    _request_slots.reset(token)
+
+
+async def gather_reads(*aws: Awaitable[Any]) -> list[Any]:
+    """
+    Run independent reads concurrently, capped by the current request's in-flight budget.
+
+    Pass leaf awaitables only: an awaitable that itself calls gather_reads would hold a
+    slot while waiting for more and can deadlock a small budget.
+    Outside a request scope each call gets its own budget of `mongo_max_inflight_per_request`.
+    The first exception propagates, as with asyncio.gather.
+    """
+    slots = _request_slots.get() or asyncio.Semaphore(max(1, settings.mongo_max_inflight_per_request))
+
+    async def _bounded(aw: Awaitable[Any]) -> Any:
+        async with slots:
+            return await aw
+
+    return list(await asyncio.gather(*(_bounded(aw) for aw in aws)))
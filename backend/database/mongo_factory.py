@@ -6,6 +6,7 @@ from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
 from config.config import settings
+from database.monitoring import CommandLatencyListener, PoolCheckoutListener
 
 
 @dataclass(frozen=True)
@@ -27,6 +28,7 @@ def get_mongo() -> MongoContext:
         maxPoolSize=settings.mongo_max_pool_size,
         minPoolSize=settings.mongo_min_pool_size,
         serverSelectionTimeoutMS=settings.mongo_server_selection_timeout_ms,
+        event_listeners=[PoolCheckoutListener(), CommandLatencyListener(slow_ms=settings.mongo_slow_query_ms)],
     )
     db = client[settings.mongo_db]
     _mongo_ctx = MongoContext(client=client, db=db)
@@ -0,0 +1,151 @@
+"""pymongo event listeners registered on the shared client by `get_mongo`: pool checkouts and command latency."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+import orjson
+from pymongo import monitoring
+
+from core.logger.logger import get_logger
+from core.plugins.metrics import metrics
+
+logger = get_logger(__name__)
+
+MONGO_COMMAND_SECONDS = metrics.histogram(
+    "mongo_command_duration_seconds",
+    "Mongo command latency by collection and command (driver round trip).",
+    ("collection", "command", "outcome"),
+)
+
+MONGO_POOL_CHECKOUTS = metrics.counter("mongo_pool_checkouts_total", "Connections checked out of the Mongo pool.")
+MONGO_POOL_CHECKINS = metrics.counter("mongo_pool_checkins_total", "Connections returned to the Mongo pool.")
+
+
+class PoolCheckoutListener(monitoring.ConnectionPoolListener):
+    """Counts checkouts/checkins; the difference is the number of connections in use."""
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        MONGO_POOL_CHECKOUTS.inc()
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        MONGO_POOL_CHECKINS.inc()
+
+    # the remaining pool events are not recorded
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        pass
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        pass
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        pass
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        pass
+
+
+# where each command keeps the filter worth logging
+_FILTER_PATHS: Dict[str, Tuple[str, ...]] = {
+    "find": ("filter",),
+    "count": ("query",),
+    "distinct": ("query",),
+    "findAndModify": ("query",),
+    "aggregate": ("pipeline",),
+    "update": ("updates", "q"),
+    "delete": ("deletes", "q"),
+}
+
+
+def query_shape(value: Any) -> Any:
+    """`value` with every scalar replaced by "?" and arrays reduced to their distinct element shapes."""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = []
+        for item in value:
+            shape = query_shape(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return "?"
+
+
+def _command_filter(command_name: str, command: Any) -> Any:
+    path = _FILTER_PATHS.get(command_name)
+    if path is None:
+        return None
+    value = command.get(path[0])
+    if len(path) > 1:
+        # bulk write commands carry a list of statements; the first one stands for the batch
+        value = value[0].get(path[1]) if value else None
+    return value
+
+
+class CommandLatencyListener(monitoring.CommandListener):
+    """
+    Records every command's latency per collection/command and logs commands slower than
+    `slow_ms` with the filter shape (no values) and the CQRS action that issued them.
+
+    Started events are remembered until the matching success/failure arrives; the filter
+    shape is only computed for slow commands. Motor runs driver calls in a copy of the
+    caller's context, so the slow-command record carries the request id and CQRS action
+    like any other log line from the request.
+    """
+
+    def __init__(self, slow_ms: float = 200.0):
+        self.slow_ms = slow_ms
+        self._inflight: Dict[Tuple[int, Any], Tuple[str, Any]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        command = event.command
+        target = command.get(event.command_name)
+        collection = target if isinstance(target, str) else command.get("collection", "")
+        if not isinstance(collection, str):
+            collection = ""
+        self._inflight[(event.request_id, event.connection_id)] = (collection, command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, "ok")
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, "error")
+
+    def _finish(self, event: Any, outcome: str) -> None:
+        started = self._inflight.pop((event.request_id, event.connection_id), None)
+        if started is None:
+            return
+        collection, command = started
+        duration_ms = event.duration_micros / 1000
+        MONGO_COMMAND_SECONDS.observe(duration_ms / 1000, collection or "-", event.command_name, outcome)
+        if self.slow_ms > 0 and duration_ms >= self.slow_ms:
+            logger.warning(
+                "slow mongo command command=%s collection=%s dur_ms=%.1f outcome=%s filter=%s",
+                event.command_name,
+                collection or "-",
+                duration_ms,
+                outcome,
+                orjson.dumps(query_shape(_command_filter(event.command_name, command))).decode(),
+            )
+
+
+def _checked_out() -> float:
+    return sum(MONGO_POOL_CHECKOUTS.collect().values()) - sum(MONGO_POOL_CHECKINS.collect().values())
+
+
+metrics.gauge("mongo_pool_checked_out", "Mongo connections currently checked out by this host's workers.", _checked_out)
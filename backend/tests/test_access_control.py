@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+from core.plugins.shm_generation import SharedGeneration
+from core.resources.posts.access_control import AccessControlService
+from core.resources.uploaders.dtos import UploaderCreateRequest, UploaderIdRequest
+from core.resources.uploaders.service import UploaderService
+
+
+class _Uploaders:
+    def __init__(self) -> None:
+        self.docs: List[Dict[str, Any]] = []
+
+    async def find_by_email(self, email: str):
+        return next((d for d in self.docs if d["email"] == email), None)
+
+    async def insert(self, doc) -> None:
+        self.docs.append(doc)
+
+    async def list_all(self):
+        return list(self.docs)
+
+    async def update_status(self, uploader_id: str, status: str) -> None:
+        for d in self.docs:
+            if d["id"] == uploader_id:
+                d["status"] = status
+
+
+class _ApiKeys:
+    def __init__(self) -> None:
+        self.docs: List[Dict[str, Any]] = []
+
+    async def insert(self, doc) -> None:
+        self.docs.append(doc)
+
+    async def find_by_hash(self, key_hash: str):
+        return next((d for d in self.docs if d["key_hash"] == key_hash and d["status"] == "active"), None)
+
+    async def list_active_hashes(self, uploader_id: str) -> list[str]:
+        return [d["key_hash"] for d in self.docs if d["uploader_id"] == uploader_id and d["status"] == "active"]
+
+    async def revoke_all_for_uploader(self, uploader_id: str) -> None:
+        for d in self.docs:
+            if d["uploader_id"] == uploader_id:
+                d["status"] = "revoked"
+
+
+def _workers(tmp_path, count: int) -> List[AccessControlService]:
+    """`count` services sharing one database and generation file, as uvicorn workers do."""
+    uploaders, keys = _Uploaders(), _ApiKeys()
+    path = str(tmp_path / "gen.bin")
+    return [
+        AccessControlService(
+            uploader_service=UploaderService(repository=uploaders, api_key_repo=keys),
+            cache_ttl_seconds=60,
+            shared_generation=SharedGeneration(path),
+        )
+        for _ in range(count)
+    ]
+
+
+def test_mutations_invalidate_other_workers(tmp_path):
+    admin, other = _workers(tmp_path, 2)
+
+    async def scenario() -> None:
+        # a cached negative on the other worker must not outlive the uploader's creation
+        assert not await other.validate_uploader("a@x.io", "nope")
+        uploader, key, _ = await admin.uploader_service.create_uploader(UploaderCreateRequest(email="a@x.io"))
+        assert await other.validate_uploader("a@x.io", key)
+
+        new_key = await admin.uploader_service.revoke_api_key(UploaderIdRequest(uploaderId=uploader.id))
+        assert not await other.validate_uploader("a@x.io", key)
+        assert await other.validate_uploader("a@x.io", new_key)
+
+    asyncio.run(scenario())
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set, Tuple
+
+from core.resources.posts.service import PostsService
+
+
+class _Posts:
+    async def find_by_id(self, post_id: str):
+        return {"id": post_id, "status": "posted"}
+
+
+class _Reactions:
+    def __init__(self, ids: Set[str]):
+        self.ids = ids
+
+    async def exists(self, post_id: str, user_id: str) -> bool:
+        return post_id in self.ids
+
+    async def set_save(self, post_id: str, user_id: str, saved: bool, now: datetime) -> bool:
+        if saved == (post_id in self.ids):
+            return False
+        (self.ids.add if saved else self.ids.discard)(post_id)
+        return True
+
+
+class _UserStats:
+    """In-memory UserStatsRepository with the same change-sequence contract."""
+
+    def __init__(self, union: Set[str]):
+        self.union = union
+        self.doc: Dict[str, Any] = {}
+        self.on_compute = None
+
+    async def get_collection_count(self, user_id: str) -> Tuple[Optional[int], int, Optional[datetime]]:
+        return self.doc.get("count"), self.doc.get("seq", 0), self.doc.get("at")
+
+    async def inc_collection_count(self, user_id: str, delta: int) -> None:
+        self.doc["seq"] = self.doc.get("seq", 0) + 1
+        if "count" in self.doc:
+            self.doc["count"] += delta
+
+    async def compute_collection_count(self, user_id: str) -> int:
+        count = len(self.union)
+        if self.on_compute is not None:
+            on_compute, self.on_compute = self.on_compute, None
+            await on_compute()
+        return count
+
+    async def recompute_collection_count(self, user_id: str, seq: Optional[int], now: datetime) -> Tuple[int, bool]:
+        if seq is None:
+            _, seq, _ = await self.get_collection_count(user_id)
+        count = await self.compute_collection_count(user_id)
+        if self.doc.get("seq", 0) != seq:
+            return count, False
+        self.doc.update(count=count, at=now)
+        return count, True
+
+
+def _service(liked: Set[str], saved: Set[str], stats: _UserStats) -> PostsService:
+    return PostsService(
+        posts_repo=_Posts(),
+        likes_repo=_Reactions(liked),
+        comments_repo=None,
+        saved_posts_repo=_Reactions(saved),
+        user_stats_repo=stats,
+        jobs_service=None,
+    )
+
+
+def test_toggle_during_seed_is_not_lost():
+    saved: Set[str] = set()
+    stats = _UserStats(union=saved)
+    svc = _service(set(), saved, stats)
+
+    async def save_lands_mid_compute() -> None:
+        await svc.set_save("p1", "u1", saved=True)
+
+    async def scenario() -> None:
+        stats.on_compute = save_lands_mid_compute
+        await svc.count_saved_posts("u1")  # computed 0, but a save landed: not stored
+        assert stats.doc.get("count") is None
+        assert await svc.count_saved_posts("u1") == 1
+        assert stats.doc["count"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_stale_counter_is_recomputed():
+    stats = _UserStats(union={"p1", "p2"})
+    stats.doc = {"count": 7, "seq": 3, "at": datetime.now().astimezone() - timedelta(days=2)}
+    svc = _service(set(), set(), stats)
+
+    assert asyncio.run(svc.count_saved_posts("u1")) == 2
+    assert stats.doc["count"] == 2
+
+
+def test_save_uses_authoritative_liked_set():
+    stats = _UserStats(union={"p1"})
+    stats.doc = {"count": 1, "seq": 0, "at": datetime.now().astimezone()}
+    svc = _service({"p1"}, set(), stats)
+
+    asyncio.run(svc.set_save("p1", "u1", saved=True))
+    assert stats.doc["count"] == 1
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Tuple
+
+import pytest
+
+from core.resources.posts.counter_buffer import CounterAggregator, CounterFlushError
+
+
+class _Sink:
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.calls: List[Dict[str, Tuple[int, int]]] = []
+
+    async def bulk_inc_counts(self, deltas: Dict[str, Tuple[int, int]]) -> int:
+        self.calls.append(dict(deltas))
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        return len(deltas)
+
+
+def _flush(counters: CounterAggregator) -> None:
+    asyncio.run(counters.flush())
+
+
+def test_partial_failure_retries_only_unapplied_posts():
+    sink = _Sink(CounterFlushError("1 of 2 counter updates failed", ["b"]))
+    counters = CounterAggregator(sink=sink)
+    counters.add("a", likes_delta=1)
+    counters.add("b", likes_delta=2, comments_delta=1)
+
+    with pytest.raises(CounterFlushError):
+        _flush(counters)
+    assert counters.pending("a") == (0, 0)
+    assert counters.pending("b") == (2, 1)
+
+    _flush(counters)
+    assert sink.calls[-1] == {"b": (2, 1)}
+
+
+def test_nothing_sent_retries_whole_batch():
+    sink = _Sink(CounterFlushError("no Mongo server selected, nothing was sent", ["a", "b"]))
+    counters = CounterAggregator(sink=sink)
+    counters.add("a", likes_delta=1)
+    counters.add("b", comments_delta=1)
+
+    with pytest.raises(CounterFlushError):
+        _flush(counters)
+    _flush(counters)
+    assert sink.calls[-1] == {"a": (1, 0), "b": (0, 1)}
+
+
+def test_unknown_outcome_drops_deltas():
+    sink = _Sink(TimeoutError("acknowledgement lost"))
+    counters = CounterAggregator(sink=sink)
+    counters.add("a", likes_delta=1)
+
+    with pytest.raises(TimeoutError):
+        _flush(counters)
+    assert counters.pending("a") == (0, 0)
+    _flush(counters)
+    assert len(sink.calls) == 1
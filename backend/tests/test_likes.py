@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Set, Tuple
+
+import pytest
+
+from core.resources.posts.exceptions import PostNotFoundError
+from core.resources.posts.service import PostsService
+
+RTT = 0.02  # every fake Mongo call takes one round trip
+
+
+class _Store:
+    def __init__(self) -> None:
+        self.posts: Dict[str, Dict[str, Any]] = {
+            "p1": {"id": "p1", "status": "posted", "stats": {"likes": 0, "comments": 0}},
+            "draft": {"id": "draft", "status": "pending", "stats": {"likes": 0, "comments": 0}},
+        }
+        self.likes: Set[Tuple[str, str]] = set()
+        self.saved: Set[Tuple[str, str]] = set()
+        self.collection = 0
+
+
+class _Posts:
+    def __init__(self, store: _Store):
+        self.store = store
+
+    async def find_by_id(self, post_id: str):
+        await asyncio.sleep(RTT)
+        return self.store.posts.get(post_id)
+
+    async def inc_counts(self, post_id: str, likes_delta: int = 0, comments_delta: int = 0):
+        await asyncio.sleep(RTT)
+        post = self.store.posts.get(post_id)
+        if post is not None:
+            post["stats"]["likes"] += likes_delta
+        return post
+
+
+class _Reactions:
+    def __init__(self, keys: Set[Tuple[str, str]]):
+        self.keys = keys
+
+    async def _set(self, post_id: str, user_id: str, value: bool) -> bool:
+        await asyncio.sleep(RTT)
+        key = (post_id, user_id)
+        if value == (key in self.keys):
+            return False
+        (self.keys.add if value else self.keys.discard)(key)
+        return True
+
+    async def exists(self, post_id: str, user_id: str) -> bool:
+        await asyncio.sleep(RTT)
+        return (post_id, user_id) in self.keys
+
+
+class _Likes(_Reactions):
+    async def set_like(self, post_id: str, user_id: str, liked: bool, now: datetime) -> bool:
+        return await self._set(post_id, user_id, liked)
+
+
+class _Saved(_Reactions):
+    async def set_save(self, post_id: str, user_id: str, saved: bool, now: datetime) -> bool:
+        return await self._set(post_id, user_id, saved)
+
+
+class _UserStats:
+    def __init__(self, store: _Store):
+        self.store = store
+
+    async def inc_collection_count(self, user_id: str, delta: int) -> None:
+        await asyncio.sleep(RTT)
+        self.store.collection += delta
+
+
+def _service(store: _Store) -> PostsService:
+    return PostsService(
+        posts_repo=_Posts(store),
+        likes_repo=_Likes(store.likes),
+        comments_repo=None,
+        saved_posts_repo=_Saved(store.saved),
+        user_stats_repo=_UserStats(store),
+        jobs_service=None,
+    )
+
+
+def _timed(coro) -> Tuple[Any, float]:
+    async def run():
+        started = time.perf_counter()
+        result = await coro
+        return result, time.perf_counter() - started
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("already_liked", [False, True])
+def test_toggle_takes_two_round_trips(already_liked):
+    store = _Store()
+    if already_liked:
+        store.likes.add(("p1", "u1"))
+        store.posts["p1"]["stats"]["likes"] = 1
+        store.collection = 1
+    svc = _service(store)
+
+    (liked, likes), elapsed = _timed(svc.toggle_like("p1", "u1"))
+
+    assert liked is not already_liked
+    assert likes == store.posts["p1"]["stats"]["likes"] == len(store.likes) == store.collection
+    assert elapsed < 2.5 * RTT
+
+
+def test_set_like_takes_two_round_trips():
+    store = _Store()
+    store.saved.add(("p1", "u1"))
+    svc = _service(store)
+
+    (liked, likes), elapsed = _timed(svc.set_like("p1", "u1", liked=True))
+
+    assert (liked, likes) == (True, 1)
+    assert store.collection == 0  # already in the collection through the save
+    assert elapsed < 2.5 * RTT
+
+
+def test_concurrent_toggles_keep_counters_consistent():
+    store = _Store()
+    svc = _service(store)
+
+    async def double_tap():
+        return await asyncio.gather(svc.toggle_like("p1", "u1"), svc.toggle_like("p1", "u1"))
+
+    asyncio.run(double_tap())
+    assert store.posts["p1"]["stats"]["likes"] == len(store.likes) == store.collection
+
+
+def test_like_of_missing_post_leaves_nothing_behind():
+    store = _Store()
+    svc = _service(store)
+
+    with pytest.raises(PostNotFoundError):
+        asyncio.run(svc.toggle_like("missing", "u1"))
+    assert store.likes == set()
+    assert store.collection == 0
+
+
+@pytest.mark.parametrize("already_saved", [False, True])
+def test_toggle_save_takes_two_round_trips(already_saved):
+    store = _Store()
+    if already_saved:
+        store.saved.add(("p1", "u1"))
+        store.collection = 1
+    svc = _service(store)
+
+    saved, elapsed = _timed(svc.toggle_save_post("p1", "u1"))
+
+    assert saved is not already_saved
+    assert store.collection == len(store.saved)
+    assert elapsed < 2.5 * RTT
+
+
+def test_set_save_takes_two_round_trips():
+    store = _Store()
+    store.likes.add(("p1", "u1"))
+    svc = _service(store)
+
+    saved, elapsed = _timed(svc.set_save("p1", "u1", saved=True))
+
+    assert saved is True
+    assert store.collection == 0  # already in the collection through the like
+    assert elapsed < 2.5 * RTT
+
+
+def test_concurrent_save_toggles_keep_collection_consistent():
+    store = _Store()
+    svc = _service(store)
+
+    async def double_tap():
+        return await asyncio.gather(svc.toggle_save_post("p1", "u1"), svc.toggle_save_post("p1", "u1"))
+
+    asyncio.run(double_tap())
+    assert store.collection == len(store.saved)
+
+
+@pytest.mark.parametrize("post_id", ["missing", "draft"])
+def test_save_of_unposted_post_leaves_nothing_behind(post_id):
+    store = _Store()
+    svc = _service(store)
+
+    with pytest.raises(PostNotFoundError):
+        asyncio.run(svc.toggle_save_post(post_id, "u1"))
+    assert store.saved == set()
+    assert store.collection == 0
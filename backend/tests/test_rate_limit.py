@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+
+from core.plugins.rate_limit import GcraRateLimiter
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize("keys_per_second", [999, 1000, 1001])
+def test_new_keys_at_the_cap_sweep_rarely(keys_per_second):
+    clock = _Clock()
+    # each key stays live for one second, so keys arrive about as fast as they expire
+    limiter = GcraRateLimiter(max_requests=10, window_seconds=10.0, max_keys=1000, clock=clock)
+    sweeps = 0
+    sweep = limiter._sweep
+
+    def counting_sweep(*args, **kwargs):
+        nonlocal sweeps
+        sweeps += 1
+        sweep(*args, **kwargs)
+
+    limiter._sweep = counting_sweep
+    new_keys = 20_000
+    for i in range(new_keys):
+        clock.now = i / keys_per_second
+        assert limiter.hit(f"k{i}").allowed
+        assert len(limiter) <= limiter.max_keys
+
+    windows = new_keys / keys_per_second / limiter.window_seconds
+    # once per window, plus at most once per max_keys / 10 new keys
+    assert sweeps <= windows + 1 + new_keys // (limiter.max_keys // 10)
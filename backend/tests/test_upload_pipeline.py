@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+from config.config import settings
+from core.resources.posts.pipeline import PipelineContext, UploadPipeline
+from core.services.streamlander.circuit_breaker import CircuitOpenError
+
+
+class _StubStreamlander:
+    """`upload` raises CircuitOpenError for the first `open_calls` calls, then succeeds."""
+
+    def __init__(self, open_calls: int, retry_after: float = 0.0):
+        self.open_calls = open_calls
+        self.retry_after = retry_after
+        self.uploads = 0
+
+    def upload_retry_after(self) -> float:
+        return self.retry_after
+
+    async def upload(self, filename: str, content_type: str, data: Any) -> Dict[str, Any]:
+        self.uploads += 1
+        if self.uploads <= self.open_calls:
+            raise CircuitOpenError("upload", 0.01)
+        return {"id": "media-1"}
+
+
+def _pipeline(streamlander: _StubStreamlander) -> UploadPipeline:
+    return UploadPipeline(posts_repo=None, errors_repo=None, streamlander=streamlander)
+
+
+def _context(tmp_path) -> tuple[PipelineContext, Dict[str, Any]]:
+    path = tmp_path / "a.png"
+    path.write_bytes(b"\x89PNG")
+    file_info = {
+        "path": str(path),
+        "filename": "a.png",
+        "content_type": "image/png",
+        "media_type": "image",
+        "size": 4,
+        "hash": "h",
+    }
+    return PipelineContext(post_id="p1", user_id="u1", files=[file_info], tmp_dir=str(tmp_path)), file_info
+
+
+def test_upload_parks_when_breaker_opens_after_check(tmp_path):
+    streamlander = _StubStreamlander(open_calls=2)
+    context, file_info = _context(tmp_path)
+
+    result = asyncio.run(_pipeline(streamlander)._process_upload(context, file_info))
+
+    assert result == {"type": "image", "id": "media-1", "hash": "h"}
+    assert streamlander.uploads == 3
+    assert context.errors == []
+
+
+def test_upload_fails_after_park_deadline(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "streamlander_park_max_seconds", 0.05)
+    streamlander = _StubStreamlander(open_calls=0, retry_after=0.02)
+    context, file_info = _context(tmp_path)
+
+    result = asyncio.run(_pipeline(streamlander)._process_upload(context, file_info))
+
+    assert result is None
+    assert streamlander.uploads == 0
+    errors: List[Dict[str, Any]] = context.errors
+    assert [(e["error"], e["hash"]) for e in errors] == [("Streamlander unavailable (circuit open)", "h")]
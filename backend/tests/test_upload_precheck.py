@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+from io import BytesIO
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import Headers, UploadFile
+
+from core.resources.posts import controller
+
+_PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+def _file(data: bytes, size: int | None = None) -> UploadFile:
+    return UploadFile(
+        BytesIO(data),
+        size=len(data) if size is None else size,
+        filename="a.png",
+        headers=Headers({"content-type": "image/png"}),
+    )
+
+
+def test_precheck_rewinds_a_valid_file():
+    file = _file(_PNG)
+
+    async def scenario() -> bytes:
+        await controller._precheck_upload_file(file, "image")
+        return await file.read()
+
+    assert asyncio.run(scenario()) == _PNG
+
+
+@pytest.mark.parametrize(
+    "data, size, status",
+    [(b"not an image", None, 400), (b"", None, 400), (_PNG, controller._MAX_FILE_BYTES + 1, 413)],
+)
+def test_precheck_rejects_before_ingest(data, size, status):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(controller._precheck_upload_file(_file(data, size), "image"))
+    assert exc.value.status_code == status
+
+
+class _Errors:
+    def __init__(self) -> None:
+        self.docs: List[Dict[str, Any]] = []
+
+    async def insert(self, doc: Dict[str, Any]) -> None:
+        self.docs.append(doc)
+
+
+def test_aborted_request_records_streamed_media(monkeypatch):
+    errors = _Errors()
+    monkeypatch.setattr(controller, "_upload_errors", errors)
+    file_infos = [
+        {"filename": "a.png", "media": {"type": "image", "id": "m1", "hash": "h1"}},
+        {"filename": "b.png", "path": "/tmp/b.png", "hash": "h2"},
+    ]
+
+    asyncio.run(controller._record_orphaned_media("p1", "u1", file_infos))
+
+    assert [(d["postId"], d["mediaId"], d["hash"]) for d in errors.docs] == [("p1", "m1", "h1")]
@@ -16,7 +16,7 @@ import UserProfile from './UserProfile';
 
 const VideoFeed = () => {
   const dispatch = useAppDispatch();
-  const { videos, isLoading, isLoadingMore, skip, hasMore, currentVideoIndex } = useAppSelector((state) => state.feed);
+  const { videos, isLoading, isLoadingMore, skip, cursor, hasMore, currentVideoIndex } = useAppSelector((state) => state.feed);
   const { currentTheme } = useAppSelector((state) => state.theme);
   const { isMuted } = useAppSelector((state) => state.ui);
   const containerRef = useRef<HTMLDivElement>(null);
@@ -37,10 +37,10 @@ const VideoFeed = () => {
     if (fetchingRef.current || !hasMore || isLoadingMore) return;
     
     fetchingRef.current = true;
-    dispatch(fetchMoreFeed({ take: APP_CONFIG.postsPerPage, skip })).finally(() => {
+    dispatch(fetchMoreFeed({ take: APP_CONFIG.postsPerPage, skip, cursor })).finally(() => {
       fetchingRef.current = false;
     });
-  }, [dispatch, skip, hasMore, isLoadingMore]);
+  }, [dispatch, skip, cursor, hasMore, isLoadingMore]);
 
   // Check if we need to load more when visible index changes
   useEffect(() => {
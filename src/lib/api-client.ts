@@ -9,7 +9,7 @@ import {
 type RequestType = "query" | "mutation";
 
 type QueryPayload = {
-  [PostsQueryAction.LIST_POSTS]: { take?: number; skip?: number };
+  [PostsQueryAction.LIST_POSTS]: { take?: number; skip?: number; cursor?: string };
   [PostsQueryAction.GET_POST]: { postId: string };
   [PostsQueryAction.LIST_USER_POSTS]: {
     userId: string;
@@ -153,6 +153,7 @@ class ApiClient {
         take: number;
         skip: number;
         total?: number;
+        nextCursor?: string | null;
       }>("query", PostsQueryAction.LIST_POSTS, payload);
     },
 
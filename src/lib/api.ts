@@ -181,8 +181,8 @@ export const superAdminApi = {
 };
 
 export const postsApi = {
-  async list(take = 10, skip = 0) {
-    const res = await apiClient.query.listPosts({ take, skip });
+  async list(take = 10, skip = 0, cursor?: string | null) {
+    const res = await apiClient.query.listPosts(cursor ? { take, skip, cursor } : { take, skip });
     await cache.savePosts(res.items);
     return res;
   },
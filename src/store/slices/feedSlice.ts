@@ -11,6 +11,7 @@ interface FeedState {
   isLoading: boolean;
   isLoadingMore: boolean;
   skip: number;
+  cursor: string | null;
   hasMore: boolean;
 }
 
@@ -22,6 +23,7 @@ const initialState: FeedState = {
   isLoading: true,
   isLoadingMore: false,
   skip: 0,
+  cursor: null,
   hasMore: true,
 };
 
@@ -70,16 +72,30 @@ export const fetchFeed = createAsyncThunk('feed/fetchFeed', async (initialCount:
   const likedVideoIds = res.items.filter((post) => post.likedByUser).map((post) => post.id);
   const savedVideoIds = res.items.filter((post) => post.savedByUser).map((post) => post.id);
 
-  return { videos, likedVideoIds, savedVideoIds, skip: res.items.length, hasMore: res.items.length === initialCount };
+  return {
+    videos,
+    likedVideoIds,
+    savedVideoIds,
+    skip: res.items.length,
+    cursor: res.nextCursor ?? null,
+    hasMore: res.items.length === initialCount,
+  };
 });
 
-export const fetchMoreFeed = createAsyncThunk('feed/fetchMoreFeed', async ({ take, skip }: { take: number; skip: number }) => {
-  const res = await postsApi.list(take, skip);
+export const fetchMoreFeed = createAsyncThunk('feed/fetchMoreFeed', async ({ take, skip, cursor }: { take: number; skip: number; cursor?: string | null }) => {
+  const res = await postsApi.list(take, skip, cursor);
   const videos = res.items.map((post) => toVideoPost(post));
   const likedVideoIds = res.items.filter((post) => post.likedByUser).map((post) => post.id);
   const savedVideoIds = res.items.filter((post) => post.savedByUser).map((post) => post.id);
 
-  return { videos, likedVideoIds, savedVideoIds, skip: skip + res.items.length, hasMore: res.items.length === take };
+  return {
+    videos,
+    likedVideoIds,
+    savedVideoIds,
+    skip: skip + res.items.length,
+    cursor: res.nextCursor ?? null,
+    hasMore: res.items.length === take,
+  };
 });
 
 
@@ -167,6 +183,7 @@ const feedSlice = createSlice({
 
       state.videos = videos;
       state.skip = action.payload.skip;
+      state.cursor = action.payload.cursor;
       state.hasMore = action.payload.hasMore;
       state.likedVideos = action.payload.likedVideoIds;
       state.savedVideos = action.payload.savedVideoIds;
@@ -200,6 +217,7 @@ const feedSlice = createSlice({
 
       state.videos = combined;
       state.skip = action.payload.skip;
+      state.cursor = action.payload.cursor;
       state.hasMore = action.payload.hasMore;
       state.likedVideos = Array.from(new Set([...state.likedVideos, ...action.payload.likedVideoIds]));
       state.savedVideos = Array.from(new Set([...state.savedVideos, ...action.payload.savedVideoIds]));